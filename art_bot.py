@@ -12,29 +12,53 @@ Each run:
 Run hourly via Windows Task Scheduler:
   python art_bot.py run
 
+Pre-generate ready images during idle hours (see inventory.py):
+  python art_bot.py refill [max_images]
+
 Manual login setup:
   python art_bot.py login [grok|chatgpt|instagram]
+
+Prune and vacuum the Chrome profile (see chrome_profiles.py):
+  python art_bot.py profile-gc
+
+Export logins for cookie-injected sessions (see session_state.py):
+  python art_bot.py export-session
+  python art_bot.py session-status
 """
 
+import atexit
 import base64
+import hashlib
 import json
 import logging
 import os
 import re
 import random
+import subprocess
+import sys
+import threading
 import time
 import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+import cdp_driver
+import chrome_profiles
+import page_scripts
+import session_state
+import source_health
+
 # ── Paths ─────────────────────────────────────────────────────────────────────
 
 BOT_DIR  = Path(__file__).parent
@@ -53,6 +77,10 @@ LOCK_FILE    = BOT_DIR / "artbot.lock"
 GROK_URL    = "https://grok.com"
 CHATGPT_URL = "https://chatgpt.com/"
 
+# src substrings that mark a generated image (not UI chrome) on each site
+GROK_CDN_HINTS    = ["grokusercontent", "assets.grok.com", "blob:", "pbs.twimg", "grok.com"]
+CHATGPT_CDN_HINTS = ["files.oaiusercontent.com", "oaidalleapiprodscus", "oaidalleus"]
+
 # ── Logging ───────────────────────────────────────────────────────────────────
 
 logging.basicConfig(
@@ -403,37 +431,14 @@ def save_config(cfg: dict) -> None:
 
 def _clear_profile_locks(profile_dir: str) -> None:
     """Delete Chrome lock files and kill any lingering Chrome processes using this profile."""
-    root = Path(profile_dir)
-
-    # Kill any Chrome processes still holding the bot's profile open
-    try:
-        import subprocess
-        profile_token = str(root).replace("\\", "\\\\")
-        ps = (
-            f"Get-Process chrome -ErrorAction SilentlyContinue | ForEach-Object {{"
-            f" $procId = $_.Id;"
-            f" try {{"
-            f"  $cmd = (Get-WmiObject Win32_Process -Filter \"ProcessId=$procId\" -EA SilentlyContinue).CommandLine;"
-            f"  if ($cmd -and $cmd -like '*AIArtBot*chrome_profile*') {{ $_ | Stop-Process -Force }}"
-            f" }} catch {{}} }}"
-        )
-        subprocess.run(["powershell", "-Command", ps], capture_output=True, timeout=10)
-        time.sleep(1)
-    except Exception:
-        pass
-
-    # Delete singleton/lock files
-    for pattern in ("LOCK", "SingletonLock", "SingletonCookie", "SingletonSocket"):
-        for p in root.rglob(pattern):
-            try:
-                p.unlink()
-            except Exception:
-                pass
+    chrome_profiles.clear_profile_locks(Path(profile_dir))
 
 
-def make_driver(cfg: dict, headless: bool = True) -> webdriver.Chrome:
+def make_driver(cfg: dict, headless: bool = True, flow: str = "generation",
+                profile_dir: str | None = None) -> webdriver.Chrome:
     opts = Options()
-    profile = cfg.get("chrome_profile_path", "").strip()
+    opts.page_load_strategy = _session_page_load_strategy(cfg)
+    profile = profile_dir or cfg.get("chrome_profile_path", "").strip()
     if profile:
         Path(profile).mkdir(parents=True, exist_ok=True)
         _clear_profile_locks(profile)
@@ -452,31 +457,352 @@ def make_driver(cfg: dict, headless: bool = True) -> webdriver.Chrome:
     opts.add_argument("--disable-extensions")
     opts.add_argument("--no-first-run")
     opts.add_argument("--no-default-browser-check")
-    driver = webdriver.Chrome(options=opts)
+    if _network_capture_enabled(cfg):
+        # Network events land in the performance log so _save_image can find the
+        # request that delivered the generated image and read its body back.
+        opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        opts.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    driver = None
+    if cfg.get("driver_backend", "selenium") == "cdp":
+        driver = cdp_driver.launch(cfg, opts.arguments, opts.page_load_strategy,
+                                   record_network=_network_capture_enabled(cfg))
+    if driver is None:
+        driver = webdriver.Chrome(options=opts)
     driver.execute_cdp_cmd(
         "Page.addScriptToEvaluateOnNewDocument",
         {"source": "Object.defineProperty(navigator,'webdriver',{get:()=>undefined})"},
     )
+    if _network_capture_enabled(cfg):
+        _enable_network(driver, cfg)
+    apply_flow(driver, cfg, flow)
     return driver
 
 
-def slow_type(element, text: str) -> None:
-    for ch in text:
-        element.send_keys(ch)
-        if random.random() < 0.04:
-            time.sleep(random.uniform(0.04, 0.18))
+def _enable_network(driver, cfg: dict) -> None:
+    """Network.enable — with the enlarged body buffers when image capture needs them."""
+    params = {}
+    if _network_capture_enabled(cfg):
+        params = {
+            "maxTotalBufferSize":    200 * 1024 * 1024,
+            "maxResourceBufferSize": 50 * 1024 * 1024,
+        }
+    driver.execute_cdp_cmd("Network.enable", params)
+
+
+# ── Page loads and timeouts ───────────────────────────────────────────────────
+#
+# Chrome's page-load strategy is fixed when the driver starts, so the session
+# uses the loosest strategy any flow asks for and load_page() then waits for
+# the document state the current flow really needs.  Every flow also gets hard
+# page-load / script / implicit timeouts, so a stalled subresource costs at
+# most page_load_timeout seconds instead of hanging the run until the stale
+# lock expires.  Override per flow in config.json, e.g.
+#   "flows": {"engagement": {"page_load": "none", "page_load_timeout": 20}}
+#
+# A flow's "block" list names BLOCK_PATTERNS groups that Chrome refuses to
+# fetch while it runs (Network.setBlockedURLs), plus any raw URL patterns in
+# "block_extra".  Engagement only needs the DOM to find links and buttons, so
+# it skips post media, fonts and logging beacons; generation and posting
+# block nothing.
+
+BLOCK_PATTERNS = {
+    "video":     ["*.mp4*", "*.m4s*", "*.m4v*", "*.webm*"],
+    "images":    ["*cdninstagram.com*.jpg*", "*cdninstagram.com*.webp*", "*cdninstagram.com*.heic*",
+                  "*fbcdn.net*.jpg*", "*fbcdn.net*.webp*"],
+    "fonts":     ["*.woff*", "*.ttf*", "*.otf*"],
+    "analytics": ["*instagram.com/logging/*", "*/logging_client_events*", "*/ajax/bz*",
+                  "*facebook.com/tr*", "*google-analytics.com*", "*googletagmanager.com*"],
+}
+
+FLOW_DEFAULTS = {
+    "generation": {"page_load": "eager", "page_load_timeout": 60, "script_timeout": 30, "implicit_wait": 0,
+                   "block": []},
+    "posting":    {"page_load": "eager", "page_load_timeout": 45, "script_timeout": 30, "implicit_wait": 0,
+                   "block": []},
+    "engagement": {"page_load": "eager", "page_load_timeout": 30, "script_timeout": 20, "implicit_wait": 0,
+                   "block": ["video", "images", "fonts", "analytics"]},
+}
+_STRATEGY_RANK = {"none": 0, "eager": 1, "normal": 2}
+_READY_STATES  = {"none": ("loading", "interactive", "complete"),
+                  "eager": ("interactive", "complete"),
+                  "normal": ("complete",)}
+
+# DriverSession stage name → flow
+STAGE_FLOWS = {"grok": "generation", "chatgpt": "generation",
+               "instagram": "posting", "engagement": "engagement"}
+
+
+def flow_settings(cfg: dict, flow: str) -> dict:
+    settings = dict(FLOW_DEFAULTS.get(flow, FLOW_DEFAULTS["generation"]))
+    settings.update(cfg.get("flows", {}).get(flow, {}))
+    if settings["page_load"] not in _STRATEGY_RANK:
+        log.warning(f"Unknown page_load '{settings['page_load']}' for {flow} — using eager")
+        settings["page_load"] = "eager"
+    return settings
+
+
+def _session_page_load_strategy(cfg: dict) -> str:
+    """The loosest strategy any flow wants; stricter flows wait for more in load_page()."""
+    return min((flow_settings(cfg, f)["page_load"] for f in FLOW_DEFAULTS),
+               key=_STRATEGY_RANK.__getitem__)
+
+
+def apply_flow(driver, cfg: dict, flow: str) -> None:
+    """Set the flow's page-load, script and implicit timeouts on driver."""
+    settings = flow_settings(cfg, flow)
+    try:
+        driver.set_page_load_timeout(settings["page_load_timeout"])
+        driver.set_script_timeout(settings["script_timeout"])
+        driver.implicitly_wait(settings["implicit_wait"])
+    except Exception as exc:
+        log.debug(f"Could not apply {flow} timeouts: {exc}")
+    _apply_network_policy(driver, cfg, flow, settings)
+    driver.artbot_flow     = flow
+    driver.artbot_settings = settings
+
+
+def _apply_network_policy(driver, cfg: dict, flow: str, settings: dict) -> None:
+    """Block the flow's URL patterns, or lift a previous flow's blocks."""
+    patterns = [p for group in settings.get("block", []) for p in BLOCK_PATTERNS.get(group, [])]
+    patterns += settings.get("block_extra", [])
+    if not patterns and not getattr(driver, "artbot_blocked", None):
+        return   # nothing blocked before, nothing to block now
+    try:
+        if patterns and not getattr(driver, "artbot_blocked", None):
+            _enable_network(driver, cfg)
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        driver.artbot_blocked = patterns
+        if patterns:
+            log.info(f"{flow}: blocking {len(patterns)} URL patterns ({', '.join(settings.get('block', []))})")
+    except Exception as exc:
+        log.debug(f"Could not apply {flow} network policy: {exc}")
+
 
+def load_page(driver, url: str) -> bool:
+    """driver.get(url), bounded by the flow's page-load timeout.
 
-def find_first(driver, selectors: list, timeout: int = 15):
-    for by, sel in selectors:
+    A page that times out is stopped (window.stop()) and used as-is if its DOM
+    is usable.  Under the "none" strategy the old document is tagged first so
+    callers never act on the page being navigated away from.  Returns False
+    only if the page never became usable.
+    """
+    settings = getattr(driver, "artbot_settings", FLOW_DEFAULTS["generation"])
+    wanted   = _READY_STATES[settings["page_load"]]
+    try:
+        driver.execute_script("window.__artbotOldPage = true;")
+    except Exception:
+        pass
+    try:
+        driver.get(url)
+    except TimeoutException:
+        log.warning(f"Page load timed out after {settings['page_load_timeout']}s — stopping: {url}")
         try:
-            el = WebDriverWait(driver, timeout).until(
-                EC.element_to_be_clickable((by, sel))
-            )
-            return el
+            driver.execute_script("window.stop();")
         except Exception:
             pass
-    return None
+        wanted = ("interactive", "complete")
+    try:
+        WebDriverWait(driver, settings["page_load_timeout"], poll_frequency=0.2,
+                      ignored_exceptions=(WebDriverException,)).until(
+            lambda d: d.execute_script(
+                "return !window.__artbotOldPage && arguments[0].indexOf(document.readyState) !== -1;",
+                list(wanted),
+            )
+        )
+        return True
+    except Exception:
+        log.warning(f"Page never became ready: {url}")
+        return False
+
+
+class DriverSession:
+    """One Chrome shared by every stage of a run (generation, posting, engagement).
+
+    Stages call get() instead of make_driver(); the driver is health-checked on
+    each hand-off and only relaunched if it crashed.  Startup time and reuse
+    counts are logged on close() so the saving per run is visible.
+
+    With cfg["profile_clones"] the session runs on its own clone of the
+    logged-in profile (see chrome_profiles.py), named after worker, so
+    several sessions can run at once; close() syncs cookies back and deletes
+    the clone.  With cfg["session_mode"] = "cookies" it runs on an empty
+    profile with the exported logins injected instead (see session_state.py).
+    """
+
+    def __init__(self, cfg: dict, headless: bool = True, worker: str | None = None):
+        self.cfg         = cfg
+        self.headless    = headless
+        self.worker      = worker or f"run-{os.getpid()}"
+        self.driver      = None
+        self.profile_dir = None   # clone or light profile in use, if any
+        self.state       = None   # exported session state, in cookies mode
+        self.starts      = 0
+        self.reuses      = 0
+        self.startup_s   = 0.0
+
+    def _golden_profile(self) -> Path:
+        return Path(self.cfg.get("chrome_profile_path", "").strip() or BOT_DIR / "chrome_profile")
+
+    def _light_mode(self) -> bool:
+        if self.cfg.get("session_mode", "profile") != "cookies":
+            return False
+        if self.state is None:
+            self.state = session_state.load_state()
+            if self.state is None:
+                log.warning("session_mode is 'cookies' but nothing is exported "
+                            "(python art_bot.py export-session) — using the full profile")
+                self.cfg = {**self.cfg, "session_mode": "profile"}
+                return False
+            session_state.warn_if_expiring(self.state)
+        return True
+
+    def _profile(self) -> str | None:
+        """The profile this session's Chrome runs on, created on first use; None = the golden one."""
+        if self.profile_dir is None:
+            if self._light_mode():
+                self.profile_dir = session_state.light_profile(self.worker)
+            elif self.cfg.get("profile_clones", False):
+                self.profile_dir = chrome_profiles.acquire(self._golden_profile(), self.worker)
+        return str(self.profile_dir) if self.profile_dir is not None else None
+
+    def has_own_profile(self) -> bool:
+        """True if this session's Chrome gets a profile of its own (clone or light profile)."""
+        return self._light_mode() or bool(self.cfg.get("profile_clones", False))
+
+    def _alive(self) -> bool:
+        if self.driver is None:
+            return False
+        try:
+            self.driver.switch_to.default_content()
+            return self.driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def _quit(self) -> None:
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+    def get(self, stage: str = ""):
+        """Return a healthy driver, launching (or relaunching) Chrome only when needed."""
+        if self._alive():
+            if _network_capture_enabled(self.cfg):
+                _drain_performance_log(self.driver)
+            self.reuses += 1
+            log.info(f"Browser session reused for {stage or 'next stage'} (reuse #{self.reuses})")
+            apply_flow(self.driver, self.cfg, STAGE_FLOWS.get(stage, "generation"))
+            return self.driver
+
+        if self.driver is not None:
+            log.warning(f"Browser session unhealthy before {stage or 'next stage'} — restarting Chrome")
+            self._quit()
+
+        t0 = time.time()
+        self.driver = make_driver(self.cfg, headless=self.headless,
+                                  flow=STAGE_FLOWS.get(stage, "generation"),
+                                  profile_dir=self._profile())
+        if self._light_mode():
+            session_state.inject(self.driver, self.state)
+        elapsed = time.time() - t0
+        self.starts    += 1
+        self.startup_s += elapsed
+        log.info(f"Chrome started for {stage or 'session'} in {elapsed:.1f}s (start #{self.starts})")
+        return self.driver
+
+    def close(self) -> None:
+        if self._light_mode() and self._alive():
+            session_state.refresh_cookies(self.driver)
+        self._quit()
+        flush_selector_stats()
+        if self.profile_dir is not None:
+            if self._light_mode():
+                session_state.discard_profile(self.profile_dir)
+            else:
+                chrome_profiles.release(self._golden_profile(), self.profile_dir)
+            self.profile_dir = None
+        if self.starts:
+            avg = self.startup_s / self.starts
+            log.info(
+                f"Browser session closed — starts={self.starts}, reuses={self.reuses}, "
+                f"startup={self.startup_s:.1f}s total, ~{avg * self.reuses:.0f}s saved by reuse"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ── Text entry ────────────────────────────────────────────────────────────────
+#
+# insert_text() types through CDP Input.insertText, a few words at a time.
+# Chrome treats each chunk like an IME commit (beforeinput + input events), so
+# React-controlled textareas and Lexical/ProseMirror editors update their
+# state exactly as for real typing, but a 450-character prompt costs a dozen
+# round trips instead of 450 send_keys calls.  The human-like pauses fall
+# between chunks rather than between characters.
+
+TYPE_CHUNK   = (8, 32)       # characters per insertText chunk (random in range)
+TYPE_PAUSE_S = (0.03, 0.14)  # pause between chunks when pacing
+
+_EDITOR_TEXT_JS = """
+var el = arguments[0];
+var t = typeof el.value === 'string' ? el.value : (el.innerText || el.textContent || '');
+return t.replace(/\\s+/g, ' ').trim();
+"""
+
+
+def _text_chunks(text: str) -> list[str]:
+    """Split text into random-sized chunks, preferring to break after a space."""
+    chunks, i = [], 0
+    while i < len(text):
+        end   = min(len(text), i + random.randint(*TYPE_CHUNK))
+        space = text.rfind(" ", i + 1, end)
+        if end < len(text) and space > i:
+            end = space + 1
+        chunks.append(text[i:end])
+        i = end
+    return chunks
+
+
+def insert_text(driver, element, text: str, pace: bool = True) -> bool:
+    """Type text at the end of element in a few Input.insertText chunks.
+
+    If a CDP command fails, the chunks not yet inserted are sent with one
+    element.send_keys call.  Returns True if the editor's text ends with what was typed.
+    """
+    if not text:
+        return True
+    chunks = _text_chunks(text)
+    sent   = 0
+    try:
+        driver.execute_script(page_scripts.FOCUS_END_JS, element)
+        for chunk in chunks:
+            driver.execute_cdp_cmd("Input.insertText", {"text": chunk})
+            sent += 1
+            if pace and sent < len(chunks):
+                time.sleep(random.uniform(*TYPE_PAUSE_S))
+    except WebDriverException as exc:
+        # Only what was not inserted yet — resending the whole text would
+        # duplicate the chunks that already landed.
+        log.debug(f"Input.insertText failed after {sent}/{len(chunks)} chunks ({exc}) — "
+                  f"sending the rest with send_keys")
+        element.send_keys("".join(chunks[sent:]))
+    try:
+        typed = driver.execute_script(_EDITOR_TEXT_JS, element) or ""
+    except WebDriverException:
+        return False
+    tail = " ".join(text.split())[-20:]
+    return typed.endswith(tail)
+
+
+def slow_type(element, text: str) -> None:
+    if not insert_text(element.parent, element, text):
+        log.warning("Typed text did not land in the editor as expected")
 
 
 def _screenshot(driver, label: str) -> None:
@@ -488,17 +814,284 @@ def _screenshot(driver, label: str) -> None:
         pass
 
 
+# ── Element racing ────────────────────────────────────────────────────────────
+#
+# find_first() checks every selector in a list together, inside the page,
+# every 100 ms; the first clickable match wins, so a stale selector early in
+# the list costs nothing instead of a full timeout.  Named lists also record
+# which selector won and are tried best-first next time, so when several
+# match at once the historically right one is chosen.  The counts live in
+# memory; selector_stats.json is read once per process and this process's
+# hits are merged into it when the session closes and at exit.
+
+SELECTOR_STATS_FILE = BOT_DIR / "selector_stats.json"
+RACE_POLL_MS        = 100
+
+_selector_lock  = threading.Lock()
+_selector_stats: dict | None = None   # selector_stats.json as loaded, plus this process's hits
+_selector_new:   dict        = {}     # this process's hits not yet flushed
+
+_RACE_SELECTORS_JS = """
+var specs    = arguments[0];
+var deadline = Date.now() + arguments[1];
+var done     = arguments[arguments.length - 1];
+
+function clickable(el) {
+    if (!el || !el.isConnected || el.disabled) return false;
+    if (el.getAttribute && el.getAttribute('aria-disabled') === 'true') return false;
+    if (!el.getClientRects().length) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+function first(spec) {
+    try {
+        if (spec[0] === 'xpath') {
+            var snap = document.evaluate(spec[1], document, null,
+                                         XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var i = 0; i < snap.snapshotLength; i++)
+                if (clickable(snap.snapshotItem(i))) return snap.snapshotItem(i);
+        } else {
+            var els = document.querySelectorAll(spec[1]);
+            for (var j = 0; j < els.length; j++)
+                if (clickable(els[j])) return els[j];
+        }
+    } catch (e) {}
+    return null;
+}
+(function poll() {
+    for (var k = 0; k < specs.length; k++) {
+        var el = first(specs[k]);
+        if (el) { done([k, el]); return; }
+    }
+    if (Date.now() >= deadline) { done(null); return; }
+    setTimeout(poll, %d);
+})();
+""" % RACE_POLL_MS
+
+
+def race_selectors(driver, selectors: list, timeout: float = 15):
+    """Wait for whichever selector becomes clickable first, in one in-page poll.
+
+    Returns (element, index into selectors), or (None, -1) on timeout.  Falls
+    back to a combined WebDriverWait if async scripts are unavailable.
+    """
+    specs    = [page_scripts.locator(by, sel) for by, sel in selectors]
+    previous = None
+    try:
+        previous = driver.timeouts.script
+    except Exception:
+        pass
+    try:
+        driver.set_script_timeout(timeout + 10)
+        result = driver.execute_async_script(_RACE_SELECTORS_JS, specs, int(timeout * 1000))
+        if result:
+            return result[1], int(result[0])
+        return None, -1
+    except Exception as exc:
+        log.debug(f"Selector race unavailable ({exc}) — polling with WebDriverWait")
+    finally:
+        if previous is not None:
+            try:
+                driver.set_script_timeout(previous)
+            except Exception:
+                pass
+
+    try:
+        el = WebDriverWait(driver, timeout).until(
+            EC.any_of(*[EC.element_to_be_clickable(loc) for loc in selectors])
+        )
+    except Exception:
+        return None, -1
+    for i, loc in enumerate(selectors):
+        try:
+            if el in driver.find_elements(*loc):
+                return el, i
+        except Exception:
+            pass
+    return el, 0
+
+
+def _load_selector_stats() -> dict:
+    if SELECTOR_STATS_FILE.exists():
+        try:
+            return json.loads(SELECTOR_STATS_FILE.read_text(encoding="utf-8"))
+        except Exception:
+            pass
+    return {}
+
+
+def _selector_table() -> dict:
+    """The in-memory selector stats (call with _selector_lock held)."""
+    global _selector_stats
+    if _selector_stats is None:
+        _selector_stats = _load_selector_stats()
+    return _selector_stats
+
+
+def _rank_selectors(name: str, selectors: list) -> list:
+    """selectors sorted by recorded hit rate for this list, best first (stable)."""
+    with _selector_lock:
+        hits = dict(_selector_table().get(name, {}))
+    return sorted(selectors, key=lambda loc: -hits.get(loc[1], 0))
+
+
+def _record_selector_hit(name: str, winner: tuple | None) -> None:
+    """Count a win for winner, or a miss for the whole list when nothing matched."""
+    key = winner[1] if winner else "<none>"
+    with _selector_lock:
+        for table in (_selector_table(), _selector_new):
+            entry = table.setdefault(name, {})
+            entry[key] = entry.get(key, 0) + 1
+
+
+def flush_selector_stats() -> None:
+    """Merge this process's selector hits into selector_stats.json.
+
+    The file is re-read first, so hits another process flushed meanwhile are
+    kept, and replaced atomically through a temp file.
+    """
+    with _selector_lock:
+        if not _selector_new:
+            return
+        stats = _load_selector_stats()
+        for name, hits in _selector_new.items():
+            entry = stats.setdefault(name, {})
+            for key, n in hits.items():
+                entry[key] = entry.get(key, 0) + n
+        tmp = SELECTOR_STATS_FILE.with_name(f"{SELECTOR_STATS_FILE.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(stats, indent=2), encoding="utf-8")
+            os.replace(tmp, SELECTOR_STATS_FILE)
+            _selector_new.clear()
+        except Exception as exc:
+            log.debug(f"Could not save selector stats: {exc}")
+            tmp.unlink(missing_ok=True)
+
+
+atexit.register(flush_selector_stats)
+
+
+def find_first(driver, selectors: list, timeout: int = 15, name: str | None = None):
+    """First clickable element matched by any of selectors, or None after timeout seconds.
+
+    Pass name to learn from and reorder the list by which selector actually wins.
+    """
+    ordered = _rank_selectors(name, selectors) if name else selectors
+    el, idx = race_selectors(driver, ordered, timeout)
+    if name:
+        _record_selector_hit(name, ordered[idx] if el is not None else None)
+        if el is not None and idx > 0:
+            log.debug(f"{name}: matched selector #{idx + 1} ({ordered[idx][1]})")
+    return el
+
+
+# ── Cancellation ──────────────────────────────────────────────────────────────
+
+def _cancelled(cancel: threading.Event | None) -> bool:
+    return cancel is not None and cancel.is_set()
+
+
+def _sleep(seconds: float, cancel: threading.Event | None = None) -> bool:
+    """Sleep, waking early if cancel is set. Returns True if the attempt was cancelled."""
+    if cancel is None:
+        time.sleep(seconds)
+        return False
+    return cancel.wait(seconds)
+
+
+# ── Network capture ───────────────────────────────────────────────────────────
+
+def _network_capture_enabled(cfg: dict) -> bool:
+    """cfg["capture_mode"] = "cdp" keeps the image bytes Chrome already received."""
+    return cfg.get("capture_mode", "download") == "cdp"
+
+
+def _drain_performance_log(driver) -> list:
+    try:
+        return driver.get_log("performance")
+    except Exception:
+        return []
+
+
+def _capture_image_bytes(driver, img_url: str, cdn_hints: list) -> bytes | None:
+    """Return the original response body of the generated image from Chrome's network buffer.
+
+    http(s) URLs are matched exactly.  blob: URLs have no request of their own,
+    so the largest image response from one of the source's CDN hosts is used.
+    """
+    sizes:     dict[str, int] = {}
+    responses: list[tuple]    = []   # (request_id, url), oldest first
+    for entry in _drain_performance_log(driver):
+        try:
+            msg = json.loads(entry["message"])["message"]
+        except Exception:
+            continue
+        params = msg.get("params", {})
+        if msg.get("method") == "Network.responseReceived":
+            resp = params.get("response", {})
+            if resp.get("mimeType", "").startswith("image/"):
+                responses.append((params["requestId"], resp.get("url", "")))
+        elif msg.get("method") == "Network.loadingFinished":
+            sizes[params.get("requestId")] = params.get("encodedDataLength", 0)
+
+    if img_url.startswith("blob:"):
+        candidates = sorted(
+            (r for r in responses if any(h in r[1] for h in cdn_hints)),
+            key=lambda r: sizes.get(r[0], 0), reverse=True,
+        )
+    else:
+        candidates = [r for r in reversed(responses) if r[1] == img_url]
+
+    for request_id, url in candidates:
+        try:
+            body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except Exception as exc:
+            log.debug(f"Network capture: body for {url[:60]} unavailable ({exc})")
+            continue
+        # Binary bodies come back base64-wrapped by the DevTools transport; decoding
+        # yields the exact bytes Chrome received — no re-encode, no second request.
+        data = (
+            base64.b64decode(body["body"]) if body.get("base64Encoded")
+            else body["body"].encode("utf-8")
+        )
+        log.info(f"Network capture: {len(data) // 1024} KB from {url[:80]}")
+        return data
+    return None
+
+
 # ── Image saving ──────────────────────────────────────────────────────────────
 
-def _save_image(driver, img_url: str, prompt: str, source: str, components: dict) -> str | None:
-    """Download image and save to SAVE_DIR. Returns filepath or None."""
+def _unique_path(path: Path) -> Path:
+    """path, or path with _2, _3… appended if several images are saved in the same second."""
+    n         = 2
+    candidate = path
+    while candidate.exists():
+        candidate = path.with_name(f"{path.stem}_{n}{path.suffix}")
+        n += 1
+    return candidate
+
+
+def _file_digest(path: str | Path) -> str:
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+
+def _save_image(driver, img_url: str, prompt: str, source: str, components: dict,
+                capture: bool = False, cdn_hints: list | None = None) -> str | None:
+    """Download image and save to SAVE_DIR. Returns filepath or None.
+
+    With capture=True the bytes are taken from Chrome's network buffer first and
+    only re-downloaded if that fails.
+    """
     now      = datetime.now()
     slug     = re.sub(r"\W+", "_", prompt[:45]).strip("_")
     filename = f"{now.strftime('%Y%m%d_%H%M%S')}_{slug}.png"
-    filepath = SAVE_DIR / filename
+    filepath = _unique_path(SAVE_DIR / filename)
 
     try:
-        if img_url.startswith("blob:"):
+        data = _capture_image_bytes(driver, img_url, cdn_hints or []) if capture else None
+        if data:
+            filepath.write_bytes(data)
+        elif img_url.startswith("blob:"):
             b64 = driver.execute_script("""
                 var img = document.querySelector("img[src='" + arguments[0] + "']");
                 if (!img) return null;
@@ -553,46 +1146,174 @@ def _save_image(driver, img_url: str, prompt: str, source: str, components: dict
         return None
 
 
-def _wait_for_large_image(driver, timeout: int, cdn_hints: list) -> str | None:
-    """Poll for a 512px+ image matching a CDN hint, fall back to any large image."""
-    start = time.time()
-    while time.time() - start < timeout:
-        result = driver.execute_script("""
-            var hints    = arguments[0];
-            var imgs     = document.querySelectorAll('img');
-            var fallback = null;
-            for (var i = 0; i < imgs.length; i++) {
-                var src = imgs[i].src || '';
-                var w   = imgs[i].naturalWidth;
-                var h   = imgs[i].naturalHeight;
-                if (w < 512 || h < 512) continue;
-                if (/profile|avatar|logo|icon|spinner/i.test(src)) continue;
-                for (var j = 0; j < hints.length; j++) {
-                    if (src.indexOf(hints[j]) !== -1) return {src: src, w: w, h: h};
-                }
-                if (!fallback || w > fallback.w) fallback = {src: src, w: w, h: h};
+# ── Image detection ───────────────────────────────────────────────────────────
+
+EVENT_SLICE_S = 10   # longest single in-page wait, so cancel/Turnstile checks still run
+
+# Shared filter: first 512px+ image whose src matches a CDN hint, else (optionally)
+# the widest 512px+ image.  Sources matching `exclude` (avatars, logos…) never count.
+_IMAGE_FILTER_JS = """
+function artbotScan(hints, exclude, allowFallback) {
+    var imgs = document.querySelectorAll('img');
+    var fallback = null;
+    for (var i = 0; i < imgs.length; i++) {
+        var src = imgs[i].src || '';
+        var w   = imgs[i].naturalWidth;
+        var h   = imgs[i].naturalHeight;
+        if (w < 512 || h < 512) continue;
+        if (exclude.test(src)) continue;
+        for (var j = 0; j < hints.length; j++) {
+            if (src.indexOf(hints[j]) !== -1) return {src: src, w: w, h: h};
+        }
+        if (allowFallback && (!fallback || w > fallback.w)) fallback = {src: src, w: w, h: h};
+    }
+    return fallback;
+}
+
+function artbotScanAll(hints, exclude) {
+    var imgs = document.querySelectorAll('img');
+    var seen = {}, found = [];
+    for (var i = 0; i < imgs.length; i++) {
+        var src = imgs[i].src || '';
+        var w   = imgs[i].naturalWidth;
+        var h   = imgs[i].naturalHeight;
+        if (w < 512 || h < 512 || seen[src] || exclude.test(src)) continue;
+        for (var j = 0; j < hints.length; j++) {
+            if (src.indexOf(hints[j]) !== -1) {
+                seen[src] = true;
+                found.push({src: src, w: w, h: h});
+                break;
             }
-            return fallback;
-        """, cdn_hints)
+        }
+    }
+    return found;
+}
+"""
+
+_SCAN_IMAGE_JS = _IMAGE_FILTER_JS + """
+return artbotScan(arguments[0], new RegExp(arguments[1], 'i'), arguments[2]);
+"""
+
+# Resolves as soon as a matching image finishes loading: a capturing `load`
+# listener catches <img> loads, a MutationObserver catches images inserted or
+# re-pointed that are already decoded (cache hits).  Rescans are coalesced.
+_AWAIT_IMAGE_JS = _IMAGE_FILTER_JS + """
+var hints = arguments[0], exclude = new RegExp(arguments[1], 'i'), allowFallback = arguments[2];
+var timeoutMs = arguments[3], done = arguments[arguments.length - 1];
+var finished = false, pending = false, observer = null, timer = null;
+
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    document.removeEventListener('load', onLoad, true);
+    clearTimeout(timer);
+    done(result);
+}
+function check() {
+    pending = false;
+    var r = artbotScan(hints, exclude, allowFallback);
+    if (r) finish(r);
+}
+function schedule() {
+    if (!pending && !finished) { pending = true; setTimeout(check, 25); }
+}
+function onLoad(e) {
+    if (e.target && e.target.tagName === 'IMG') check();
+}
+
+var now = artbotScan(hints, exclude, allowFallback);
+if (now) {
+    finish(now);
+} else {
+    document.addEventListener('load', onLoad, true);
+    observer = new MutationObserver(schedule);
+    observer.observe(document.documentElement, {
+        childList: true, subtree: true, attributes: true, attributeFilter: ['src', 'srcset'],
+    });
+    timer = setTimeout(function () { finish(null); }, timeoutMs);
+}
+"""
+
+
+_HARVEST_IMAGES_JS = _IMAGE_FILTER_JS + """
+return artbotScanAll(arguments[0], new RegExp(arguments[1], 'i'));
+"""
+
+
+def _await_large_image(driver, cdn_hints: list, exclude: str, allow_fallback: bool,
+                       timeout: float) -> dict | None:
+    """Block inside the page until a matching image has loaded, or timeout seconds pass."""
+    previous = None
+    try:
+        previous = driver.timeouts.script
+    except Exception:
+        pass
+    driver.set_script_timeout(timeout + 10)
+    try:
+        return driver.execute_async_script(
+            _AWAIT_IMAGE_JS, cdn_hints, exclude, allow_fallback, int(timeout * 1000)
+        )
+    finally:
+        if previous is not None:
+            driver.set_script_timeout(previous)
+
+
+def _detect_image(driver, cdn_hints: list, exclude: str, allow_fallback: bool,
+                  slice_s: float, plan: dict, elapsed: float,
+                  cancel: threading.Event | None = None) -> dict | None:
+    """Wait up to slice_s for a matching image.
+
+    Uses the in-page observer; if async scripts fail (e.g. mid-navigation) it
+    falls back to one synchronous scan plus a plan-paced sleep.
+    """
+    try:
+        return _await_large_image(driver, cdn_hints, exclude, allow_fallback, max(slice_s, 0.5))
+    except Exception as exc:
+        log.debug(f"Event wait unavailable ({exc}) — polling once")
+    try:
+        result = driver.execute_script(_SCAN_IMAGE_JS, cdn_hints, exclude, allow_fallback)
+    except Exception as exc:
+        log.debug(f"Image scan: {exc}")
+        result = None
+    if not result:
+        _sleep(min(slice_s, source_health.next_poll_delay(plan, elapsed)), cancel)
+    return result
+
+
+def _wait_for_large_image(driver, timeout: float, cdn_hints: list,
+                          cancel: threading.Event | None = None,
+                          plan: dict | None = None, started: float | None = None) -> str | None:
+    """Wait for a 512px+ image matching a CDN hint, fall back to any large image."""
+    start   = time.time()
+    started = started or start
+    plan    = plan or {"interval": 4, "median": timeout}
+    while not _cancelled(cancel):
+        remaining = timeout - (time.time() - start)
+        if remaining <= 0:
+            break
+        result = _detect_image(
+            driver, cdn_hints, r"profile|avatar|logo|icon|spinner", True,
+            min(remaining, EVENT_SLICE_S), plan, time.time() - started, cancel,
+        )
         if result:
             log.info(f"Image detected ({result['w']}x{result['h']}): {result['src'][:80]}")
             return result["src"]
-        time.sleep(4)
     return None
 
 
 # ── Grok generator ────────────────────────────────────────────────────────────
 
-def _generate_via_grok(driver, prompt: str) -> str | None:
+def _generate_via_grok(driver, prompt: str, cancel: threading.Event | None = None) -> str | None:
     log.info("Grok: loading grok.com…")
-    driver.get(GROK_URL)
-    time.sleep(4)
+    load_page(driver, GROK_URL)
 
+    # Waits for the page itself — returns as soon as the input is clickable
     input_el = find_first(driver, [
         (By.CSS_SELECTOR, "textarea"),
         (By.CSS_SELECTOR, "div[contenteditable='true']"),
         (By.CSS_SELECTOR, "div[role='textbox']"),
-    ])
+    ], timeout=20, name="grok_input")
     if not input_el:
         log.error("Grok: chat input not found")
         _screenshot(driver, "grok_no_input")
@@ -615,6 +1336,8 @@ def _generate_via_grok(driver, prompt: str) -> str | None:
 
     # Wait up to 45s for Turnstile overlay to resolve; try clicking its checkbox each second
     for _t in range(45):
+        if _cancelled(cancel):
+            return None
         try:
             overlay = driver.find_element(By.ID, "turnstile-widget")
             if overlay.is_displayed():
@@ -653,7 +1376,7 @@ def _generate_via_grok(driver, prompt: str) -> str | None:
         (By.XPATH, "//button[@aria-label='Submit message']"),
         (By.XPATH, "//button[@aria-label='Send message']"),
         (By.CSS_SELECTOR, "[data-testid='send-button']"),
-    ], timeout=5)
+    ], timeout=5, name="grok_submit")
     if submit_el:
         driver.execute_script("arguments[0].click();", submit_el)
         log.info("Grok: submitted via button")
@@ -661,15 +1384,24 @@ def _generate_via_grok(driver, prompt: str) -> str | None:
         input_el.send_keys(Keys.RETURN)
         log.info("Grok: submitted via Enter")
 
-    log.info("Grok: waiting for image (up to 180 s)…")
-    time.sleep(15)
+    plan      = source_health.wait_plan("grok", "image_wait", first=15, interval=3, give_up=180)
+    submitted = time.time()
+    log.info(
+        f"Grok: waiting for image (up to {plan['give_up']:.0f} s, first check at "
+        f"{plan['first']:.0f} s{', learned' if plan['learned'] else ''})…"
+    )
+    if _sleep(plan["first"], cancel):
+        log.info("Grok: cancelled")
+        return None
 
-    start    = time.time()
-    deadline = start + 165
-    found_url = None
+    deadline    = submitted + plan["give_up"]
+    next_report = 30
+    found_url   = None
 
     while time.time() < deadline:
-        time.sleep(3)
+        if _cancelled(cancel):
+            log.info("Grok: cancelled")
+            return None
         # Detect mid-generation Turnstile and try to click the checkbox inside its iframe
         try:
             overlay = driver.find_element(By.ID, "turnstile-widget")
@@ -684,59 +1416,47 @@ def _generate_via_grok(driver, prompt: str) -> str | None:
                     time.sleep(5)
                 except Exception:
                     driver.switch_to.default_content()
+                    _sleep(2, cancel)
                 continue
         except Exception:
             pass
-        try:
-            result = driver.execute_script("""
-                var imgs = document.querySelectorAll('img');
-                var candidates = [];
-                for (var i = 0; i < imgs.length; i++) {
-                    var src = imgs[i].src || '';
-                    var w   = imgs[i].naturalWidth;
-                    var h   = imgs[i].naturalHeight;
-                    if (w >= 512 && h >= 512 && src.indexOf('profile_images') === -1) {
-                        candidates.push({src: src, w: w, h: h});
-                    }
-                }
-                return candidates;
-            """)
-            if result:
-                for item in result:
-                    src = item.get("src", "")
-                    if any(k in src for k in ("grokusercontent", "assets.grok.com", "blob:", "pbs.twimg", "grok.com")):
-                        found_url = src
-                        log.info(f"Grok: image found ({item['w']}x{item['h']}): {src[:80]}")
-                        break
-                if found_url:
-                    break
-        except Exception as exc:
-            log.debug(f"Grok poll: {exc}")
+        item = _detect_image(
+            driver, GROK_CDN_HINTS, "profile_images", False,
+            min(EVENT_SLICE_S, deadline - time.time()), plan, time.time() - submitted, cancel,
+        )
+        if item:
+            found_url = item["src"]
+            log.info(f"Grok: image found ({item['w']}x{item['h']}): {found_url[:80]}")
+            break
 
-        elapsed = int(time.time() - start) + 15
-        if elapsed % 30 == 0:
+        elapsed = int(time.time() - submitted)
+        if elapsed >= next_report:
+            next_report += 30
             log.info(f"  Grok: still waiting… ({elapsed}s)")
             _screenshot(driver, f"grok_wait_{elapsed}s")
 
-    if not found_url:
-        log.error("Grok: no image found within 180 s")
+    if found_url:
+        source_health.record_phase("grok", "image_wait", time.time() - submitted)
+    else:
+        log.error(f"Grok: no image found within {plan['give_up']:.0f} s")
         _screenshot(driver, "grok_timeout")
+        source_health.record_timeout("grok", "image_wait", plan, time.time() - submitted)
     return found_url
 
 
 # ── ChatGPT generator ─────────────────────────────────────────────────────────
 
-def _generate_via_chatgpt(driver, prompt: str) -> str | None:
+def _generate_via_chatgpt(driver, prompt: str, cancel: threading.Event | None = None) -> str | None:
     log.info("ChatGPT: loading chatgpt.com…")
-    driver.get(CHATGPT_URL)
-    time.sleep(6)
+    load_page(driver, CHATGPT_URL)
 
+    # Waits for the page itself — returns as soon as the prompt box is clickable
     prompt_el = find_first(driver, [
         (By.CSS_SELECTOR, "#prompt-textarea"),
         (By.CSS_SELECTOR, "div[contenteditable='true'][data-lexical-editor]"),
         (By.CSS_SELECTOR, "div[contenteditable='true']"),
         (By.CSS_SELECTOR, "textarea[placeholder*='Message' i]"),
-    ], timeout=20)
+    ], timeout=26, name="chatgpt_prompt")
     if not prompt_el:
         log.error("ChatGPT: prompt input not found")
         return None
@@ -750,120 +1470,440 @@ def _generate_via_chatgpt(driver, prompt: str) -> str | None:
         (By.CSS_SELECTOR, "button[data-testid='send-button']"),
         (By.CSS_SELECTOR, "button[aria-label='Send prompt']"),
         (By.XPATH, "//button[@aria-label='Send message']"),
-    ], timeout=5)
+    ], timeout=5, name="chatgpt_submit")
     if submit_el:
         driver.execute_script("arguments[0].click();", submit_el)
     else:
         prompt_el.send_keys(Keys.RETURN)
 
-    log.info("ChatGPT: waiting for image (up to 120 s)…")
-    time.sleep(15)
+    plan      = source_health.wait_plan("chatgpt", "image_wait", first=15, interval=4, give_up=120)
+    submitted = time.time()
+    log.info(f"ChatGPT: waiting for image (up to {plan['give_up']:.0f} s)…")
+    if _sleep(plan["first"], cancel):
+        log.info("ChatGPT: cancelled")
+        return None
 
-    return _wait_for_large_image(driver, timeout=105, cdn_hints=[
-        "files.oaiusercontent.com", "oaidalleapiprodscus", "oaidalleus",
-    ])
+    found_url = _wait_for_large_image(
+        driver, timeout=plan["give_up"] - plan["first"], cdn_hints=CHATGPT_CDN_HINTS,
+        cancel=cancel, plan=plan, started=submitted,
+    )
+    if found_url:
+        source_health.record_phase("chatgpt", "image_wait", time.time() - submitted)
+    elif not _cancelled(cancel):
+        source_health.record_timeout("chatgpt", "image_wait", plan, time.time() - submitted)
+    return found_url
 
 
 # ── Pollinations generator ────────────────────────────────────────────────────
 
-def _generate_via_pollinations(driver, prompt: str) -> str | None:
-    """Download image from Pollinations.ai directly and save it. Returns 'SAVED:<path>' or None."""
+POLLINATIONS_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "image/webp,image/apng,image/*,*/*;q=0.8",
+    "Referer": "https://pollinations.ai/",
+}
+POLLINATIONS_CONCURRENCY = 4    # parallel requests in pollinations_batch()
+MIN_IMAGE_SIZE_KB        = 30
+
+_name_lock = threading.Lock()   # batch workers pick final filenames one at a time
+
+
+def _pollinations_url(prompt: str, seed: int) -> str:
     encoded = urllib.parse.quote(prompt[:500], safe="")
-    url = (
+    return (
         f"https://image.pollinations.ai/prompt/{encoded}"
         f"?width=1024&height=1024&nologo=true&enhance=true&model=flux"
-        f"&seed={random.randint(1, 999999)}"
+        f"&seed={seed}"
     )
-    log.info("Pollinations: requesting image…")
-    try:
-        resp = requests.get(
-            url,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "image/webp,image/apng,image/*,*/*;q=0.8",
-                "Referer": "https://pollinations.ai/",
-            },
-            timeout=120,
-            stream=True,
-        )
-        if resp.status_code != 200:
-            log.warning(f"Pollinations: HTTP {resp.status_code}")
-            return None
 
-        now  = datetime.now()
-        slug = re.sub(r"[^\w]+", "_", prompt[:50]).strip("_")
-        filepath = SAVE_DIR / f"{now.strftime('%Y%m%d_%H%M%S')}_{slug}.png"
-        SAVE_DIR.mkdir(parents=True, exist_ok=True)
-        with open(filepath, "wb") as f:
-            for chunk in resp.iter_content(8192):
-                f.write(chunk)
 
-        size_kb = filepath.stat().st_size // 1024
-        if size_kb < 30:
+def _pollinations_http(pool_size: int = 1) -> requests.Session:
+    """A requests session whose connection pool can serve pool_size requests at once."""
+    http    = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    http.mount("https://", adapter)
+    http.headers.update(POLLINATIONS_HEADERS)
+    return http
+
+
+def _pollinations_download(http, prompt: str, components: dict, timeout: float,
+                           cancel: threading.Event | None = None) -> Path | None:
+    """Fetch one Pollinations image (random seed) and save it with its sidecar.
+
+    The body streams into a hidden .part file that is renamed into place only
+    once complete, so an interrupted download never looks like a finished image.
+    """
+    seed = random.randint(1, 999999)
+    now  = datetime.now()
+    slug = re.sub(r"[^\w]+", "_", prompt[:50]).strip("_")
+    part = SAVE_DIR / f".{slug}_{seed}.part"
+    try:
+        with http.get(_pollinations_url(prompt, seed), timeout=timeout, stream=True) as resp:
+            if resp.status_code != 200:
+                log.warning(f"Pollinations: HTTP {resp.status_code}")
+                return None
+
+            SAVE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(part, "wb") as f:
+                for chunk in resp.iter_content(8192):
+                    if _cancelled(cancel):
+                        break
+                    f.write(chunk)
+            if _cancelled(cancel):
+                log.info("Pollinations: cancelled")
+                return None
+
+        size_kb = part.stat().st_size // 1024
+        if size_kb < MIN_IMAGE_SIZE_KB:
             log.warning(f"Pollinations: image too small ({size_kb} KB) — discarding")
-            filepath.unlink(missing_ok=True)
             return None
 
+        with _name_lock:
+            filepath = _unique_path(SAVE_DIR / f"{now.strftime('%Y%m%d_%H%M%S')}_{slug}.png")
+            os.replace(part, filepath)
+
         # Write sidecar meta JSON
         meta = {
             "generated_at": now.isoformat(),
             "prompt":       prompt,
             "source":       "pollinations",
-            "components":   {},
+            "components":   components,
         }
         filepath.with_name(filepath.stem + "_meta.json").write_text(
             json.dumps(meta, indent=2), encoding="utf-8"
         )
         log.info(f"Pollinations: saved {filepath.name} ({size_kb} KB)")
-        return f"SAVED:{filepath}"
+        return filepath
     except Exception as exc:
         log.warning(f"Pollinations: {exc}")
         return None
+    finally:
+        part.unlink(missing_ok=True)
+
+
+def _generate_via_pollinations(driver, prompt: str, cancel: threading.Event | None = None) -> str | None:
+    """Download image from Pollinations.ai directly and save it. Returns 'SAVED:<path>' or None."""
+    plan      = source_health.wait_plan("pollinations", "download", first=0, interval=1, give_up=120)
+    requested = time.time()
+    log.info(f"Pollinations: requesting image (timeout {plan['give_up']:.0f} s)…")
+    with _pollinations_http() as http:
+        filepath = _pollinations_download(http, prompt, {}, plan["give_up"], cancel)
+    if not filepath:
+        if not _cancelled(cancel):
+            source_health.record_timeout("pollinations", "download", plan, time.time() - requested)
+        return None
+    source_health.record_phase("pollinations", "download", time.time() - requested)
+    return f"SAVED:{filepath}"
+
+
+def pollinations_batch(jobs: list[tuple[str, dict]], cfg: dict) -> list[str]:
+    """Download one Pollinations image per (prompt, components) job, concurrently.
+
+    Repeat a prompt in jobs to get several seeds of it.  At most
+    cfg["pollinations_concurrency"] (default 4) requests run at once, sharing
+    one keep-alive connection pool.  Each job is recorded in source health like
+    a normal attempt.  Returns the saved image paths, in job order.
+    """
+    if not jobs or source_health.is_open("pollinations"):
+        return []
+    workers = max(1, min(int(cfg.get("pollinations_concurrency", POLLINATIONS_CONCURRENCY)), len(jobs)))
+    plan    = source_health.wait_plan("pollinations", "download", first=0, interval=1, give_up=120)
+    started = time.time()
+    log.info(f"Pollinations: batch of {len(jobs)} ({workers} at a time)…")
+
+    def _one(prompt: str, components: dict) -> Path | None:
+        t0       = time.time()
+        filepath = _pollinations_download(http, prompt, components, plan["give_up"])
+        elapsed  = time.time() - t0
+        source_health.record_attempt("pollinations", bool(filepath), elapsed,
+                                     None if filepath else "no image", cfg)
+        if filepath:
+            source_health.record_phase("pollinations", "download", elapsed)
+        else:
+            source_health.record_timeout("pollinations", "download", plan, elapsed)
+        return filepath
+
+    with _pollinations_http(workers) as http, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_one, prompt, components) for prompt, components in jobs]
+        saved   = [str(f.result()) for f in futures if f.result()]
+
+    log.info(f"Pollinations: batch saved {len(saved)}/{len(jobs)} in {time.time() - started:.0f} s")
+    return saved
 
 
 # ── Main image generator ──────────────────────────────────────────────────────
 
-def generate_image(prompt: str, components: dict, cfg: dict) -> str | None:
-    """Try Grok first, fall back to ChatGPT, then Pollinations. Returns saved filepath or None."""
-    sources = [
-        ("grok",         _generate_via_grok,         ["grokusercontent", "assets.grok.com"]),
-        ("chatgpt",      _generate_via_chatgpt,       ["oaiusercontent", "oaidalleapiprodscus"]),
-        ("pollinations", _generate_via_pollinations,  ["pollinations"]),
-    ]
-    for source, gen_fn, cdn_hints in sources:
+IMAGE_SOURCES = [
+    ("grok",         _generate_via_grok,         ["grokusercontent", "assets.grok.com"]),
+    ("chatgpt",      _generate_via_chatgpt,       ["oaiusercontent", "oaidalleapiprodscus"]),
+    ("pollinations", _generate_via_pollinations,  ["pollinations"]),
+]
+
+HTTP_SOURCES = {"pollinations"}   # need no browser
+
+# Extra-candidate rules for browser sources: (cdn hints, excluded-src regex)
+HARVEST_RULES = {
+    "grok":    (GROK_CDN_HINTS,    "profile_images"),
+    "chatgpt": (CHATGPT_CDN_HINTS, r"profile|avatar|logo|icon|spinner"),
+}
+HARVEST_SETTLE_S = 4    # let sibling images finish loading after the first one appears
+HARVEST_MAX      = 4    # extra images kept per generation
+
+
+def _harvest_extras(driver, source: str, primary_url: str, primary_path: str,
+                    prompt: str, components: dict) -> list[str]:
+    """With cfg["harvest_all"], queue every other distinct candidate from this generation.
+
+    Grok usually renders several images per prompt; without this only the first
+    is kept.  Duplicates (same src, or same bytes as an image already saved) are
+    dropped.  Returns the queued paths.
+    """
+    if source not in HARVEST_RULES:
+        return []
+    hints, exclude = HARVEST_RULES[source]
+    time.sleep(HARVEST_SETTLE_S)
+    try:
+        found = driver.execute_script(_HARVEST_IMAGES_JS, hints, exclude) or []
+    except Exception as exc:
+        log.debug(f"Harvest scan failed: {exc}")
+        return []
+
+    import inventory
+    seen   = {_file_digest(primary_path)}
+    queued: list[str] = []
+    for item in found:
+        if len(queued) >= HARVEST_MAX:
+            break
+        if item["src"] == primary_url:
+            continue
+        path = _save_image(driver, item["src"], prompt, source, components)
+        if not path:
+            continue
+        digest = _file_digest(path)
+        if digest in seen:
+            _discard_image(path)
+            continue
+        seen.add(digest)
+        queued.append(str(inventory.add(Path(path))))
+
+    if queued:
+        log.info(f"Harvest: queued {len(queued)} extra image(s) from one {source} generation")
+    return queued
+
+
+def _run_source(source: str, gen_fn, driver, prompt: str, components: dict, cfg: dict,
+                cancel: threading.Event | None = None) -> str | None:
+    """Run one generator and save its image. Returns saved filepath or None.
+
+    The outcome and duration go into source_health; cancelled attempts are not counted.
+    """
+    t0       = time.time()
+    filepath = None
+    reason   = None
+    capture  = driver is not None and _network_capture_enabled(cfg)
+    try:
+        if capture:
+            _drain_performance_log(driver)   # only this attempt's responses are candidates
+        img_url = gen_fn(driver, prompt, cancel=cancel)
+        if _cancelled(cancel):
+            return None
+        if not img_url:
+            reason = "no image"
+        elif img_url.startswith("SAVED:"):
+            filepath = img_url[6:]
+        else:
+            hints    = next(h for name, _, h in IMAGE_SOURCES if name == source)
+            filepath = _save_image(driver, img_url, prompt, source, components, capture, hints)
+            if not filepath:
+                reason = "save failed"
+            elif cfg.get("harvest_all", False) and not _cancelled(cancel):
+                try:
+                    _harvest_extras(driver, source, img_url, filepath, prompt, components)
+                except Exception as exc:
+                    log.warning(f"Harvest error (non-fatal): {exc}")
+    except Exception as exc:
+        reason = f"{type(exc).__name__}: {exc}"[:200]
+        raise
+    finally:
+        if not _cancelled(cancel):
+            source_health.record_attempt(source, filepath is not None, time.time() - t0, reason, cfg)
+    return filepath
+
+
+def _ordered_sources() -> list[str]:
+    """Source names to try, lowest expected time-to-success first (see source_health).
+
+    Browser and HTTP sources are ranked together.  Sources with an open
+    circuit are skipped; if every circuit is open they are all tried anyway
+    rather than posting nothing.
+    """
+    names   = [name for name, _, _ in IMAGE_SOURCES]
+    ordered = source_health.order_sources(names)
+    if not ordered:
+        log.warning("Every source circuit is open — trying all of them anyway")
+        return names
+    return ordered
+
+
+def _discard_image(filepath: str) -> None:
+    path = Path(filepath)
+    path.unlink(missing_ok=True)
+    path.with_name(path.stem + "_meta.json").unlink(missing_ok=True)
+
+
+def _generate_sequential(prompt: str, components: dict, cfg: dict,
+                         session: DriverSession | None) -> str | None:
+    by_name = {name: fn for name, fn, _ in IMAGE_SOURCES}
+    for source in _ordered_sources():
+        gen_fn = by_name[source]
         log.info(f"Trying {source}…")
         driver = None
+        owned  = session is None
         try:
-            driver = make_driver(cfg)
-            img_url = gen_fn(driver, prompt)
-            if img_url:
-                if img_url.startswith("SAVED:"):
-                    filepath = img_url[6:]
-                    log.info(f"Generated via {source}: {Path(filepath).name}")
-                    return filepath
-                filepath = _save_image(driver, img_url, prompt, source, components)
-                if filepath:
-                    log.info(f"Generated via {source}: {Path(filepath).name}")
-                    return filepath
+            if source in HTTP_SOURCES:
+                owned = False
+            elif session is not None:
+                driver = session.get(source)
+            else:
+                driver = make_driver(cfg)
+            filepath = _run_source(source, gen_fn, driver, prompt, components, cfg)
+            if filepath:
+                log.info(f"Generated via {source}: {Path(filepath).name}")
+                return filepath
             log.warning(f"{source} failed — trying next source")
         except Exception as exc:
             log.error(f"{source} error: {exc}", exc_info=True)
         finally:
-            if driver is not None:
+            if owned and driver is not None:
                 try:
                     driver.quit()
                 except Exception:
                     pass
+    return None
+
 
+def _generate_racing(prompt: str, components: dict, cfg: dict,
+                     session: DriverSession | None) -> str | None:
+    """Race the primary browser source against Pollinations (and optionally a second browser).
+
+    Hedged attempts start after cfg["hedge_delay_s"] seconds, or immediately if
+    the primary fails first.  The first saved image wins; the rest are cancelled
+    and anything they managed to save is discarded.
+    """
+    by_name     = {name: fn for name, fn, _ in IMAGE_SOURCES}
+    available   = _ordered_sources()
+    browsers    = [name for name in available if name not in HTTP_SOURCES]
+    second      = cfg.get("race_second_browser", "")
+    hedge_delay = float(cfg.get("hedge_delay_s", 20))
+
+    cancel    = threading.Event()
+    hedge_now = threading.Event()
+
+    def attempt(source: str, delay: float, use_session: bool):
+        if delay:
+            hedge_now.wait(delay)
+        if cancel.is_set():
+            return source, None
+        log.info(f"Race: starting {source}")
+        driver = None
+        own    = None   # a second browser gets its own session (and profile clone)
+        try:
+            if source not in HTTP_SOURCES:
+                if use_session:
+                    driver = session.get(source)
+                else:
+                    own    = DriverSession(cfg, worker=f"race-{source}-{os.getpid()}")
+                    driver = own.get(source)
+            return source, _run_source(source, by_name[source], driver, prompt, components, cfg, cancel)
+        except Exception as exc:
+            log.error(f"Race: {source} error: {exc}", exc_info=True)
+            return source, None
+        finally:
+            if own is not None:
+                own.close()
+
+    plan = []
+    if browsers:
+        plan.append((browsers[0], 0.0, session is not None))
+    if "pollinations" in available:
+        plan.append(("pollinations", hedge_delay if plan else 0.0, False))
+    if second in browsers[1:]:
+        # On the shared golden profile, a second Chrome would clear the
+        # primary's profile locks and kill it at launch.
+        if DriverSession(cfg).has_own_profile():
+            plan.append((second, hedge_delay, False))
+        else:
+            log.info(f"Race: race_second_browser '{second}' needs profile_clones or "
+                     f"session_mode 'cookies' — racing with one browser")
+    if not plan:
+        return None
+    log.info(f"Race: {', '.join(name for name, _, _ in plan)} (hedge delay {hedge_delay:.0f}s)")
+
+    def discard_late(fut) -> None:
+        if fut.cancelled():
+            return
+        source, filepath = fut.result()
+        if filepath:
+            log.info(f"Race: discarding late result from {source}")
+            _discard_image(filepath)
+
+    # No `with`: leaving the block would wait for the slowest attempt (a
+    # Pollinations request can block for its full HTTP timeout).  The winner
+    # returns at once; only attempts still driving the run's own session are
+    # waited for, since the caller goes on to use that Chrome.
+    winner: str | None = None
+    pool    = ThreadPoolExecutor(max_workers=len(plan))
+    futures = {pool.submit(attempt, *item): item[2] for item in plan}
+    pending = set(futures)
+    try:
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                source, filepath = fut.result()
+                if not filepath:
+                    log.warning(f"Race: {source} produced no image")
+                    hedge_now.set()
+                elif winner is None:
+                    winner = filepath
+                    log.info(f"Race: {source} won — cancelling the others")
+                    cancel.set()
+                    hedge_now.set()
+                else:
+                    log.info(f"Race: discarding late result from {source}")
+                    _discard_image(filepath)
+    finally:
+        cancel.set()
+        hedge_now.set()
+        for fut in pending:
+            fut.add_done_callback(discard_late)
+        wait([fut for fut in pending if futures[fut]])
+        pool.shutdown(wait=False, cancel_futures=True)
+    return winner
+
+
+def generate_image(prompt: str, components: dict, cfg: dict,
+                   session: DriverSession | None = None) -> str | None:
+    """Try the image sources in health order (_ordered_sources). Returns saved filepath or None.
+
+    With a session, browser sources share its Chrome instead of launching their own.
+    cfg["generation_mode"] = "race" runs the sources hedged in parallel instead.
+    """
+    t0 = time.time()
+    if cfg.get("generation_mode", "sequential") == "race":
+        filepath = _generate_racing(prompt, components, cfg, session)
+    else:
+        filepath = _generate_sequential(prompt, components, cfg, session)
+
+    if filepath:
+        log.info(f"Time to image: {time.time() - t0:.0f}s")
+        return filepath
     log.error("All sources failed — no image generated this run")
     return None
 
 
 # ── Main run function ─────────────────────────────────────────────────────────
 
-def run() -> bool:
-    """Generate 1 image, post to Instagram, engage. Returns True on success."""
-    # Prevent overlapping runs
+def _acquire_lock() -> bool:
+    """Take LOCK_FILE so runs (and refills) never share the Chrome profile. False if busy."""
     if LOCK_FILE.exists():
         try:
             age_s = time.time() - LOCK_FILE.stat().st_mtime
@@ -876,53 +1916,187 @@ def run() -> bool:
         except Exception:
             pass
 
-    LOCK_FILE.write_text(str(datetime.now()))
     try:
-        return _run_inner()
+        # "x": exactly one of two racing callers creates the file
+        with open(LOCK_FILE, "x", encoding="utf-8") as f:
+            f.write(str(datetime.now()))
+    except FileExistsError:
+        log.warning("Lock file appeared meanwhile — another run active. Exiting.")
+        return False
+    return True
+
+
+def _release_lock() -> None:
+    try:
+        LOCK_FILE.unlink()
+    except Exception:
+        pass
+
+
+def run() -> bool:
+    """Generate 1 image, post to Instagram, engage. Returns True on success."""
+    # Prevent overlapping runs
+    if not _acquire_lock():
+        return False
+
+    session = None
+    replace = False
+    try:
+        cfg     = load_config()
+        session = DriverSession(cfg)
+        posted, replace = _run_inner(cfg, session)
+        return posted
     finally:
+        if session is not None:
+            session.close()
+        _release_lock()
+        if replace:
+            _spawn_refill(1)
+
+
+def refill(limit: int | None = None) -> int:
+    """Top up the ready-image inventory (see inventory.py). Returns images added.
+
+    limit caps how many images this refill generates.
+    """
+    if not _acquire_lock():
+        return 0
+    try:
+        import inventory
+        return inventory.refill(load_config(), limit=limit)
+    finally:
+        _release_lock()
+
+
+def _spawn_refill(limit: int) -> None:
+    """Start `art_bot.py refill <limit>` detached, so it runs after this process has exited."""
+    try:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "refill", str(limit)],
+            cwd=str(BOT_DIR),
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            creationflags=getattr(subprocess, "DETACHED_PROCESS", 0)
+                          | getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0),
+        )
+        log.info(f"Started a background refill of up to {limit} image(s)")
+    except Exception as exc:
+        log.warning(f"Could not start a background refill: {exc}")
+
+
+def time_cold_start(cfg: dict) -> float | None:
+    """Seconds to launch Chrome on the configured profile and run a script, or None on failure."""
+    t0 = time.time()
+    try:
+        driver = make_driver(cfg)
         try:
-            LOCK_FILE.unlink()
-        except Exception:
-            pass
+            driver.execute_script("return 1;")
+        finally:
+            driver.quit()
+    except Exception as exc:
+        log.warning(f"Cold-start timing failed: {exc}")
+        return None
+    return round(time.time() - t0, 1)
 
 
-def _run_inner() -> bool:
-    log.info("=" * 60)
-    log.info(f"AI Art Bot — {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    log.info("=" * 60)
+def profile_gc() -> dict | None:
+    """Prune and vacuum the Chrome profile (see chrome_profiles.gc_profile).
 
-    cfg = load_config()
+    Times a make_driver cold start before and after.  Returns the GC result,
+    or None if a run currently holds the lock.
+    """
+    if not _acquire_lock():
+        return None
+    try:
+        cfg     = load_config()
+        profile = Path(cfg.get("chrome_profile_path", "").strip() or BOT_DIR / "chrome_profile")
+        before  = time_cold_start(cfg)
+        result  = chrome_profiles.gc_profile(
+            profile, float(cfg.get("profile_budget_mb", chrome_profiles.DEFAULT_BUDGET_MB))
+        )
+        result["cold_start_before_s"] = before
+        result["cold_start_after_s"]  = before if result["skipped"] else time_cold_start(cfg)
+        log.info(f"Cold start: {before}s before GC, {result['cold_start_after_s']}s after")
+        return result
+    finally:
+        _release_lock()
 
-    # 1. Build prompt
+
+def _next_prompt() -> tuple:
+    """Build the run's prompt with the house style suffix. Returns (prompt, components)."""
     prompt, components = build_prompt()
     prompt = prompt.rstrip(". ") + ". Psychedelic, 3D, Art."
     log.info(f"Prompt: {prompt[:100]}…")
+    return prompt, components
 
-    # 2. Generate image
-    filepath = generate_image(prompt, components, cfg)
-    if not filepath:
-        log.error("Image generation failed — skipping post")
-        cfg["last_run"] = datetime.now().isoformat()
-        save_config(cfg)
-        return False
+
+def _pick_ready_image(cfg: dict) -> tuple:
+    """Return (image, from_backlog) for an image that can be posted without generating.
+
+    With cfg["backlog_first"] the oldest saved-but-unposted image comes first
+    (from_backlog True); otherwise (or if there is none) the oldest image in
+    the inventory queue.  (None, False) if neither has one.
+    """
+    try:
+        if cfg.get("backlog_first", False):
+            from instagram_bot import claim_image, load_tracker, pick_unposted_image
+            waiting = pick_unposted_image(load_tracker())
+            # Claimed so a monitor force-posting alongside leaves it alone
+            if waiting and claim_image(waiting):
+                log.info(f"Backlog-first: posting waiting image {waiting.name}")
+                return waiting, True
+        import inventory
+        return inventory.take(), False
+    except Exception as exc:
+        log.warning(f"Ready-image check failed ({exc}) — generating instead")
+        return None, False
+
+
+def _run_inner(cfg: dict, session: DriverSession) -> tuple:
+    """One run on session. Returns (posted, replace): replace asks run() for a background refill."""
+    log.info("=" * 60)
+    log.info(f"AI Art Bot — {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    log.info("=" * 60)
+
+    backlog, from_backlog = _pick_ready_image(cfg)
+    if backlog:
+        # 1–2. Fast path: an image is already waiting — post it now
+        log.info(f"Skipping generation — posting ready image {backlog.name}")
+        filepath = str(backlog)
+    else:
+        # 1. Build prompt
+        prompt, components = _next_prompt()
+
+        # 2. Generate image
+        filepath = generate_image(prompt, components, cfg, session=session)
+        if not filepath:
+            log.error("Image generation failed — skipping post")
+            cfg["last_run"] = datetime.now().isoformat()
+            save_config(cfg)
+            return False, False
 
     # 3. Post to Instagram
     posted   = False
     caption  = ""
     try:
-        from instagram_bot import InstagramBot, build_caption, load_tracker, mark_posted, save_tracker
+        from instagram_bot import (InstagramBot, build_caption, load_tracker, mark_failed,
+                                   mark_posted, release_claim, save_tracker)
         img_path = Path(filepath)
-        caption  = build_caption(img_path)
-        bot      = InstagramBot(cfg)
-        success, post_url = bot.post_image(img_path, caption)
-        if success:
-            tracker = load_tracker()
-            mark_posted(tracker, img_path, post_url)
+        try:
+            caption  = build_caption(img_path)
+            bot      = InstagramBot(cfg)
+            success, post_url = bot.post_image(img_path, caption, session=session)
+            tracker  = load_tracker()
+            if success:
+                mark_posted(tracker, img_path, post_url)
+                log.info(f"Posted → {post_url or 'no URL captured'}")
+                posted = True
+            else:
+                # Counted per image, so one that never posts drops out of the backlog
+                mark_failed(tracker, img_path)
+                log.warning("Instagram post failed")
             save_tracker(tracker)
-            log.info(f"Posted → {post_url or 'no URL captured'}")
-            posted = True
-        else:
-            log.warning("Instagram post failed")
+        finally:
+            release_claim(img_path)
     except Exception as exc:
         log.error(f"Instagram error: {exc}")
 
@@ -930,22 +2104,26 @@ def _run_inner() -> bool:
     if posted:
         try:
             from engagement_bot import run_post_engagement
-            run_post_engagement(cfg, caption)
+            run_post_engagement(cfg, caption, session=session)
         except Exception as exc:
             log.warning(f"Engagement error (non-fatal): {exc}")
 
+    # 5. Backlog-first: once a waiting image is live, run() starts a detached
+    #    one-image refill after releasing the lock, so its replacement is
+    #    generated off the run (into the inventory queue).
+    replace = from_backlog and posted
+
     cfg["last_run"] = datetime.now().isoformat()
     save_config(cfg)
 
     log.info("=" * 60)
     log.info(f"Run complete — {'SUCCESS' if posted else 'PARTIAL (image saved, post failed)'}")
-    return posted
+    return posted, replace
 
 
 # ── CLI ───────────────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
-    import sys
     import ctypes
 
     cmd = sys.argv[1] if len(sys.argv) > 1 else "run"
@@ -958,6 +2136,21 @@ if __name__ == "__main__":
             sys.exit(2)
         sys.exit(0 if success else 1)
 
+    elif cmd == "refill":
+        try:
+            refill(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+        except Exception as exc:
+            log.critical(f"Unhandled exception in refill(): {exc}", exc_info=True)
+            sys.exit(2)
+        sys.exit(0)
+
+    elif cmd == "profile-gc":
+        result = profile_gc()
+        if result is None:
+            print("art_bot is running — try again later.")
+            sys.exit(1)
+        print(json.dumps(result, indent=2))
+
     elif cmd == "login":
         site = sys.argv[2].lower() if len(sys.argv) > 2 else "grok"
         urls = {
@@ -972,7 +2165,7 @@ if __name__ == "__main__":
         print(f"Opening {site} for manual login…")
         cfg    = load_config()
         driver = make_driver(cfg, headless=False)
-        driver.get(url)
+        load_page(driver, url)
         ctypes.windll.user32.MessageBoxW(
             0,
             f"Log in to {site} in Chrome, then click OK to save the session.",
@@ -982,7 +2175,30 @@ if __name__ == "__main__":
         print("Session saved.")
         driver.quit()
 
+    elif cmd == "export-session":
+        print("Exporting instagram / grok / chatgpt logins from the Chrome profile…")
+        cfg    = load_config()
+        driver = make_driver(cfg)
+        try:
+            session_state.export_state(driver)
+        finally:
+            driver.quit()
+        print(f"Saved to {session_state.STATE_FILE}")
+
+    elif cmd == "session-status":
+        state = session_state.load_state()
+        if state is None:
+            print("No exported session — run: python art_bot.py export-session")
+            sys.exit(1)
+        print(f"Exported at {state.get('exported_at')}")
+        expired = False
+        for name, info in session_state.status(state).items():
+            print(f"  {name:<10} {info['summary']}")
+            expired = expired or info["expired"]
+        sys.exit(1 if expired else 0)
+
     else:
         print(f"Unknown command: {cmd}")
-        print("Usage: python art_bot.py [run|login [grok|chatgpt|instagram]]")
+        print("Usage: python art_bot.py [run|refill [max_images]|profile-gc|export-session|session-status|"
+              "login [grok|chatgpt|instagram]]")
         sys.exit(1)
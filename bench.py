@@ -0,0 +1,180 @@
+"""
+Micro-benchmarks for the browser layer.
+
+  python bench.py backend [runs]   — per-action latency, Selenium vs CDP backend
+  python bench.py typing [runs]    — typing latency per 100 characters
+
+Each benchmark starts Chrome on a throw-away profile (never chrome_profile),
+works against a local test page, and prints the median and p90 per action.
+"""
+
+import json
+import logging
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import urllib.parse
+
+from selenium.webdriver.common.by import By
+
+from art_bot import insert_text, load_config, make_driver
+
+log = logging.getLogger("art_bot")
+
+TEST_PAGE = "data:text/html," + urllib.parse.quote("""<!doctype html>
+<html><head><title>bench</title></head><body>
+<div id="box" class="box"><p>static text</p></div>
+<button id="btn" onclick="this.dataset.clicks = (+this.dataset.clicks || 0) + 1">Click</button>
+<textarea id="ta"></textarea>
+<div id="ce" contenteditable="true"></div>
+<ul>""" + "".join(f"<li><a href='#{i}'>item {i}</a></li>" for i in range(200)) + """</ul>
+</body></html>""")
+
+
+def _bench_cfg(backend: str, profile: str) -> dict:
+    cfg = dict(load_config())
+    cfg.update({
+        "driver_backend":      backend,
+        "chrome_profile_path": profile,
+        "capture_mode":        "download",
+        "flows":               {},
+    })
+    return cfg
+
+
+def _timed(fn, runs: int) -> list:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def _summary(samples: list) -> dict:
+    samples = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(samples), 2),
+        "p90_ms":    round(samples[min(len(samples) - 1, int(len(samples) * 0.9))], 2),
+    }
+
+
+# ── backend ───────────────────────────────────────────────────────────────────
+
+def _backend_actions(driver) -> dict:
+    box = driver.find_element(By.ID, "box")
+    btn = driver.find_element(By.ID, "btn")
+    ta  = driver.find_element(By.ID, "ta")
+    return {
+        "execute_script": lambda: driver.execute_script("return document.title;"),
+        "find_css":       lambda: driver.find_element(By.CSS_SELECTOR, "#box p"),
+        "find_xpath":     lambda: driver.find_element(By.XPATH, "//li[150]/a"),
+        "find_elements":  lambda: driver.find_elements(By.CSS_SELECTOR, "li a"),
+        "get_attribute":  lambda: btn.get_attribute("id"),
+        "text":           lambda: box.text,
+        "click":          lambda: btn.click(),
+        "send_keys":      lambda: ta.send_keys("abc"),
+        "screenshot":     lambda: driver.get_screenshot_as_png(),
+        "get_cookies":    lambda: driver.get_cookies(),
+        "get":            lambda: driver.get(TEST_PAGE),   # last: invalidates the elements above
+    }
+
+
+def bench_backend(backend: str, runs: int) -> dict:
+    profile = tempfile.mkdtemp(prefix="artbot_bench_")
+    try:
+        t0     = time.perf_counter()
+        driver = make_driver(_bench_cfg(backend, profile))
+        launch = (time.perf_counter() - t0) * 1000
+        actual = "cdp" if type(driver).__name__ == "CdpDriver" else "selenium"
+        if actual != backend:
+            log.warning(f"Asked for the {backend} backend but got {actual}")
+        try:
+            driver.get(TEST_PAGE)
+            results = {"launch": {"median_ms": round(launch, 1), "p90_ms": round(launch, 1)}}
+            for name, action in _backend_actions(driver).items():
+                results[name] = _summary(_timed(action, runs))
+            return {"backend": actual, "actions": results}
+        finally:
+            driver.quit()
+    finally:
+        shutil.rmtree(profile, ignore_errors=True)
+
+
+def compare_backends(runs: int = 30) -> dict:
+    results = {b: bench_backend(b, runs) for b in ("selenium", "cdp")}
+    sel, cdp = results["selenium"]["actions"], results["cdp"]["actions"]
+    print(f"\n{'action':<16}{'selenium ms':>14}{'cdp ms':>10}{'speed-up':>10}")
+    for name in sel:
+        a, b = sel[name]["median_ms"], cdp[name]["median_ms"]
+        print(f"{name:<16}{a:>14.2f}{b:>10.2f}{(a / b if b else 0):>9.1f}x")
+    print(f"\n(median of {runs} runs per action; launch is a single run)")
+    return results
+
+
+# ── typing ────────────────────────────────────────────────────────────────────
+
+TYPING_TEXT = ("Ethereal lighthouse on a basalt cliff at dusk, volumetric fog, "
+               "impressionist brushwork, teal and amber palette")[:100]
+
+_CLEAR_JS = """
+var el = arguments[0];
+if (el.isContentEditable) el.textContent = ''; else el.value = '';
+"""
+
+
+def _per_char(element, text: str) -> None:
+    """The old slow_type: one send_keys per character (pauses left out)."""
+    for ch in text:
+        element.send_keys(ch)
+
+
+def bench_typing(runs: int = 5, backend: str = "selenium") -> dict:
+    """ms per 100 characters: per-character send_keys vs insert_text, on a textarea and a contenteditable."""
+    profile = tempfile.mkdtemp(prefix="artbot_bench_")
+    try:
+        driver = make_driver(_bench_cfg(backend, profile))
+        try:
+            driver.get(TEST_PAGE)
+            per_100 = 100 / len(TYPING_TEXT)
+            methods = {
+                "send_keys/char":      lambda el: _per_char(el, TYPING_TEXT),
+                "insert_text":         lambda el: insert_text(driver, el, TYPING_TEXT, pace=False),
+                "insert_text (paced)": lambda el: insert_text(driver, el, TYPING_TEXT),
+            }
+            results = {}
+            for target in ("ta", "ce"):
+                el = driver.find_element(By.ID, target)
+                for name, method in methods.items():
+                    samples = []
+                    for _ in range(runs):
+                        driver.execute_script(_CLEAR_JS, el)
+                        samples.extend(_timed(lambda: method(el), 1))
+                    results[f"{name} [{target}]"] = {k: round(v * per_100, 1)
+                                                     for k, v in _summary(samples).items()}
+        finally:
+            driver.quit()
+    finally:
+        shutil.rmtree(profile, ignore_errors=True)
+
+    print(f"\n{'method':<30}{'ms / 100 chars':>16}")
+    for name, r in results.items():
+        print(f"{name:<30}{r['median_ms']:>16.1f}")
+    print(f"\n(median of {runs} runs; ta = textarea, ce = contenteditable)")
+    return results
+
+
+if __name__ == "__main__":
+    cmd  = sys.argv[1] if len(sys.argv) > 1 else "backend"
+    args = [a for a in sys.argv[2:] if not a.startswith("--")]
+    runs = int(args[0]) if args else (30 if cmd == "backend" else 5)
+
+    if cmd in ("backend", "typing"):
+        results = compare_backends(runs) if cmd == "backend" else bench_typing(runs)
+        if "--json" in sys.argv:
+            print(json.dumps(results, indent=2))
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,691 @@
+"""
+CDP driver — talks to Chrome over the DevTools websocket, without chromedriver.
+
+With Selenium every command is an HTTP request to chromedriver, which turns
+it into one or more DevTools calls.  CdpDriver launches Chrome itself with
+--remote-debugging-port and sends DevTools commands straight down the page's
+websocket, so each execute_script / find / click is a single round trip.
+
+It implements the part of the Selenium WebDriver / WebElement API the bot
+uses, so WebDriverWait, expected_conditions and every flow work unchanged:
+
+  driver:  get, current_url, title, page_source, execute_script,
+           execute_async_script, execute_cdp_cmd, find_element(s),
+           save_screenshot, get_cookies, add_cookie, get_log("performance"),
+           set_page_load_timeout, set_script_timeout, implicitly_wait,
+           timeouts.script, switch_to.default_content, quit
+  element: click, send_keys (text, Keys.* combos, file uploads), clear,
+           get_attribute, text, tag_name, is_displayed, is_enabled,
+           find_element(s), parent
+
+Not supported: switch_to.frame (raises NoSuchFrameException, which the
+Turnstile handling already tolerates) and ActionChains (the engagement
+comment flow falls back to element.send_keys).
+
+Select with cfg["driver_backend"] = "cdp" (default "selenium"); make_driver
+falls back to Selenium if Chrome cannot be launched this way or the
+websocket-client package is missing.  Compare the two with
+`python bench.py backend`.
+"""
+
+import base64
+import collections
+import itertools
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+from selenium.common.exceptions import (
+    ElementNotInteractableException,
+    JavascriptException,
+    NoSuchElementException,
+    NoSuchFrameException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from page_scripts import FOCUS_END_JS, locator
+
+try:
+    import websocket   # websocket-client
+except ImportError:    # optional — make_driver falls back to Selenium
+    websocket = None
+
+CHROME_CANDIDATES = [
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    str(Path(os.environ.get("LOCALAPPDATA", "")) / "Google" / "Chrome" / "Application" / "chrome.exe"),
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+CHROME_NAMES   = ["chrome", "google-chrome", "google-chrome-stable", "chromium", "chromium-browser"]
+LAUNCH_TIMEOUT = 20      # seconds to wait for DevToolsActivePort
+COMMAND_TIMEOUT = 60     # seconds to wait for any single DevTools reply
+MAX_NETWORK_EVENTS = 5000
+
+log = logging.getLogger("art_bot")
+
+
+# ── In-page script wrapper ────────────────────────────────────────────────────
+#
+# Scripts run inside one Runtime.evaluate.  DOM nodes cross the wire as
+# {"__artbotEl": id} references into a per-document registry, so elements can
+# be returned from and passed back into scripts without extra round trips.
+# Ids carry a random per-document token, so a reference into a previous
+# document never resolves to a node of the new one; it (or a detached node)
+# is stale.  The driver also refuses elements from before the last
+# main-frame navigation without asking the page.
+
+_WRAPPER_JS = """
+(function () {
+    var R = window.__artbotRefs || (window.__artbotRefs = {
+        tok: Math.random().toString(36).slice(2, 10), next: 1, byId: new Map(), ids: new WeakMap()});
+    function isNode(v) { return v && typeof v === 'object' && typeof v.nodeType === 'number' && typeof v.nodeName === 'string'; }
+    function ref(node) {
+        var id = R.ids.get(node);
+        if (!id) { id = R.tok + ':' + (R.next++); R.ids.set(node, id); R.byId.set(id, node); }
+        return {__artbotEl: id};
+    }
+    function dec(v) {
+        if (v && typeof v === 'object') {
+            if (v.__artbotEl) {
+                if (String(v.__artbotEl).split(':')[0] !== R.tok) throw new Error('artbot:stale');
+                var n = R.byId.get(v.__artbotEl);
+                if (!n || !n.isConnected) throw new Error('artbot:stale');
+                return n;
+            }
+            if (Array.isArray(v)) return v.map(dec);
+            var o = {};
+            for (var k in v) o[k] = dec(v[k]);
+            return o;
+        }
+        return v;
+    }
+    function enc(v, depth) {
+        if (v === undefined || v === null || depth > 20 || v === window || typeof v === 'function') return null;
+        if (isNode(v)) return ref(v);
+        if (Array.isArray(v) || (typeof v === 'object' && typeof v.length === 'number' && typeof v.item === 'function'))
+            return Array.prototype.map.call(v, function (x) { return enc(x, depth + 1); });
+        if (typeof v === 'object') {
+            var o = {};
+            for (var k in v) o[k] = enc(v[k], depth + 1);
+            return o;
+        }
+        return v;
+    }
+    var args = dec(__ARGS__);
+    var fn = function () { __BODY__
+    };
+    __CALL__
+})()
+"""
+
+_SYNC_CALL = "return enc(fn.apply(window, args), 0);"
+
+_ASYNC_CALL = """return new Promise(function (resolve, reject) {
+        var timer = setTimeout(function () { reject(new Error('artbot:timeout')); }, __MS__);
+        args.push(function (v) { clearTimeout(timer); resolve(enc(v, 0)); });
+        try { fn.apply(window, args); } catch (e) { clearTimeout(timer); reject(e); }
+    });"""
+
+_FIND_JS = """
+var by = arguments[0], value = arguments[1], root = arguments[2] || document;
+if (by === 'xpath') {
+    var snap = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var out = [];
+    for (var i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+    return out;
+}
+return Array.prototype.slice.call(root.querySelectorAll(value));
+"""
+
+_CLICK_POINT_JS = """
+var el = arguments[0];
+el.scrollIntoView({block: 'center', inline: 'center'});
+var r = el.getBoundingClientRect();
+if (!r.width || !r.height) return null;
+return [r.left + r.width / 2, r.top + r.height / 2];
+"""
+
+_ATTRIBUTE_JS = """
+var el = arguments[0], name = arguments[1];
+var v = el[name];
+if (v === undefined || v === null || typeof v === 'object' || typeof v === 'function') v = el.getAttribute(name);
+if (v === true) return 'true';
+if (v === false) return el.hasAttribute(name) ? el.getAttribute(name) : null;
+return v === null || v === undefined ? null : String(v);
+"""
+
+_DISPLAYED_JS = """
+var el = arguments[0];
+if (!el.getClientRects().length) return false;
+var s = window.getComputedStyle(el);
+return s.visibility !== 'hidden' && s.display !== 'none' && parseFloat(s.opacity) > 0;
+"""
+
+
+# ── Keys ──────────────────────────────────────────────────────────────────────
+
+# Selenium key code → (key, code, windowsVirtualKeyCode, text)
+_SPECIAL_KEYS = {
+    Keys.RETURN:    ("Enter", "Enter", 13, "\r"),
+    Keys.ENTER:     ("Enter", "Enter", 13, "\r"),
+    Keys.TAB:       ("Tab", "Tab", 9, "\t"),
+    Keys.BACKSPACE: ("Backspace", "Backspace", 8, ""),
+    Keys.DELETE:    ("Delete", "Delete", 46, ""),
+    Keys.ESCAPE:    ("Escape", "Escape", 27, ""),
+}
+# Selenium modifier → CDP modifier bit
+_MODIFIERS = {Keys.ALT: 1, Keys.CONTROL: 2, Keys.COMMAND: 4, Keys.SHIFT: 8}
+# Editing commands Chrome needs spelled out for synthetic Ctrl+<key>
+_CTRL_COMMANDS = {"a": "selectAll", "c": "copy", "v": "paste", "x": "cut", "z": "undo"}
+
+
+# ── Connection ────────────────────────────────────────────────────────────────
+
+class _Connection:
+    """One DevTools websocket: commands in, replies and events out (reader thread)."""
+
+    def __init__(self, ws_url: str, record_network: bool = False):
+        self.ws        = websocket.create_connection(ws_url, timeout=COMMAND_TIMEOUT,
+                                                     suppress_origin=True, enable_multithread=True)
+        self.ids       = itertools.count(1)
+        self.pending: dict[int, queue.Queue] = {}
+        self.lock      = threading.Lock()
+        self.closed    = False
+        self.record    = record_network
+        self.network   = collections.deque(maxlen=MAX_NETWORK_EVENTS)
+        self.lifecycle = {"Page.domContentEventFired": threading.Event(),
+                          "Page.loadEventFired": threading.Event()}
+        self.generation = 0      # main-frame navigations seen so far
+        self.reader    = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+
+    def _read(self) -> None:
+        while True:
+            try:
+                self.ws.settimeout(None)
+                msg = json.loads(self.ws.recv())
+            except Exception:
+                break
+            if "id" in msg:
+                with self.lock:
+                    waiter = self.pending.pop(msg["id"], None)
+                if waiter is not None:
+                    waiter.put(msg)
+                continue
+            method = msg.get("method", "")
+            if method in self.lifecycle:
+                self.lifecycle[method].set()
+            elif method == "Page.frameNavigated" and not msg.get("params", {}).get("frame", {}).get("parentId"):
+                self.generation += 1
+            elif self.record and method.startswith("Network."):
+                self.network.append({"message": json.dumps({"message": msg}),
+                                     "timestamp": int(time.time() * 1000)})
+            elif method in ("Inspector.detached", "Inspector.targetCrashed"):
+                break
+        self.closed = True
+        with self.lock:
+            waiters, self.pending = list(self.pending.values()), {}
+        for waiter in waiters:
+            waiter.put({"error": {"message": "DevTools connection closed"}})
+
+    def call(self, method: str, params: dict | None = None, timeout: float = COMMAND_TIMEOUT) -> dict:
+        if self.closed:
+            raise WebDriverException("DevTools connection closed")
+        msg_id = next(self.ids)
+        waiter: queue.Queue = queue.Queue(maxsize=1)
+        with self.lock:
+            self.pending[msg_id] = waiter
+        self.ws.send(json.dumps({"id": msg_id, "method": method, "params": params or {}}))
+        try:
+            reply = waiter.get(timeout=timeout)
+        except queue.Empty:
+            with self.lock:
+                self.pending.pop(msg_id, None)
+            raise TimeoutException(f"{method}: no reply within {timeout:.0f}s")
+        if "error" in reply:
+            raise WebDriverException(f"{method}: {reply['error'].get('message')}")
+        return reply.get("result", {})
+
+    def close(self) -> None:
+        self.closed = True
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+
+# ── Driver ────────────────────────────────────────────────────────────────────
+
+class _Timeouts:
+    def __init__(self):
+        self.page_load = 300.0
+        self.script    = 30.0
+        self.implicit_wait = 0.0
+
+
+class _SwitchTo:
+    def default_content(self) -> None:
+        pass
+
+    def frame(self, frame) -> None:
+        raise NoSuchFrameException("Frames are not supported by the CDP backend")
+
+
+def find_chrome(cfg: dict) -> str | None:
+    """Path of the Chrome binary: cfg["chrome_binary"], the usual install paths, then PATH."""
+    explicit = cfg.get("chrome_binary", "").strip()
+    if explicit:
+        return explicit
+    for path in CHROME_CANDIDATES:
+        if path and Path(path).exists():
+            return path
+    for name in CHROME_NAMES:
+        found = shutil.which(name)
+        if found:
+            return found
+    return None
+
+
+class CdpDriver:
+    """A Chrome process plus a DevTools connection to its first tab (see module doc)."""
+
+    def __init__(self, chrome: str, arguments: list, page_load_strategy: str = "normal",
+                 record_network: bool = False):
+        if websocket is None:
+            raise WebDriverException("websocket-client is not installed")
+        self.page_load_strategy = page_load_strategy
+        self.timeouts  = _Timeouts()
+        self.switch_to = _SwitchTo()
+        self._temp_dir = None
+
+        args = [a for a in arguments if not a.startswith("--remote-debugging-")]
+        profile = next((a.split("=", 1)[1] for a in args if a.startswith("--user-data-dir=")), None)
+        if profile is None:
+            self._temp_dir = tempfile.mkdtemp(prefix="artbot_cdp_")
+            profile = self._temp_dir
+            args.append(f"--user-data-dir={profile}")
+        self._port_file = Path(profile) / "DevToolsActivePort"
+        self._port_file.unlink(missing_ok=True)
+
+        self.process = subprocess.Popen(
+            [chrome, *args, "--remote-debugging-port=0", "about:blank"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        self._conn = None
+        try:
+            self.port  = self._wait_for_port()
+            self._conn = _Connection(self._page_ws_url(), record_network)
+            self._conn.call("Page.enable")
+            self._conn.call("Runtime.enable")
+        except BaseException:
+            # Leave nothing holding the profile, or the Selenium fallback finds it in use
+            self._abort()
+            raise
+
+    def _abort(self) -> None:
+        """Tear down a half-started driver: drop the connection and kill Chrome."""
+        if self._conn is not None:
+            self._conn.close()
+        if self.process.poll() is None:
+            self.process.kill()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                pass
+        if self._temp_dir:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    # ── launch helpers ──
+
+    def _wait_for_port(self) -> int:
+        deadline = time.time() + LAUNCH_TIMEOUT
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise WebDriverException(f"Chrome exited during start-up (code {self.process.returncode})")
+            try:
+                return int(self._port_file.read_text().splitlines()[0])
+            except (OSError, ValueError, IndexError):
+                time.sleep(0.05)
+        raise WebDriverException("Chrome did not open a DevTools port")
+
+    def _json(self, path: str, method: str = "GET"):
+        req = urllib.request.Request(f"http://127.0.0.1:{self.port}{path}", method=method)
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+
+    def _page_ws_url(self) -> str:
+        deadline = time.time() + LAUNCH_TIMEOUT
+        while time.time() < deadline:
+            pages = [t for t in self._json("/json/list") if t.get("type") == "page"]
+            if pages:
+                return pages[0]["webSocketDebuggerUrl"]
+            time.sleep(0.1)
+        return self._json("/json/new?about:blank", method="PUT")["webSocketDebuggerUrl"]
+
+    # ── raw protocol ──
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: dict) -> dict:
+        return self._conn.call(cmd, cmd_args)
+
+    def _evaluate(self, expression: str, await_promise: bool = False, timeout: float = COMMAND_TIMEOUT):
+        result = self._conn.call("Runtime.evaluate", {
+            "expression":    expression,
+            "returnByValue": True,
+            "awaitPromise":  await_promise,
+            "userGesture":   True,
+        }, timeout=timeout)
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            text = details.get("exception", {}).get("description") or details.get("text", "")
+            if "artbot:stale" in text:
+                raise StaleElementReferenceException("Element is no longer attached to the page")
+            if "artbot:timeout" in text:
+                raise TimeoutException("Async script did not call back in time")
+            raise JavascriptException(text)
+        return result.get("result", {}).get("value")
+
+    # ── scripts ──
+
+    def _encode(self, value):
+        if isinstance(value, CdpElement):
+            self._check_current(value)
+            return {"__artbotEl": value.id}
+        if isinstance(value, (list, tuple)):
+            return [self._encode(v) for v in value]
+        if isinstance(value, dict):
+            return {k: self._encode(v) for k, v in value.items()}
+        return value
+
+    def _decode(self, value):
+        if isinstance(value, dict):
+            if "__artbotEl" in value and len(value) == 1:
+                return CdpElement(self, value["__artbotEl"])
+            return {k: self._decode(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._decode(v) for v in value]
+        return value
+
+    def _script(self, script: str, args: tuple, call: str, await_promise: bool, timeout: float):
+        expression = (_WRAPPER_JS
+                      .replace("__ARGS__", json.dumps(self._encode(list(args))))
+                      .replace("__CALL__", call)
+                      .replace("__BODY__", script))
+        return self._decode(self._evaluate(expression, await_promise, timeout))
+
+    def execute_script(self, script: str, *args):
+        return self._script(script, args, _SYNC_CALL, False, COMMAND_TIMEOUT)
+
+    def execute_async_script(self, script: str, *args):
+        ms = int(self.timeouts.script * 1000)
+        return self._script(script, args, _ASYNC_CALL.replace("__MS__", str(ms)),
+                            True, self.timeouts.script + 5)
+
+    # ── navigation ──
+
+    def get(self, url: str) -> None:
+        strategy = self.page_load_strategy
+        wanted   = {"normal": "Page.loadEventFired", "eager": "Page.domContentEventFired"}.get(strategy)
+        for event in self._conn.lifecycle.values():
+            event.clear()
+        result = self._conn.call("Page.navigate", {"url": url}, timeout=self.timeouts.page_load)
+        if result.get("errorText"):
+            raise WebDriverException(f"Navigation to {url} failed: {result['errorText']}")
+        if wanted and not self._conn.lifecycle[wanted].wait(self.timeouts.page_load):
+            raise TimeoutException(f"Page load timed out after {self.timeouts.page_load:.0f}s: {url}")
+
+    def refresh(self) -> None:
+        self.get(self.current_url)
+
+    @property
+    def current_url(self) -> str:
+        return self._evaluate("location.href")
+
+    @property
+    def title(self) -> str:
+        return self._evaluate("document.title")
+
+    @property
+    def page_source(self) -> str:
+        return self._evaluate("document.documentElement.outerHTML")
+
+    # ── timeouts ──
+
+    def set_page_load_timeout(self, seconds: float) -> None:
+        self.timeouts.page_load = float(seconds)
+
+    def set_script_timeout(self, seconds: float) -> None:
+        self.timeouts.script = float(seconds)
+
+    def implicitly_wait(self, seconds: float) -> None:
+        self.timeouts.implicit_wait = float(seconds)
+
+    # ── finding ──
+
+    def _find(self, by: str, value: str, root=None) -> list:
+        kind, selector = locator(by, value)
+        deadline = time.time() + self.timeouts.implicit_wait
+        while True:
+            found = self.execute_script(_FIND_JS, kind, selector, root)
+            if found or time.time() >= deadline:
+                return found or []
+            time.sleep(0.1)
+
+    def find_elements(self, by: str = By.ID, value: str | None = None) -> list:
+        return self._find(by, value)
+
+    def find_element(self, by: str = By.ID, value: str | None = None):
+        found = self._find(by, value)
+        if not found:
+            raise NoSuchElementException(f"No element matches {by}={value!r}")
+        return found[0]
+
+    # ── input ──
+
+    def _check_current(self, element) -> None:
+        if element.generation != self._conn.generation:
+            raise StaleElementReferenceException("Element belongs to a page that has been navigated away")
+
+    def _object_id(self, element) -> str:
+        self._check_current(element)
+        result = self._conn.call("Runtime.evaluate", {
+            "expression": f"window.__artbotRefs && window.__artbotRefs.byId.get({json.dumps(element.id)})",
+        })
+        object_id = result.get("result", {}).get("objectId")
+        if not object_id:
+            raise StaleElementReferenceException("Element is no longer attached to the page")
+        return object_id
+
+    def _mouse_click(self, x: float, y: float) -> None:
+        for kind in ("mousePressed", "mouseReleased"):
+            self._conn.call("Input.dispatchMouseEvent", {
+                "type": kind, "x": x, "y": y, "button": "left", "clickCount": 1,
+            })
+
+    def _key(self, key: str, code: str, vk: int, text: str, modifiers: int, commands=None) -> None:
+        down = {"type": "keyDown" if text else "rawKeyDown", "key": key, "code": code,
+                "windowsVirtualKeyCode": vk, "modifiers": modifiers}
+        if text:
+            down["text"] = text
+        if commands:
+            down["commands"] = commands
+        self._conn.call("Input.dispatchKeyEvent", down)
+        self._conn.call("Input.dispatchKeyEvent", {"type": "keyUp", "key": key, "code": code,
+                                                   "windowsVirtualKeyCode": vk, "modifiers": modifiers})
+
+    def _type(self, text: str) -> None:
+        """Type text into the focused element; Selenium Keys codes act as in send_keys."""
+        modifiers = 0
+        buffer    = ""
+
+        def flush() -> None:
+            nonlocal buffer
+            if buffer:
+                self._conn.call("Input.insertText", {"text": buffer})
+                buffer = ""
+
+        for ch in text:
+            if ch == Keys.NULL:
+                flush()
+                modifiers = 0
+            elif ch in _MODIFIERS:
+                flush()
+                modifiers |= _MODIFIERS[ch]
+            elif ch in _SPECIAL_KEYS:
+                flush()
+                self._key(*_SPECIAL_KEYS[ch], modifiers)
+            elif modifiers & (2 | 4) and ch.isalnum():
+                flush()
+                command = _CTRL_COMMANDS.get(ch.lower())
+                self._key(ch, f"Key{ch.upper()}" if ch.isalpha() else f"Digit{ch}",
+                          ord(ch.upper()), "", modifiers, [command] if command else None)
+            else:
+                buffer += ch
+        flush()
+
+    # ── screenshots / cookies / logs ──
+
+    def get_screenshot_as_png(self) -> bytes:
+        return base64.b64decode(self._conn.call("Page.captureScreenshot", {"format": "png"})["data"])
+
+    def save_screenshot(self, filename: str) -> bool:
+        Path(filename).write_bytes(self.get_screenshot_as_png())
+        return True
+
+    def get_cookies(self) -> list:
+        return self._conn.call("Network.getCookies", {"urls": [self.current_url]}).get("cookies", [])
+
+    def add_cookie(self, cookie: dict) -> None:
+        params = dict(cookie)
+        if "domain" not in params:
+            params["url"] = self.current_url
+        self._conn.call("Network.setCookie", params)
+
+    def delete_all_cookies(self) -> None:
+        self._conn.call("Network.clearBrowserCookies")
+
+    def get_log(self, log_type: str) -> list:
+        if log_type != "performance":
+            return []
+        entries = list(self._conn.network)
+        self._conn.network.clear()
+        return entries
+
+    # ── shutdown ──
+
+    def quit(self) -> None:
+        """Close Chrome cleanly (so the profile is flushed), killing it if it hangs."""
+        try:
+            browser = websocket.create_connection(self._json("/json/version")["webSocketDebuggerUrl"],
+                                                  timeout=5, suppress_origin=True)
+            browser.send(json.dumps({"id": 1, "method": "Browser.close"}))
+            browser.close()
+        except Exception:
+            pass
+        self._conn.close()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        if self._temp_dir:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+
+class CdpElement:
+    """A DOM node reference inside a CdpDriver page."""
+
+    def __init__(self, driver: CdpDriver, element_id: str):
+        self.parent     = driver
+        self.id         = element_id
+        self.generation = driver._conn.generation
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CdpElement) and other.id == self.id and other.parent is self.parent
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"<CdpElement {self.id}>"
+
+    def _run(self, script: str, *args):
+        return self.parent.execute_script(script, self, *args)
+
+    @property
+    def tag_name(self) -> str:
+        return self._run("return arguments[0].tagName.toLowerCase();")
+
+    @property
+    def text(self) -> str:
+        return self._run("return arguments[0].innerText || '';")
+
+    def get_attribute(self, name: str):
+        return self._run(_ATTRIBUTE_JS, name)
+
+    def get_dom_attribute(self, name: str):
+        return self._run("return arguments[0].getAttribute(arguments[1]);", name)
+
+    def is_displayed(self) -> bool:
+        return bool(self._run(_DISPLAYED_JS))
+
+    def is_enabled(self) -> bool:
+        return bool(self._run("return !arguments[0].disabled;"))
+
+    def click(self) -> None:
+        point = self._run(_CLICK_POINT_JS)
+        if not point:
+            raise ElementNotInteractableException(f"{self!r} has no size and cannot be clicked")
+        self.parent._mouse_click(*point)
+
+    def clear(self) -> None:
+        self._run(
+            "var el = arguments[0];"
+            "if (el.isContentEditable) el.textContent = ''; else el.value = '';"
+            "el.dispatchEvent(new Event('input', {bubbles: true}));"
+        )
+
+    def send_keys(self, *value) -> None:
+        text = "".join(str(v) for v in value)
+        if self._run("return arguments[0].tagName === 'INPUT' && arguments[0].type === 'file';"):
+            self.parent.execute_cdp_cmd("DOM.setFileInputFiles", {
+                "files": text.split("\n"), "objectId": self.parent._object_id(self),
+            })
+            return
+        self._run(FOCUS_END_JS)
+        self.parent._type(text)
+
+    def find_elements(self, by: str = By.ID, value: str | None = None) -> list:
+        return self.parent._find(by, value, self)
+
+    def find_element(self, by: str = By.ID, value: str | None = None):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"No element matches {by}={value!r} inside {self!r}")
+        return found[0]
+
+
+def launch(cfg: dict, arguments: list, page_load_strategy: str, record_network: bool) -> CdpDriver | None:
+    """Start Chrome under the CDP backend, or None (with a warning) if that is not possible."""
+    if websocket is None:
+        log.warning("driver_backend 'cdp' needs websocket-client (pip install websocket-client) — using Selenium")
+        return None
+    chrome = find_chrome(cfg)
+    if chrome is None:
+        log.warning("driver_backend 'cdp': Chrome binary not found (set chrome_binary) — using Selenium")
+        return None
+    try:
+        return CdpDriver(chrome, arguments, page_load_strategy, record_network)
+    except Exception as exc:
+        log.warning(f"driver_backend 'cdp' failed to start ({exc}) — using Selenium")
+        return None
@@ -0,0 +1,418 @@
+"""
+Chrome profile manager — per-worker clones of the logged-in "golden" profile.
+
+Chrome allows one process per user-data-dir, so with a single chrome_profile
+the hourly run, the monitor's force-posts and a refill cannot overlap: each
+one kills the others' Chrome when it clears the profile locks.  With
+cfg["profile_clones"] every DriverSession gets its own clone instead:
+
+  chrome_profile/                     golden profile — log in here (art_bot.py login …)
+  chrome_profile_clones/<worker>/     throw-away copy used by one worker
+
+Cloning is cheap: caches (HTTP, code, GPU/shader, service-worker
+CacheStorage), lock files and browsing history are not carried over at all
+— the walk does not even descend into them — and a worker rebuilds what it
+needs; files Chrome never rewrites in place (downloaded component models)
+are hardlinked; everything else — the SQLite databases, LevelDB stores,
+Preferences — is copied.
+
+When a worker releases its clone, cookies it refreshed (Instagram, Grok and
+ChatGPT sessions rotate them) are merged back into the golden profile, unless
+Chrome is running on the golden profile at that moment, then the clone is
+deleted.
+
+Lock cleanup before each launch (clear_profile_locks) also lives here.  It
+touches only the singleton files Chrome keeps at the profile root plus the
+lock paths recorded in the profile's .artbot_locks.json index — rebuilt by
+refresh_lock_index() from the monitor's daily run — instead of walking the
+whole (cache-heavy) tree, and finds Chrome processes owning the profile
+with one psutil process-table scan (PowerShell/WMI fallback on Windows).
+
+gc_profile() keeps the golden profile from growing without bound (the
+`profile-gc` command and the monitor's daily run): old service-worker
+caches go first, then whole cache directories (GPU/shader, code, HTTP)
+until the profile fits cfg["profile_budget_mb"], and the SQLite databases
+are VACUUMed.  Cookies, Local Storage and IndexedDB — the login state — are
+never touched, and nothing runs while Chrome has the profile open.
+"""
+
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:        # optional — falls back to PowerShell/WMI on Windows
+    psutil = None
+
+BOT_DIR    = Path(__file__).parent
+CLONES_DIR = BOT_DIR / "chrome_profile_clones"
+
+# Never copied: Chrome's own locks and per-process state
+LOCK_NAMES = {"SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile", "LOCK",
+              "DevToolsActivePort", "CrashpadMetrics-active.pma"}
+
+# Never copied: large and not needed by a worker (caches are rebuilt on demand)
+SKIP_NAMES = {"History", "History-journal", "Visited Links", "Top Sites", "Top Sites-journal",
+              "Crashpad", "BrowserMetrics", "ShaderCache", "GrShaderCache",
+              "GraphiteDawnCache", "DawnCache", "DawnGraphiteCache", "GPUCache",
+              "Cache", "Code Cache", "Media Cache", "Application Cache",
+              "CacheStorage", "ScriptCache", "component_crx_cache"}
+
+# Hardlinked: directories whose files Chrome writes once and never modifies
+LINK_DIRS = {"optimization_guide_model_store", "OnDeviceHeadSuggestModel", "Safe Browsing",
+             "WidevineCdm", "hyphen-data", "ZxcvbnData", "Subresource Filter"}
+
+# Lock files Chrome keeps at the root of a user-data-dir
+SINGLETON_FILES = ("SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile")
+LOCK_INDEX_NAME = ".artbot_locks.json"
+
+# Profile GC: cache directories in the order they are dropped (cheapest to rebuild first)
+CACHE_DIRS = [
+    "GrShaderCache", "ShaderCache", "GraphiteDawnCache",
+    "Default/GPUCache", "Default/DawnCache", "Default/DawnGraphiteCache",
+    "Default/Code Cache", "Default/Cache",
+]
+SW_CACHE_DIRS     = ["Default/Service Worker/CacheStorage", "Default/Service Worker/ScriptCache"]
+SW_MAX_AGE_DAYS   = 30
+DEFAULT_BUDGET_MB = 400
+SQLITE_MAGIC      = b"SQLite format 3\x00"
+
+# Chrome's cookie database, relative to the user-data-dir
+COOKIE_DBS = [Path("Default") / "Network" / "Cookies", Path("Default") / "Cookies"]
+
+log = logging.getLogger("art_bot")
+
+
+# ── Cloning ───────────────────────────────────────────────────────────────────
+
+def _linkable(rel: Path) -> bool:
+    """True for files Chrome never rewrites, so a hardlink is as good as a copy."""
+    return any(part in LINK_DIRS for part in rel.parts)
+
+
+def _copy_file(src: Path, dst: Path, rel: Path) -> str:
+    if _linkable(rel):
+        try:
+            os.link(src, dst)
+            return "linked"
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+    return "copied"
+
+
+def clone_profile(golden: Path, clone: Path) -> Path:
+    """Build a fresh clone of golden at clone (replacing any leftover). Returns clone."""
+    started = time.time()
+    if clone.exists():
+        shutil.rmtree(clone, ignore_errors=True)
+    clone.mkdir(parents=True, exist_ok=True)
+
+    counts = {"linked": 0, "copied": 0, "skipped": 0}
+    for root, dirs, files in os.walk(golden):
+        skipped  = [d for d in dirs if d in SKIP_NAMES]
+        dirs[:]  = [d for d in dirs if d not in SKIP_NAMES]   # never descend into caches
+        counts["skipped"] += len(skipped)
+        rel_root = Path(root).relative_to(golden)
+        (clone / rel_root).mkdir(parents=True, exist_ok=True)
+        for name in files:
+            if name in SKIP_NAMES or name in LOCK_NAMES:
+                counts["skipped"] += 1
+                continue
+            rel = rel_root / name
+            try:
+                counts[_copy_file(golden / rel, clone / rel, rel)] += 1
+            except OSError as exc:
+                counts["skipped"] += 1
+                log.debug(f"Profile clone: skipped {rel} ({exc})")
+
+    log.info(
+        f"Profile clone {clone.name}: {counts['linked']} linked, {counts['copied']} copied, "
+        f"{counts['skipped']} skipped in {time.time() - started:.1f}s"
+    )
+    return clone
+
+
+# ── Lock cleanup ──────────────────────────────────────────────────────────────
+
+def _same_path(arg: str, profile: Path) -> bool:
+    try:
+        return os.path.normcase(os.path.abspath(arg.strip('"'))) == os.path.normcase(str(profile.resolve()))
+    except (OSError, ValueError):
+        return False
+
+
+def profile_processes(profile: Path) -> list:
+    """psutil.Process objects of every Chrome/Chromium running with exactly this --user-data-dir."""
+    if psutil is None:
+        return []
+    owners = []
+    for proc in psutil.process_iter(["name", "cmdline"]):
+        try:
+            name = (proc.info["name"] or "").lower()
+            if "chrome" not in name and "chromium" not in name:
+                continue
+            for arg in proc.info["cmdline"] or []:
+                if arg.startswith("--user-data-dir=") and _same_path(arg.split("=", 1)[1], profile):
+                    owners.append(proc)
+                    break
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return owners
+
+
+def _kill_with_powershell(profile: Path) -> None:
+    """Fallback when psutil is missing: one WMI query for this exact profile."""
+    if sys.platform != "win32":
+        return
+    profile_token = str(profile.resolve()).replace("'", "''")
+    ps = (
+        f"$p = [regex]::Escape('{profile_token}');"
+        f" Get-WmiObject Win32_Process -Filter \"name='chrome.exe'\" -EA SilentlyContinue |"
+        f" Where-Object {{ $_.CommandLine -match ('--user-data-dir=\"?' + $p + '(\"|\\s|$)') }} |"
+        f" ForEach-Object {{ Stop-Process -Id $_.ProcessId -Force -EA SilentlyContinue }}"
+    )
+    try:
+        subprocess.run(["powershell", "-Command", ps], capture_output=True, timeout=10)
+        time.sleep(1)
+    except Exception:
+        pass
+
+
+def _indexed_locks(profile: Path) -> list[str]:
+    try:
+        return json.loads((profile / LOCK_INDEX_NAME).read_text(encoding="utf-8"))
+    except Exception:
+        return []
+
+
+def refresh_lock_index(profile: Path) -> list[str]:
+    """Walk the whole profile once and record where its LOCK files live.
+
+    Slow on a big profile — meant for the daily monitor, not every launch.
+    """
+    found = sorted(
+        str(p.relative_to(profile)) for p in profile.rglob("LOCK")
+    ) if profile.exists() else []
+    try:
+        (profile / LOCK_INDEX_NAME).write_text(json.dumps(found, indent=1), encoding="utf-8")
+    except OSError as exc:
+        log.debug(f"Could not write lock index: {exc}")
+    return found
+
+
+def clear_profile_locks(profile: Path, kill: bool = True) -> dict:
+    """Kill Chrome processes that own profile, then delete its stale lock files.
+
+    Returns {"killed": [pids], "removed": [relative paths], "seconds": float}.
+    """
+    started = time.time()
+    killed  = []
+    if kill:
+        if psutil is not None:
+            owners = profile_processes(profile)
+            for proc in owners:
+                try:
+                    proc.kill()
+                    killed.append(proc.pid)
+                except psutil.Error:
+                    pass
+            if owners:
+                psutil.wait_procs(owners, timeout=3)
+        else:
+            _kill_with_powershell(profile)
+
+    removed = []
+    for rel in list(SINGLETON_FILES) + _indexed_locks(profile):
+        path = profile / rel
+        try:
+            if path.is_symlink() or path.exists():   # SingletonLock is a dangling symlink on Linux
+                path.unlink()
+                removed.append(rel)
+        except OSError:
+            pass
+
+    result = {"killed": killed, "removed": removed, "seconds": round(time.time() - started, 3)}
+    if killed or removed:
+        log.info(
+            f"Profile locks: killed {len(killed)} Chrome process(es), removed "
+            f"{len(removed)} lock file(s) in {result['seconds'] * 1000:.0f} ms"
+        )
+    return result
+
+
+# ── Profile GC ────────────────────────────────────────────────────────────────
+
+def dir_size(path: Path) -> int:
+    """Bytes under path (0 if missing)."""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+
+def _prune_service_workers(profile: Path) -> list[str]:
+    """Delete service-worker caches of origins not used for SW_MAX_AGE_DAYS."""
+    cutoff  = time.time() - SW_MAX_AGE_DAYS * 86400
+    removed = []
+    for rel in SW_CACHE_DIRS:
+        root = profile / rel
+        if not root.is_dir():
+            continue
+        for entry in root.iterdir():
+            try:
+                if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry, ignore_errors=True)
+                    removed.append(str(entry.relative_to(profile)))
+            except OSError:
+                pass
+    return removed
+
+
+def _vacuum_databases(profile: Path) -> int:
+    """VACUUM every SQLite database under Default/ (top two levels) except the cookie store.
+
+    Returns the count.
+    """
+    vacuumed = 0
+    default  = profile / "Default"
+    cookies  = {profile / rel for rel in COOKIE_DBS}
+    for path in list(default.glob("*")) + list(default.glob("*/*")):
+        if not path.is_file() or path.name.endswith(("-journal", "-wal", "-shm")) or path in cookies:
+            continue
+        try:
+            with open(path, "rb") as f:
+                if f.read(16) != SQLITE_MAGIC:
+                    continue
+            conn = sqlite3.connect(path, timeout=5)
+            try:
+                conn.execute("VACUUM")
+            finally:
+                conn.close()
+            vacuumed += 1
+        except (OSError, sqlite3.Error) as exc:
+            log.debug(f"Profile GC: could not vacuum {path.name}: {exc}")
+    return vacuumed
+
+
+def gc_profile(profile: Path, budget_mb: float = DEFAULT_BUDGET_MB) -> dict:
+    """Prune caches down to budget_mb and VACUUM the databases of an idle profile.
+
+    Returns {"size_before_mb", "size_after_mb", "budget_mb", "pruned", "vacuumed",
+    "skipped"}; skipped is a reason string when the profile was in use.
+    """
+    before = dir_size(profile)
+    result = {"size_before_mb": round(before / 2**20, 1), "size_after_mb": round(before / 2**20, 1),
+              "budget_mb": budget_mb, "pruned": [], "vacuumed": 0, "skipped": None}
+    if profile_processes(profile) or profile_in_use(profile):
+        result["skipped"] = "profile in use"
+        log.info(f"Profile GC: {profile.name} is in use — skipped")
+        return result
+
+    budget = budget_mb * 2**20
+    result["pruned"] = _prune_service_workers(profile)
+    size = dir_size(profile)
+    for rel in CACHE_DIRS:
+        if size <= budget:
+            break
+        path = profile / rel
+        if path.is_dir():
+            freed = dir_size(path)
+            shutil.rmtree(path, ignore_errors=True)
+            size -= freed
+            result["pruned"].append(rel)
+    result["vacuumed"] = _vacuum_databases(profile)
+
+    result["size_after_mb"] = round(dir_size(profile) / 2**20, 1)
+    log.info(
+        f"Profile GC: {result['size_before_mb']} MB → {result['size_after_mb']} MB "
+        f"(budget {budget_mb} MB, pruned {len(result['pruned'])}, vacuumed {result['vacuumed']})"
+    )
+    return result
+
+
+# ── Cookie sync-back ──────────────────────────────────────────────────────────
+
+def profile_in_use(profile: Path) -> bool:
+    """True if a Chrome process currently owns profile."""
+    if (profile / "SingletonLock").is_symlink() or (profile / "SingletonLock").exists():
+        return True
+    lockfile = profile / "lockfile"   # Windows: held open while Chrome runs
+    if lockfile.exists():
+        try:
+            lockfile.unlink()         # stale file left by a crash
+        except OSError:
+            return True
+    return False
+
+
+def _cookie_db(profile: Path) -> Path | None:
+    for rel in COOKIE_DBS:
+        if (profile / rel).exists():
+            return profile / rel
+    return None
+
+
+def sync_cookies(clone: Path, golden: Path) -> int:
+    """Merge cookies the clone updated into golden's cookie database. Returns rows written.
+
+    A clone row wins only if golden has no newer copy of the same cookie, so
+    two workers released one after the other cannot roll each other back.
+    """
+    src, dst = _cookie_db(clone), _cookie_db(golden)
+    if src is None or dst is None:
+        return 0
+    conn = sqlite3.connect(dst, timeout=10)
+    try:
+        conn.execute("ATTACH DATABASE ? AS clone", (str(src),))
+        columns = [row[1] for row in conn.execute("PRAGMA main.table_info(cookies)")]
+        stamp   = "last_update_utc" if "last_update_utc" in columns else "last_access_utc"
+        cur = conn.execute(f"""
+            INSERT OR REPLACE INTO main.cookies
+            SELECT * FROM clone.cookies AS c
+            WHERE NOT EXISTS (
+                SELECT 1 FROM main.cookies AS g
+                WHERE g.host_key = c.host_key AND g.name = c.name AND g.path = c.path
+                  AND g.{stamp} >= c.{stamp}
+            )
+        """)
+        conn.commit()
+        return cur.rowcount
+    finally:
+        conn.close()
+
+
+# ── Worker API ────────────────────────────────────────────────────────────────
+
+def acquire(golden: Path, worker: str) -> Path:
+    """Return a fresh profile directory for worker, cloned from golden."""
+    return clone_profile(golden, CLONES_DIR / worker)
+
+
+def release(golden: Path, clone: Path) -> None:
+    """Sync the clone's cookies back to golden (when it is free) and delete the clone."""
+    if profile_in_use(golden):
+        log.info(f"Profile clone {clone.name}: golden profile in use — cookies not synced back")
+    else:
+        try:
+            rows = sync_cookies(clone, golden)
+            log.info(f"Profile clone {clone.name}: synced {rows} cookie(s) back to the golden profile")
+        except Exception as exc:
+            log.warning(f"Profile clone {clone.name}: cookie sync failed: {exc}")
+    shutil.rmtree(clone, ignore_errors=True)
@@ -0,0 +1,196 @@
+"""
+DOM actions — one execute_script per engagement action.
+
+Each routine below finds what it needs, acts on it and collects its
+diagnostics inside a single injected script, and returns a plain dict, so
+the engagement flow pays one WebDriver round trip per action instead of a
+find_elements / get_attribute call per candidate element.
+
+  post_links(driver, limit)         — unique /p/ permalinks on the page
+  like(driver)                      — click the Like button in the post's action bar
+  follow(driver)                    — click the author's Follow button
+  locate_comment_box(driver)        — find (revealing if needed) the comment box
+  submit_comment(driver)            — click the comment Post button
+  follow_buttons(driver, n)         — follow-back buttons in a followers list
+
+Elements come back as ordinary WebElements, so callers can still type into
+them with Selenium or the CDP backend.
+"""
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+# ── Shared in-page helpers ────────────────────────────────────────────────────
+
+_HELPERS_JS = """
+function artbotText(el) { return (el.textContent || el.innerText || '').trim().toLowerCase(); }
+function artbotVisible(el) { return el.getClientRects().length > 0; }
+function artbotClickable(node) { return node.closest('button, [role="button"], a') || node.parentElement || node; }
+"""
+
+# Comment box candidates, in preference order; the loose ones (no "comment"
+# in the label) are only trusted after the Comment icon has been clicked.
+COMMENT_BOX_SELECTORS = [
+    "div[contenteditable='true'][aria-label*='comment' i]",
+    "div[contenteditable='true'][aria-placeholder*='comment' i]",
+    "textarea[placeholder*='Add a comment' i]",
+    "form textarea",
+]
+COMMENT_BOX_LOOSE = ["div[contenteditable='true']", "textarea"]
+REVEAL_TIMEOUT_MS = 4000
+
+
+# ── Routines ──────────────────────────────────────────────────────────────────
+
+_POST_LINKS_JS = """
+var limit = arguments[0], seen = {}, out = [];
+var anchors = document.querySelectorAll("a[href*='/p/']");
+for (var i = 0; i < anchors.length && out.length < limit; i++) {
+    var href = anchors[i].href.split('?')[0];
+    if (href.indexOf('/p/') !== -1 && !seen[href]) { seen[href] = true; out.push(href); }
+}
+return {links: out, anchors: anchors.length};
+"""
+
+# The post's own action bar is the nearest ancestor of its Comment icon that
+# also holds a Like/Unlike icon — comment rows carry Like hearts of their own.
+_LIKE_JS = _HELPERS_JS + """
+var heart = 'svg[aria-label="Like"], svg[aria-label="Unlike"]';
+var post = document.querySelector('main article') || document.querySelector('article') ||
+           document.querySelector('main') || document;
+var bar = null, comment = post.querySelector('svg[aria-label="Comment"]');
+for (var n = comment && comment.parentElement; n && n !== post.parentElement; n = n.parentElement)
+    if (n.querySelector(heart)) { bar = n; break; }
+var icon = (bar || post).querySelector(heart);
+if (!icon) return {clicked: false, already: false, via: null};
+if (icon.getAttribute('aria-label') === 'Unlike') return {clicked: false, already: true, via: null};
+var btn = icon.closest('button');
+(btn || artbotClickable(icon)).click();
+return {clicked: true, already: false, via: (btn ? 'button' : 'svg') + (bar ? '' : ' (no action bar)')};
+"""
+
+_FOLLOW_JS = _HELPERS_JS + """
+var btns = document.querySelectorAll('button'), labels = {};
+for (var i = 0; i < btns.length; i++) {
+    var t = artbotText(btns[i]);
+    if (t === 'follow') { btns[i].click(); return {clicked: true, state: 'follow'}; }
+    if (t === 'following' || t === 'requested') labels[t] = true;
+}
+return {clicked: false, state: Object.keys(labels)[0] || null};
+"""
+
+_COMMENT_BOX_JS = _HELPERS_JS + """
+var strict = arguments[0], loose = arguments[1], revealMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var diag = {contenteditable: [], textareas: 0, revealed: false};
+
+function describe() {
+    var ce = document.querySelectorAll("div[contenteditable='true']");
+    diag.contenteditable = Array.prototype.map.call(ce, function (el) {
+        return {aria_label: el.getAttribute('aria-label'),
+                placeholder: el.getAttribute('placeholder'),
+                aria_placeholder: el.getAttribute('aria-placeholder')};
+    });
+    diag.textareas = document.querySelectorAll('textarea').length;
+}
+function find(selectors) {
+    for (var i = 0; i < selectors.length; i++) {
+        var el = document.querySelector(selectors[i]);
+        if (el) return [el, selectors[i]];
+    }
+    return null;
+}
+function finish(hit) {
+    describe();
+    if (hit) hit[0].scrollIntoView({block: 'center'});
+    done({box: hit ? hit[0] : null, via: hit ? hit[1] : null, diagnostics: diag});
+}
+
+var hit = find(strict);
+if (hit) return finish(hit);
+
+var icon = document.querySelector('svg[aria-label="Comment"]') || document.querySelector('[aria-label="Comment"]');
+if (!icon) return finish(null);
+artbotClickable(icon).click();
+diag.revealed = true;
+
+var all = strict.concat(loose), deadline = Date.now() + revealMs;
+(function poll() {
+    var hit = find(all);
+    if (hit || Date.now() > deadline) return finish(hit);
+    setTimeout(poll, 100);
+})();
+"""
+
+_SUBMIT_COMMENT_JS = _HELPERS_JS + """
+var box = arguments[0];
+var btns = document.querySelectorAll('button, div[role="button"]');
+for (var i = 0; i < btns.length; i++) {
+    if (artbotText(btns[i]) === 'post' && !btns[i].disabled && btns[i].getAttribute('aria-disabled') !== 'true') {
+        btns[i].click();
+        return {via: 'post-btn', box: null};
+    }
+}
+var fresh = null;
+if (!box || !box.isConnected) {
+    var sels = arguments[1];
+    for (var j = 0; j < sels.length && !fresh; j++) fresh = document.querySelector(sels[j]);
+}
+return {via: null, box: (box && box.isConnected) ? box : fresh};
+"""
+
+_FOLLOW_BUTTONS_JS = _HELPERS_JS + """
+var limit = arguments[0], scope = document.querySelector("[role='dialog']") || document;
+var btns = scope.querySelectorAll('button'), out = [];
+for (var i = 0; i < btns.length && out.length < limit; i++)
+    if (artbotText(btns[i]) === 'follow' && artbotVisible(btns[i])) out.push(btns[i]);
+return out;
+"""
+
+
+# ── Python wrappers ───────────────────────────────────────────────────────────
+
+def post_links(driver, limit: int = 30) -> dict:
+    """{"links": [permalink, …] (deduped, query stripped, page order), "anchors": n}."""
+    return driver.execute_script(_POST_LINKS_JS, limit) or {"links": [], "anchors": 0}
+
+
+def like(driver) -> dict:
+    """{"clicked": bool, "already": bool (post was already liked), "via": str|None}."""
+    return driver.execute_script(_LIKE_JS) or {"clicked": False, "already": False, "via": None}
+
+
+def follow(driver) -> dict:
+    """{"clicked": bool, "state": "follow"|"following"|"requested"|None}."""
+    return driver.execute_script(_FOLLOW_JS) or {"clicked": False, "state": None}
+
+
+def locate_comment_box(driver, reveal_ms: int = REVEAL_TIMEOUT_MS) -> dict:
+    """Find the comment input, clicking the Comment icon and waiting for it if needed.
+
+    Returns {"box": WebElement|None (scrolled to centre), "via": selector|None,
+    "diagnostics": {"contenteditable": [{aria_label, placeholder,
+    aria_placeholder}, …], "textareas": n, "revealed": bool}}.
+    """
+    return driver.execute_async_script(
+        _COMMENT_BOX_JS, COMMENT_BOX_SELECTORS, COMMENT_BOX_LOOSE, reveal_ms
+    )
+
+
+def submit_comment(driver, box=None) -> dict:
+    """Click the enabled comment Post button.
+
+    Returns {"via": "post-btn", "box": None} on success, otherwise
+    {"via": None, "box": element} with the (re-found if stale) comment box so
+    the caller can fall back to pressing Enter in it.
+    """
+    selectors = COMMENT_BOX_SELECTORS + COMMENT_BOX_LOOSE
+    try:
+        result = driver.execute_script(_SUBMIT_COMMENT_JS, box, selectors)
+    except StaleElementReferenceException:
+        result = driver.execute_script(_SUBMIT_COMMENT_JS, None, selectors)
+    return result or {"via": None, "box": None}
+
+
+def follow_buttons(driver, limit: int = 6) -> list:
+    """Visible "Follow" buttons (followers dialog first, else the page), up to limit."""
+    return driver.execute_script(_FOLLOW_BUTTONS_JS, limit) or []
@@ -29,6 +29,10 @@ from pathlib import Path
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+import dom_actions
 
 # ── Paths ──────────────────────────────────────────────────────────────────────
 
@@ -36,6 +40,10 @@ BOT_DIR       = Path(__file__).parent
 COUNTS_FILE   = BOT_DIR / "engagement_counts.json"
 INSTAGRAM_URL = "https://www.instagram.com/"
 
+# Rendered after DOMContentLoaded — waited for explicitly (see _open)
+POST_LINK_CSS    = "a[href*='/p/']"
+POST_ACTIONS_CSS = "svg[aria-label='Like'], svg[aria-label='Unlike']"
+
 # ── Daily limits ──────────────────────────────────────────────────────────────
 
 DAILY_LIKE_LIMIT    = 80
@@ -159,6 +167,27 @@ def _pause(min_s: float = 2.0, max_s: float = 5.0) -> None:
     time.sleep(random.uniform(min_s, max_s))
 
 
+def _open(driver, url: str, wait_css: str | None = None, timeout: float = 10) -> bool:
+    """Load url under the engagement flow's page-load rules, then wait for wait_css.
+
+    Pages are loaded eagerly, so content Instagram renders after
+    DOMContentLoaded (post grids, like buttons) is waited for explicitly.
+    """
+    from art_bot import load_page
+
+    if not load_page(driver, url):
+        return False
+    if wait_css:
+        try:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, wait_css))
+            )
+        except Exception:
+            log.debug(f"[engagement] {url} loaded without '{wait_css}'")
+            return False
+    return True
+
+
 def _pick_comment(hashtag: str) -> str:
     """Pick a comment text appropriate for the given hashtag."""
     category = _HASHTAG_CATEGORY.get(hashtag.lower(), "default")
@@ -210,23 +239,13 @@ def _is_logged_in(driver) -> bool:
 def _like_current_post(driver) -> bool:
     """Like the currently open post. Returns True on success."""
     try:
-        # JS scan: find a button/element with aria-label exactly "Like" (not "Unlike")
-        clicked = driver.execute_script("""
-            // Check <button aria-label="Like">
-            var byBtn = document.querySelector('button[aria-label="Like"]');
-            if (byBtn) { byBtn.click(); return true; }
-            // Check parent of <svg aria-label="Like">
-            var svgs = document.querySelectorAll('svg[aria-label="Like"]');
-            for (var i = 0; i < svgs.length; i++) {
-                var btn = svgs[i].closest('button') || svgs[i].parentElement;
-                if (btn) { btn.click(); return true; }
-            }
-            return false;
-        """)
-        if clicked:
+        result = dom_actions.like(driver)
+        if result["clicked"]:
             log.info("[engagement] Liked post")
             _pause(1.5, 3.0)
             return True
+        if result["already"]:
+            log.debug("[engagement] Post already liked")
     except Exception as exc:
         log.debug(f"[engagement] Like failed: {exc}")
     return False
@@ -235,6 +254,7 @@ def _like_current_post(driver) -> bool:
 def _comment_current_post(driver, comment_text: str) -> bool:
     """Leave a comment on the currently open post. Returns True on success."""
     from selenium.webdriver.common.action_chains import ActionChains
+    from art_bot import insert_text
 
     log.info("[engagement] Attempting to comment on post…")
     try:
@@ -242,65 +262,26 @@ def _comment_current_post(driver, comment_text: str) -> bool:
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight * 0.6);")
         _pause(1.5, 2.5)
 
-        comment_box = None
-
-        # Diagnostic: log all contenteditable divs present on page
-        all_ce = driver.find_elements(By.CSS_SELECTOR, "div[contenteditable='true']")
-        all_ta = driver.find_elements(By.CSS_SELECTOR, "textarea")
-        log.info(f"[engagement] Found {len(all_ce)} contenteditable divs, {len(all_ta)} textareas")
-        for el in all_ce:
+        # One call: find the box (clicking the Comment icon to reveal it if
+        # needed), scroll it into view and describe every editor on the page.
+        found = dom_actions.locate_comment_box(driver)
+        diag  = found["diagnostics"]
+        log.info(f"[engagement] Found {len(diag['contenteditable'])} contenteditable divs, "
+                 f"{diag['textareas']} textareas")
+        for ce in diag["contenteditable"]:
             log.info(
-                f"  contenteditable: aria-label={el.get_attribute('aria-label')!r} "
-                f"placeholder={el.get_attribute('placeholder')!r} "
-                f"aria-placeholder={el.get_attribute('aria-placeholder')!r}"
+                f"  contenteditable: aria-label={ce['aria_label']!r} "
+                f"placeholder={ce['placeholder']!r} "
+                f"aria-placeholder={ce['aria_placeholder']!r}"
             )
 
-        # Try direct selectors first
-        for sel in [
-            "div[contenteditable='true'][aria-label*='comment' i]",
-            "div[contenteditable='true'][aria-placeholder*='comment' i]",
-            "textarea[placeholder*='Add a comment' i]",
-            "form textarea",
-        ]:
-            els = driver.find_elements(By.CSS_SELECTOR, sel)
-            if els:
-                comment_box = els[0]
-                log.info(f"[engagement] Comment box found via: {sel}")
-                break
-
-        # Click the Comment bubble icon to focus the input if not found yet
-        if not comment_box:
-            log.info("[engagement] Comment box not found — clicking Comment icon to reveal it")
-            driver.execute_script("""
-                var candidates = [
-                    document.querySelector('svg[aria-label="Comment"]'),
-                    document.querySelector('[aria-label="Comment"]'),
-                ];
-                for (var c of candidates) {
-                    if (c) { (c.closest('button') || c.parentElement || c).click(); break; }
-                }
-            """)
-            _pause(2.0, 3.0)
-            for sel in [
-                "div[contenteditable='true'][aria-label*='comment' i]",
-                "div[contenteditable='true'][aria-placeholder*='comment' i]",
-                "textarea[placeholder*='Add a comment' i]",
-                "div[contenteditable='true']",
-                "form textarea",
-                "textarea",
-            ]:
-                els = driver.find_elements(By.CSS_SELECTOR, sel)
-                if els:
-                    comment_box = els[0]
-                    log.info(f"[engagement] Comment box found (after icon click) via: {sel}")
-                    break
-
+        comment_box = found["box"]
         if not comment_box:
             log.warning("[engagement] Comment box not found — skipping comment")
             return False
+        revealed = " (after icon click)" if diag["revealed"] else ""
+        log.info(f"[engagement] Comment box found{revealed} via: {found['via']}")
 
-        # Scroll into view, click to focus
-        driver.execute_script("arguments[0].scrollIntoView({block:'center'});", comment_box)
         _pause(0.5, 1.0)
         try:
             ActionChains(driver).move_to_element(comment_box).click().perform()
@@ -308,56 +289,24 @@ def _comment_current_post(driver, comment_text: str) -> bool:
             comment_box.click()
         _pause(0.8, 1.2)
 
-        # Type character-by-character using ActionChains (most reliable for React UI).
-        # This fires real keydown/keypress/keyup events that update React state.
-        actions = ActionChains(driver)
-        for char in comment_text:
-            actions.send_keys(char)
-        try:
-            actions.perform()
-        except Exception:
-            # Fallback: plain send_keys on the element
-            try:
-                comment_box.send_keys(comment_text)
-            except Exception:
-                pass
+        # Input.insertText chunks fire the beforeinput/input events React's
+        # comment editor listens for — a few round trips instead of one key
+        # event per character.
+        if not insert_text(driver, comment_box, comment_text):
+            log.info("[engagement] Comment text not confirmed in the box — submitting anyway")
 
         _pause(1.0, 2.0)
 
-        # After typing, React may have re-rendered — re-find the comment box
-        # before any further interaction (avoids StaleElementReferenceException).
-        fresh_box = None
-        for sel in [
-            "div[contenteditable='true'][aria-label*='comment' i]",
-            "div[contenteditable='true'][aria-placeholder*='comment' i]",
-            "textarea[placeholder*='Add a comment' i]",
-            "div[contenteditable='true']",
-            "form textarea",
-            "textarea",
-        ]:
-            els = driver.find_elements(By.CSS_SELECTOR, sel)
-            if els:
-                fresh_box = els[0]
-                break
-
-        # Click the "Post" submit button (appears after text is entered in React UI)
-        posted = driver.execute_script("""
-            var btns = document.querySelectorAll('button, div[role="button"]');
-            for (var b of btns) {
-                var t = (b.textContent || b.innerText || '').trim().toLowerCase();
-                if (t === 'post') { b.click(); return 'post-btn'; }
-            }
-            return null;
-        """)
-
-        if posted:
-            log.info(f"[engagement] Submitted via: {posted}")
+        # Click the "Post" submit button (appears after text is entered in React UI).
+        # If there is none, the same call hands back a live comment box — React
+        # may have re-rendered it while typing — to press Enter in.
+        submitted = dom_actions.submit_comment(driver, comment_box)
+        if submitted["via"]:
+            log.info(f"[engagement] Submitted via: {submitted['via']}")
         else:
-            # Fall back to Enter on whichever box reference is still valid
             log.info("[engagement] No Post button found — using Enter key")
-            target = fresh_box or comment_box
             try:
-                target.send_keys(Keys.RETURN)
+                (submitted["box"] or comment_box).send_keys(Keys.RETURN)
             except Exception:
                 pass
 
@@ -373,20 +322,14 @@ def _comment_current_post(driver, comment_text: str) -> bool:
 def _follow_current_author(driver) -> bool:
     """Follow the author of the currently open post. Returns True on success."""
     try:
-        clicked = driver.execute_script("""
-            var btns = document.querySelectorAll('button');
-            for (var i = 0; i < btns.length; i++) {
-                var t = (btns[i].textContent || '').trim().toLowerCase();
-                if (t === 'follow') { btns[i].click(); return true; }
-            }
-            return false;
-        """)
-        if clicked:
+        result = dom_actions.follow(driver)
+        if result["clicked"]:
             log.info("[engagement] Followed post author")
             _pause(2.0, 4.0)
             return True
         else:
-            log.info("[engagement] No 'Follow' button found (already following or not shown)")
+            state = f" ({result['state']})" if result["state"] else ""
+            log.info(f"[engagement] No 'Follow' button found{state} (already following or not shown)")
     except Exception as exc:
         log.warning(f"[engagement] Follow failed: {exc}")
     return False
@@ -397,18 +340,9 @@ def _follow_current_author(driver) -> bool:
 def _get_post_links_from_hashtag(driver, hashtag: str, max_posts: int = 12) -> list[str]:
     """Navigate to a hashtag explore page and return post URLs (skipping the top 2)."""
     try:
-        driver.get(f"https://www.instagram.com/explore/tags/{hashtag}/")
+        _open(driver, f"https://www.instagram.com/explore/tags/{hashtag}/", POST_LINK_CSS)
         _pause(4.0, 6.0)
-        links = driver.find_elements(By.CSS_SELECTOR, "a[href*='/p/']")
-        hrefs: list[str] = []
-        for link in links:
-            href = link.get_attribute("href")
-            if href and "/p/" in href:
-                clean = href.split("?")[0]
-                if clean not in hrefs:
-                    hrefs.append(clean)
-            if len(hrefs) >= max_posts + 3:
-                break
+        hrefs = dom_actions.post_links(driver, limit=max_posts + 3)["links"]
         # Skip first 2 — too prominent, too much competition
         return hrefs[2: max_posts + 2]
     except Exception as exc:
@@ -420,24 +354,17 @@ def _like_feed_posts(driver, n: int, counts: dict) -> int:
     """Like up to N posts from our home feed. Returns actual count liked."""
     liked = 0
     try:
-        driver.get(INSTAGRAM_URL)
+        _open(driver, INSTAGRAM_URL, POST_LINK_CSS)
         _pause(3.0, 5.0)
 
         # Collect unique post URLs from the feed
-        links = driver.find_elements(By.CSS_SELECTOR, "a[href*='/p/']")
-        urls: list[str] = []
-        for link in links[:30]:
-            href = link.get_attribute("href")
-            if href and "/p/" in href:
-                clean = href.split("?")[0]
-                if clean not in urls:
-                    urls.append(clean)
+        urls = dom_actions.post_links(driver, limit=30)["links"]
 
         targets = random.sample(urls, min(n, len(urls)))
         for url in targets:
             if counts["likes"] >= DAILY_LIKE_LIMIT:
                 break
-            driver.get(url)
+            _open(driver, url, POST_ACTIONS_CSS)
             _pause(2.5, 4.5)
             if _like_current_post(driver):
                 counts["likes"] += 1
@@ -472,7 +399,7 @@ def _engage_hashtag(
         if counts["likes"] >= DAILY_LIKE_LIMIT:
             break
 
-        driver.get(url)
+        _open(driver, url, POST_ACTIONS_CSS)
         _pause(3.0, 5.5)
 
         # Like
@@ -504,7 +431,7 @@ def _follow_back_new_followers(driver, username: str, n: int, counts: dict) -> i
     """
     followed_back = 0
     try:
-        driver.get(f"https://www.instagram.com/{username}/followers/")
+        _open(driver, f"https://www.instagram.com/{username}/followers/", "[role='dialog'] button")
         _pause(4.0, 6.0)
 
         # Scroll slightly to load more entries
@@ -512,16 +439,7 @@ def _follow_back_new_followers(driver, username: str, n: int, counts: dict) -> i
         _pause(1.5, 2.5)
 
         # Find all "Follow" buttons in the follower list (not "Following")
-        follow_btns = driver.execute_script("""
-            var btns = document.querySelectorAll('button');
-            var result = [];
-            for (var i = 0; i < btns.length; i++) {
-                var t = (btns[i].textContent || '').trim().toLowerCase();
-                if (t === 'follow') result.push(btns[i]);
-                if (result.length >= 6) break;
-            }
-            return result;
-        """)
+        follow_btns = dom_actions.follow_buttons(driver, limit=6)
 
         if not follow_btns:
             log.debug("[engagement] No un-followed followers found")
@@ -548,7 +466,7 @@ def _follow_back_new_followers(driver, username: str, n: int, counts: dict) -> i
 
 # ── Main session orchestrator ─────────────────────────────────────────────────
 
-def run_post_engagement(cfg: dict, caption: str) -> None:
+def run_post_engagement(cfg: dict, caption: str, session=None) -> None:
     """
     Run a focused engagement burst (5–10 actions) after a successful post.
 
@@ -559,6 +477,9 @@ def run_post_engagement(cfg: dict, caption: str) -> None:
                   Second hashtag: like + comment + maybe follow
                   Third hashtag: like only (keep session light)
       Block 3 — Follow back 1–2 accounts that followed us (if username set)
+
+    When called with the run's DriverSession the same Chrome is reused and left
+    open for the caller to close.
     """
     from art_bot import make_driver
 
@@ -580,9 +501,9 @@ def run_post_engagement(cfg: dict, caption: str) -> None:
 
     username = cfg.get("instagram_username", "").strip()
 
-    driver = make_driver(cfg)
+    driver = session.get("engagement") if session is not None else make_driver(cfg, flow="engagement")
     try:
-        driver.get(INSTAGRAM_URL)
+        _open(driver, INSTAGRAM_URL, "nav, svg[aria-label='Home']")
         _pause(3.0, 5.0)
 
         if not _is_logged_in(driver):
@@ -642,10 +563,11 @@ def run_post_engagement(cfg: dict, caption: str) -> None:
         log.error(f"[engagement] Session error: {exc}", exc_info=True)
     finally:
         _save_daily_counts(counts)
-        try:
-            driver.quit()
-        except Exception:
-            pass
+        if session is None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
 
 
 # ── CLI entry point ───────────────────────────────────────────────────────────
@@ -7,8 +7,11 @@ and the posted-image tracker.
 
 import json
 import logging
+import os
 import random
+import sys
 import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -20,8 +23,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 # Shared helpers — art_bot never imports us at module level, so no circular import.
 from art_bot import (
     BOT_DIR, SAVE_DIR, LOG_DIR,
-    make_driver, slow_type, find_first, _shorten_descriptor, _screenshot,
+    insert_text, make_driver, load_page, slow_type, find_first, _shorten_descriptor, _screenshot,
 )
+import source_health
 
 INSTAGRAM_URL = "https://www.instagram.com/"
 TRACKER_FILE  = BOT_DIR / "posted_tracker.json"
@@ -31,6 +35,7 @@ log = logging.getLogger("instagram_bot")
 # ── Hashtag system ────────────────────────────────────────────────────────────
 
 MAX_HASHTAGS = 28
+CAPTION_MAX_CHARS = 2200   # Instagram's caption length limit
 
 MEGA_TAGS = [
     "#art", "#artist", "#artwork", "#painting", "#illustration",
@@ -247,7 +252,129 @@ def build_caption(image_path: Path) -> str:
     return f"{date_str} at {time_str}\n\n{prompt}\n\n{hashtags}"
 
 
-# ── Clipboard helper ──────────────────────────────────────────────────────────
+def build_carousel_caption(images: list[Path]) -> str:
+    """One caption for a carousel: each image's build_caption text, merged.
+
+    Starts with the generation date (a range if the images span days), lists
+    every image's description numbered in slide order, and interleaves the
+    images' hashtags so each one contributes, capped at MAX_HASHTAGS.  Kept
+    within CAPTION_MAX_CHARS by cutting slides to their first line, then
+    dropping trailing slides, then trailing hashtags.
+    """
+    dates, bodies, tag_lists = [], [], []
+    for image_path in images:
+        parts = build_caption(image_path).split("\n\n")
+        day   = parts[0].split(" at ")[0]
+        if day not in dates:
+            dates.append(day)
+        bodies.append("\n".join(parts[1:-1]).strip())
+        tag_lists.append(parts[-1].split())
+
+    tags: list[str] = []
+    for rank in range(max(len(t) for t in tag_lists)):
+        for tag_list in tag_lists:
+            if rank < len(tag_list) and tag_list[rank] not in tags:
+                tags.append(tag_list[rank])
+    tags = tags[:MAX_HASHTAGS]
+
+    header = dates[0] if len(dates) == 1 else f"{dates[0]} – {dates[-1]}"
+    slides = [f"{n}/{len(images)} {body}" for n, body in enumerate(bodies, 1) if body]
+
+    def assemble() -> str:
+        return "\n\n".join(part for part in (header, "\n".join(slides), " ".join(tags)) if part)
+
+    if len(assemble()) > CAPTION_MAX_CHARS:
+        slides = [slide.split("\n")[0] for slide in slides]
+    while len(assemble()) > CAPTION_MAX_CHARS and slides:
+        slides.pop()
+    while len(assemble()) > CAPTION_MAX_CHARS and tags:
+        tags.pop()
+    return assemble()
+
+
+# ── Caption insertion ─────────────────────────────────────────────────────────
+#
+# The caption goes into Instagram's Lexical editor as a synthetic paste: a
+# ClipboardEvent carrying a DataTransfer with the text, dispatched on the
+# focused editor from inside the page.  Lexical takes pasted plain text
+# (newlines, hashtags, emoji) the same way as a real Ctrl+V, nothing touches
+# the system clipboard — so parallel workers cannot clobber each other — and
+# the same async script waits for the editor to re-render and reports the
+# text it ended up with.  If the editor ignores the event, the caption is
+# typed with Input.insertText instead, and only then (on Windows) pasted via
+# the PowerShell clipboard.
+
+PASTE_VERIFY_MS = 2000
+
+_CAPTION_TEXT_JS = """
+function artbotEditorText(el) {
+    var t = el.tagName === 'TEXTAREA' ? el.value : (el.innerText || el.textContent || '');
+    return t.replace(/\\s+/g, ' ').trim();
+}
+function artbotSameText(el, text) {
+    return artbotEditorText(el).indexOf(text.replace(/\\s+/g, ' ').trim()) !== -1;
+}
+"""
+
+_PASTE_CAPTION_JS = _CAPTION_TEXT_JS + """
+var el = arguments[0], text = arguments[1], waitMs = arguments[2];
+var done = arguments[arguments.length - 1];
+el.focus();
+var sel = window.getSelection(), range = document.createRange();
+if (el.tagName === 'TEXTAREA') el.select();
+else { range.selectNodeContents(el); sel.removeAllRanges(); sel.addRange(range); }
+
+var dt = new DataTransfer();
+dt.setData('text/plain', text);
+var ev = new ClipboardEvent('paste', {clipboardData: dt, bubbles: true, cancelable: true});
+var handled = !el.dispatchEvent(ev);
+if (!handled && el.tagName === 'TEXTAREA') {
+    var setter = Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, 'value').set;
+    setter.call(el, text);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+}
+
+var deadline = Date.now() + waitMs;
+(function check() {
+    var ok = artbotSameText(el, text);
+    if (ok || Date.now() > deadline)
+        return done({ok: ok, handled: handled, length: artbotEditorText(el).length});
+    requestAnimationFrame(function () { setTimeout(check, 30); });
+})();
+"""
+
+_CAPTION_MATCHES_JS = _CAPTION_TEXT_JS + """
+return artbotSameText(arguments[0], arguments[1]);
+"""
+
+
+def _paste_event(driver, element, text: str) -> bool:
+    """Paste text through a synthetic ClipboardEvent and confirm it in one call."""
+    try:
+        result = driver.execute_async_script(_PASTE_CAPTION_JS, element, text, PASTE_VERIFY_MS)
+    except Exception as exc:
+        log.debug(f"Caption paste event failed: {exc}")
+        return False
+    if not result["ok"]:
+        log.debug(f"Caption paste event not applied (handled={result['handled']}, "
+                  f"editor has {result['length']} chars)")
+    return bool(result["ok"])
+
+
+def _clear_editor(element) -> None:
+    element.send_keys(Keys.CONTROL, "a")
+    element.send_keys(Keys.BACKSPACE)
+
+
+def _type_caption(driver, element, text: str, timeout: float = 5) -> bool:
+    """Type the caption with Input.insertText, Shift+Enter between lines."""
+    _clear_editor(element)
+    for n, line in enumerate(text.split("\n")):
+        if n:
+            element.send_keys(Keys.SHIFT, Keys.ENTER)
+        insert_text(driver, element, line, pace=False)
+    return _wait_js(driver, _CAPTION_MATCHES_JS, timeout, element, text)
+
 
 def _set_clipboard(text: str) -> None:
     """Write text to the Windows clipboard via PowerShell."""
@@ -267,19 +394,172 @@ def _set_clipboard(text: str) -> None:
             pass
 
 
-def _clipboard_paste(driver, element, text: str) -> None:
-    """Set clipboard to text, click element, then Ctrl+V."""
+def _clipboard_paste(driver, element, text: str, timeout: float = 5) -> bool:
+    """Set clipboard to text, focus element, then Ctrl+V.
+
+    Waits for the editor to take focus before pasting and for the text to show
+    up afterwards.  Returns True once the caption is visible in the editor.
+    """
     _set_clipboard(text)
     element.click()
-    time.sleep(0.5)
+    if not _wait_js(driver, _FOCUSED_JS, timeout, element):
+        log.warning("Caption editor did not take focus — pasting anyway.")
     element.send_keys(Keys.CONTROL, "a")
-    time.sleep(0.2)
     element.send_keys(Keys.CONTROL, "v")
-    time.sleep(0.5)
+    return _wait_js(driver, _HAS_TEXT_JS, timeout, element, text[:20])
+
+
+def _insert_caption(driver, element, text: str) -> str | None:
+    """Put the caption into the editor; returns the method that worked, or None."""
+    element.click()
+    if _paste_event(driver, element, text):
+        return "paste event"
+    try:
+        if _type_caption(driver, element, text):
+            return "insertText"
+    except Exception as exc:
+        log.debug(f"Typing the caption failed: {exc}")
+    if sys.platform == "win32":
+        log.info("Falling back to the PowerShell clipboard for the caption.")
+        _clear_editor(element)
+        if _clipboard_paste(driver, element, text):
+            return "clipboard"
+    return None
+
+
+# ── Readiness conditions ──────────────────────────────────────────────────────
+#
+# The posting flow waits on what the page shows rather than on fixed sleeps.
+# Each step has its own timeout (STEP_TIMEOUTS, overridable per step through
+# cfg["ig_step_timeouts"]) and its duration is recorded as an
+# "instagram_post" phase in source_health.json, so slow steps are visible.
+
+STEP_TIMEOUTS = {
+    "home":         15,   # feed navigation rendered
+    "create":       10,   # logged-in page → Create/New post button clickable
+    "composer":     10,   # Create clicked → file input present
+    "preview":      30,   # file chosen → crop preview rendered
+    "crop":         15,   # crop Next → next dialog step
+    "filter":       15,   # filter Next → caption step
+    "caption":      20,   # caption editor found, focused and filled
+    "share_button": 15,   # caption done → Share button clickable
+    "share":        60,   # Share clicked → confirmation
+    "post_url":     15,   # share response (or profile grid) gives the new post's URL
+}
+POLL_S = 0.2
+
+_DIALOG_JS = """
+var d = document.querySelectorAll("[role='dialog']");
+var dlg = d.length ? d[d.length - 1] : null;
+"""
+
+_HEADING_JS = _DIALOG_JS + """
+if (!dlg) return null;
+var h = dlg.querySelector("h1, h2, [role='heading']");
+return h ? h.textContent.trim() : null;
+"""
+
+_HEADING_CHANGED_JS = _DIALOG_JS + """
+if (!dlg) return true;
+var h = dlg.querySelector("h1, h2, [role='heading']");
+return !!h && h.textContent.trim() !== arguments[0];
+"""
+
+_PREVIEW_JS = _DIALOG_JS + """
+return !!dlg && !!dlg.querySelector("img[src^='blob:'], canvas, video, [style*='blob:']");
+"""
+
+# Installed just before Share: wraps fetch and XHR so the media/configure
+# response (configure_sidecar for carousels) — which carries the new post's
+# shortcode — is kept on window.__artbotShare while the modal is still open.
+_SHARE_HOOK_JS = """
+if (window.__artbotShareHooked) { window.__artbotShare = null; return; }
+window.__artbotShareHooked = true;
+window.__artbotShare = null;
+var pattern = /\\/media\\/configure/;
+function record(url, status, body) {
+    if (!pattern.test(url || '')) return;
+    var info = {url: url, status: status, code: null};
+    try {
+        var data = JSON.parse(String(body).replace(/^for \\(;;\\);/, ''));
+        var media = data.media || (data.data && data.data.media) || {};
+        info.code = media.code || null;
+    } catch (e) {}
+    window.__artbotShare = info;
+}
+var origFetch = window.fetch;
+window.fetch = function (input, init) {
+    var url = typeof input === 'string' ? input : (input && input.url);
+    return origFetch.apply(this, arguments).then(function (resp) {
+        if (pattern.test(url || ''))
+            resp.clone().text().then(function (t) { record(url, resp.status, t); }, function () {});
+        return resp;
+    });
+};
+var origOpen = XMLHttpRequest.prototype.open;
+XMLHttpRequest.prototype.open = function (method, url) {
+    this.__artbotUrl = String(url);
+    return origOpen.apply(this, arguments);
+};
+var origSend = XMLHttpRequest.prototype.send;
+XMLHttpRequest.prototype.send = function () {
+    var xhr = this;
+    if (pattern.test(xhr.__artbotUrl || ''))
+        xhr.addEventListener('load', function () {
+            var body = (xhr.responseType === '' || xhr.responseType === 'text') ? xhr.responseText
+                     : (xhr.responseType === 'json' ? JSON.stringify(xhr.response) : '');
+            record(xhr.__artbotUrl, xhr.status, body);
+        });
+    return origSend.apply(this, arguments);
+};
+"""
+
+_SHARE_RESULT_JS = """
+return window.__artbotShare || null;
+"""
+
+_FOCUSED_JS = """
+var el = arguments[0], a = document.activeElement;
+return !!a && (a === el || el.contains(a));
+"""
+
+_HAS_TEXT_JS = """
+var el = arguments[0];
+var t  = el.value !== undefined && el.tagName === 'TEXTAREA' ? el.value : el.textContent;
+return (t || '').indexOf(arguments[1]) !== -1;
+"""
+
+
+def _wait_js(driver, condition_js: str, timeout: float, *args) -> bool:
+    """Poll a JS condition until it returns truthy; False on timeout."""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_S).until(
+            lambda d: d.execute_script(condition_js, *args)
+        )
+        return True
+    except Exception:
+        return False
+
+
+def _wait_step_change(driver, before: str | None, clicked, timeout: float) -> bool:
+    """Wait for the composer dialog to move on from the step titled before.
+
+    Without a heading to compare, wait (briefly) for the clicked button to be
+    replaced instead.
+    """
+    if before is not None:
+        return _wait_js(driver, _HEADING_CHANGED_JS, timeout, before)
+    try:
+        WebDriverWait(driver, min(timeout, 3), poll_frequency=POLL_S).until(EC.staleness_of(clicked))
+        return True
+    except Exception:
+        return False
 
 
 # ── Posted-image tracker ──────────────────────────────────────────────────────
 
+MAX_POST_FAILURES = 3   # failed attempts before an image drops out of the backlog
+
 def load_tracker() -> dict:
     if TRACKER_FILE.exists():
         try:
@@ -301,28 +581,109 @@ def daily_count(tracker: dict, date_str: str | None = None) -> int:
     return tracker.get("daily_counts", {}).get(date_str, 0)
 
 
-def mark_posted(tracker: dict, image_path: Path, post_url: str | None = None) -> None:
+def mark_posted(tracker: dict, image_path: Path, post_url: str | None = None,
+                count: bool = True) -> None:
+    """Record image_path as posted; count=False leaves today's post count alone
+    (every image of a carousel is marked, but the carousel is one post)."""
     date_str = datetime.now().strftime("%Y-%m-%d")
     tracker.setdefault("posted", []).append(image_path.name)
-    tracker.setdefault("daily_counts", {})[date_str] = (
-        tracker["daily_counts"].get(date_str, 0) + 1
-    )
+    if count:
+        tracker.setdefault("daily_counts", {})[date_str] = (
+            tracker.get("daily_counts", {}).get(date_str, 0) + 1
+        )
     if post_url:
         tracker.setdefault("post_urls", {})[image_path.name] = post_url
+    tracker.get("post_failures", {}).pop(image_path.name, None)
 
 
-def pick_unposted_image(tracker: dict) -> Path | None:
-    """Return the oldest unposted PNG from SAVE_DIR, or None."""
+def mark_failed(tracker: dict, image_path: Path) -> int:
+    """Count a failed attempt to post image_path; returns its failures so far."""
+    failures = tracker.setdefault("post_failures", {})
+    failures[image_path.name] = failures.get(image_path.name, 0) + 1
+    if failures[image_path.name] == MAX_POST_FAILURES:
+        log.warning(f"{image_path.name} has failed to post {MAX_POST_FAILURES} times — "
+                    f"leaving it out of the backlog")
+    return failures[image_path.name]
+
+
+def unposted_images(tracker: dict, min_age_s: float = 0) -> list[Path]:
+    """Unposted PNGs in SAVE_DIR, oldest first.
+
+    Images that have failed to post MAX_POST_FAILURES times, that another
+    poster has claimed, or that are newer than min_age_s are skipped.
+    """
     posted_set = set(tracker.get("posted", []))
-    candidates = sorted(
-        (p for p in SAVE_DIR.glob("*.png") if p.name not in posted_set),
+    failures   = tracker.get("post_failures", {})
+    cutoff     = time.time() - min_age_s
+    return sorted(
+        (p for p in SAVE_DIR.glob("*.png")
+         if p.name not in posted_set and failures.get(p.name, 0) < MAX_POST_FAILURES
+         and p.stat().st_mtime <= cutoff and not is_claimed(p)),
         key=lambda p: p.stat().st_mtime,
     )
+
+
+def pick_unposted_image(tracker: dict) -> Path | None:
+    """Return the oldest unposted PNG from SAVE_DIR (see unposted_images), or None."""
+    candidates = unposted_images(tracker)
     return candidates[0] if candidates else None
 
 
+# ── Posting claims ────────────────────────────────────────────────────────────
+#
+# art_bot's run and the monitor may post from the same backlog at the same
+# time (each on its own profile clone).  Before posting an image, a poster
+# claims it by creating <stem>.claim beside it exclusively — only one of two
+# racing posters can — and drops the claim once the tracker records the result.
+
+CLAIM_TTL_S = 7200   # a claim this old was left by a poster that died
+
+def _claim_file(image_path: Path) -> Path:
+    return image_path.with_name(image_path.stem + ".claim")
+
+
+def is_claimed(image_path: Path) -> bool:
+    try:
+        return time.time() - _claim_file(image_path).stat().st_mtime < CLAIM_TTL_S
+    except OSError:
+        return False
+
+
+def claim_image(image_path: Path) -> bool:
+    """Claim image_path for this process; False if another poster holds it or it has been posted."""
+    claim = _claim_file(image_path)
+    if claim.exists() and not is_claimed(image_path):
+        log.warning(f"Breaking stale claim on {image_path.name}")
+        claim.unlink(missing_ok=True)
+    try:
+        with open(claim, "x", encoding="utf-8") as f:
+            f.write(str(os.getpid()))
+    except FileExistsError:
+        log.info(f"{image_path.name} is being posted by another process — skipping it")
+        return False
+    # Claimed — but a poster that finished a moment ago may have posted it already
+    if image_path.name in load_tracker().get("posted", []):
+        release_claim(image_path)
+        return False
+    return True
+
+
+def release_claim(image_path: Path) -> None:
+    """Drop this process's claim on image_path; another process's claim is left alone."""
+    claim = _claim_file(image_path)
+    try:
+        if claim.read_text(encoding="utf-8").strip() == str(os.getpid()):
+            claim.unlink()
+    except OSError:
+        pass
+
+
 # ── Instagram bot class ───────────────────────────────────────────────────────
 
+POST_MANY_DELAY_S = (60, 90)   # pause between posts in post_many (range → random)
+CAROUSEL_MAX      = 10         # Instagram's limit on images per carousel post
+
+
 class InstagramBot:
     def __init__(self, cfg: dict):
         self.cfg = cfg
@@ -330,8 +691,8 @@ class InstagramBot:
     def setup_login(self) -> None:
         """Open Instagram in the bot Chrome profile for manual login."""
         import ctypes
-        driver = make_driver(self.cfg)
-        driver.get(INSTAGRAM_URL)
+        driver = make_driver(self.cfg, flow="posting")
+        load_page(driver, INSTAGRAM_URL)
         ctypes.windll.user32.MessageBoxW(
             0,
             "Log in to Instagram in Chrome, then click OK to save the session.",
@@ -341,11 +702,11 @@ class InstagramBot:
         log.info("Login session saved.")
         driver.quit()
 
-    def _check_logged_in(self, driver) -> bool:
+    def _check_logged_in(self, driver, timeout: float = 8) -> bool:
         if "/accounts/login" in driver.current_url or "/login" in driver.current_url:
             return False
         try:
-            WebDriverWait(driver, 8).until(
+            WebDriverWait(driver, timeout).until(
                 EC.presence_of_element_located(
                     (By.CSS_SELECTOR, "nav, [role='navigation'], svg[aria-label='Home']")
                 )
@@ -355,94 +716,113 @@ class InstagramBot:
             log.warning(f"Login check failed. URL: {driver.current_url}")
             return False
 
-    def _get_file_input(self, driver, timeout: int = 10):
-        """Find the file input element, handling the sub-menu case."""
-        file_input = None
-        for _ in range(timeout):
-            try:
-                file_input = driver.find_element(By.CSS_SELECTOR, "input[type='file']")
-                break
-            except Exception:
-                time.sleep(1)
+    def _step_timeout(self, step: str) -> float:
+        return float(self.cfg.get("ig_step_timeouts", {}).get(step, STEP_TIMEOUTS[step]))
 
-        if file_input is None:
-            # Sometimes Create opens a sub-menu — try clicking "Post" first
-            post_opt = find_first(driver, [
-                (By.XPATH, "//span[text()='Post']"),
-                (By.XPATH, "//div[text()='Post']"),
-            ], timeout=5)
-            if post_opt:
-                post_opt.click()
-                time.sleep(2)
-                try:
-                    file_input = driver.find_element(By.CSS_SELECTOR, "input[type='file']")
-                except Exception:
-                    pass
+    def _step_done(self, step: str, started: float, timings: dict) -> None:
+        elapsed = time.time() - started
+        timings[step] = round(elapsed, 1)
+        source_health.record_phase("instagram_post", step, elapsed)
 
-        return file_input
+    def _get_file_input(self, driver, timeout: float = 10):
+        """Wait for the file input, opening the Post sub-menu if Create shows one first."""
+        file_loc = (By.CSS_SELECTOR, "input[type='file']")
+        try:
+            found = WebDriverWait(driver, timeout, poll_frequency=POLL_S).until(EC.any_of(
+                EC.presence_of_element_located(file_loc),
+                EC.element_to_be_clickable((By.XPATH, "//span[text()='Post']")),
+                EC.element_to_be_clickable((By.XPATH, "//div[text()='Post']")),
+            ))
+        except Exception:
+            return None
+        if found.tag_name.lower() == "input":
+            return found
+
+        # Create opened a sub-menu — pick "Post"
+        found.click()
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=POLL_S).until(
+                EC.presence_of_element_located(file_loc)
+            )
+        except Exception:
+            return None
 
-    def _finish_post(self, driver, caption: str) -> tuple:
+    def _click_next(self, driver, step: str, timings: dict) -> bool:
+        """Click the dialog's Next button and wait for the next step to render."""
+        started  = time.time()
+        timeout  = self._step_timeout(step)
+        next_btn = find_first(driver, [
+            (By.XPATH, "//div[@role='button' and normalize-space(text())='Next']"),
+            (By.XPATH, "//button[normalize-space(text())='Next']"),
+        ], timeout=timeout, name="ig_next")
+        if not next_btn:
+            return False
+        before = driver.execute_script(_HEADING_JS)
+        next_btn.click()
+        if not _wait_step_change(driver, before, next_btn, timeout):
+            log.warning(f"{step}: dialog did not change after Next (still '{before}').")
+        self._step_done(step, started, timings)
+        return True
+
+    def _finish_post(self, driver, caption: str, timings: dict | None = None) -> tuple:
         """
         Walk through: crop step → filter step → caption step → share → confirm.
         Returns (True, post_url) or (False, None).
         """
+        timings = {} if timings is None else timings
+
         # Crop step → Next
-        next_btn = find_first(driver, [
-            (By.XPATH, "//div[@role='button' and normalize-space(text())='Next']"),
-            (By.XPATH, "//button[normalize-space(text())='Next']"),
-        ], timeout=15)
-        if next_btn:
-            next_btn.click()
+        if self._click_next(driver, "crop", timings):
             log.info("Passed crop step.")
-            time.sleep(3)
         else:
             log.warning("Crop Next button not found — continuing anyway.")
 
         # Filter/edit step → Next
-        next_btn = find_first(driver, [
-            (By.XPATH, "//div[@role='button' and normalize-space(text())='Next']"),
-            (By.XPATH, "//button[normalize-space(text())='Next']"),
-        ], timeout=15)
-        if next_btn:
-            next_btn.click()
+        if self._click_next(driver, "filter", timings):
             log.info("Passed filter step.")
-            time.sleep(5)
         else:
             log.warning("Filter Next button not found — continuing anyway.")
-            time.sleep(3)
 
         # Caption step
+        started     = time.time()
         caption_box = find_first(driver, [
             (By.CSS_SELECTOR, "[aria-label='Write a caption...']"),
             (By.CSS_SELECTOR, "div[role='textbox']"),
             (By.XPATH, "//div[@aria-multiline='true']"),
             (By.XPATH, "//textarea[@placeholder]"),
-        ], timeout=20)
+        ], timeout=self._step_timeout("caption"), name="ig_caption_box")
         if caption_box is None:
             log.error("Caption text box not found.")
             _screenshot(driver, "caption_missing")
             return False, None
 
-        _clipboard_paste(driver, caption_box, caption)
-        log.info("Caption pasted.")
-        time.sleep(2)
+        method = _insert_caption(driver, caption_box, caption)
+        if method:
+            log.info(f"Caption inserted ({method}).")
+        else:
+            log.warning("Caption not visible in the editor — sharing anyway.")
+        self._step_done("caption", started, timings)
 
         # Share
+        started   = time.time()
         share_btn = find_first(driver, [
             (By.XPATH, "//div[@role='button' and normalize-space(text())='Share']"),
             (By.XPATH, "//button[normalize-space(text())='Share']"),
-        ], timeout=15)
+        ], timeout=self._step_timeout("share_button"), name="ig_share")
         if share_btn is None:
             log.error("Share button not found.")
             return False, None
 
+        try:
+            driver.execute_script(_SHARE_HOOK_JS)
+        except Exception as exc:
+            log.debug(f"Share response hook not installed: {exc}")
         share_btn.click()
         log.info("Clicked Share — waiting for confirmation…")
-        time.sleep(10)
 
         # Confirm
         try:
-            WebDriverWait(driver, 30).until(
+            WebDriverWait(driver, self._step_timeout("share"), poll_frequency=POLL_S).until(
                 EC.any_of(
                     EC.presence_of_element_located(
                         (By.XPATH, "//*[contains(text(),'Your post has been shared')]")
@@ -454,69 +834,280 @@ class InstagramBot:
                 )
             )
             log.info("Post confirmed shared.")
+            self._step_done("share", started, timings)
         except Exception:
             log.warning("Could not confirm share — assuming success if no error.")
 
-        # Capture post URL
-        post_url: str | None = None
-        username = self.cfg.get("instagram_username", "").strip()
-        if username:
-            try:
-                driver.get(f"https://www.instagram.com/{username}/")
-                time.sleep(4)
-                links = driver.find_elements(By.CSS_SELECTOR, "a[href*='/p/']")
-                if links:
-                    href = links[0].get_attribute("href")
-                    if href and "/p/" in href:
-                        post_url = href.split("?")[0]
-                        log.info(f"Captured post URL: {post_url}")
-            except Exception as exc:
-                log.warning(f"Could not capture post URL: {exc}")
-
+        post_url = self._capture_post_url(driver, timings)
         return True, post_url
 
-    def post_image(self, image_path: Path, caption: str) -> tuple:
-        """Upload a single image to Instagram. Returns (True, post_url) or (False, None)."""
-        log.info(f"Posting: {image_path.name}")
-        driver = make_driver(self.cfg)
+    def _capture_post_url(self, driver, timings: dict) -> str | None:
+        """The new post's permalink — from the share response, else the profile grid."""
+        started = time.time()
+        try:
+            # Share is already confirmed, so the response has normally arrived
+            WebDriverWait(driver, min(5, self._step_timeout("post_url")), poll_frequency=POLL_S).until(
+                lambda d: d.execute_script(_SHARE_RESULT_JS)
+            )
+            share = driver.execute_script(_SHARE_RESULT_JS)
+        except Exception:
+            share = None
+        if share and share.get("code"):
+            post_url = f"https://www.instagram.com/p/{share['code']}/"
+            log.info(f"Captured post URL from share response: {post_url}")
+            self._step_done("post_url", started, timings)
+            return post_url
+        if share:
+            log.warning(f"Share response (HTTP {share.get('status')}) had no shortcode.")
+        else:
+            log.info("No share response seen — reading the URL from the profile page.")
+
+        # Fallback: newest post on our profile grid
+        username = self.cfg.get("instagram_username", "").strip()
+        if not username:
+            return None
+        started = time.time()
         try:
-            driver.get(INSTAGRAM_URL)
-            time.sleep(4)
-
-            if not self._check_logged_in(driver):
-                log.error("Not logged in to Instagram. Run: python art_bot.py login instagram")
-                return False, None
-
-            # Click Create / New Post
-            create_btn = find_first(driver, [
-                (By.CSS_SELECTOR, "svg[aria-label='New post']"),
-                (By.XPATH, "//*[@aria-label='New post']"),
-                (By.XPATH, "//span[contains(text(),'Create')]"),
-                (By.XPATH, "//a[contains(@href,'/create/')]"),
-            ], timeout=10)
-            if not create_btn:
-                log.error("Create/New Post button not found.")
-                return False, None
-            create_btn.click()
-            time.sleep(2)
-
-            # Upload file
-            file_input = self._get_file_input(driver)
-            if file_input is None:
-                log.error("File input element not found.")
-                return False, None
-
-            file_input.send_keys(str(image_path.resolve()))
+            load_page(driver, f"https://www.instagram.com/{username}/")
+            link = WebDriverWait(driver, self._step_timeout("post_url"), poll_frequency=POLL_S).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/p/']"))
+            )
+            href = link.get_attribute("href")
+            if href and "/p/" in href:
+                post_url = href.split("?")[0]
+                log.info(f"Captured post URL: {post_url}")
+                self._step_done("post_url", started, timings)
+                return post_url
+        except Exception as exc:
+            log.warning(f"Could not capture post URL: {exc}")
+        return None
+
+    def _open_home(self, driver, timings: dict) -> bool:
+        """Load the feed and confirm the session is logged in."""
+        started = time.time()
+        load_page(driver, INSTAGRAM_URL)
+        if not self._check_logged_in(driver, self._step_timeout("home")):
+            log.error("Not logged in to Instagram. Run: python art_bot.py login instagram")
+            return False
+        self._step_done("home", started, timings)
+        return True
+
+    def _create_post(self, driver, images: list[Path], caption: str, timings: dict) -> tuple:
+        """From any logged-in page: Create → upload → crop/filter/caption → share.
+
+        Several images are selected in the file input together, which makes
+        the post a carousel; its crop and filter steps are passed with Next
+        exactly like a single image's.
+        """
+        create_btn = find_first(driver, [
+            (By.CSS_SELECTOR, "svg[aria-label='New post']"),
+            (By.XPATH, "//*[@aria-label='New post']"),
+            (By.XPATH, "//span[contains(text(),'Create')]"),
+            (By.XPATH, "//a[contains(@href,'/create/')]"),
+        ], timeout=self._step_timeout("create"), name="ig_create")
+        if not create_btn:
+            log.error("Create/New Post button not found.")
+            return False, None
+
+        started = time.time()
+        create_btn.click()
+
+        # Upload file
+        file_input = self._get_file_input(driver, self._step_timeout("composer"))
+        if file_input is None:
+            log.error("File input element not found.")
+            return False, None
+        self._step_done("composer", started, timings)
+
+        started = time.time()
+        # Newline-separated paths select several files in a multiple input
+        file_input.send_keys("\n".join(str(p.resolve()) for p in images))
+        if len(images) > 1:
+            log.info(f"{len(images)} files selected for a carousel, waiting for crop step…")
+        else:
             log.info("File selected, waiting for crop step…")
-            time.sleep(5)
+        if _wait_js(driver, _PREVIEW_JS, self._step_timeout("preview")):
+            self._step_done("preview", started, timings)
+        else:
+            log.warning("Crop preview not detected — continuing anyway.")
 
-            return self._finish_post(driver, caption)
+        return self._finish_post(driver, caption, timings)
 
+    @contextmanager
+    def _driver(self, session=None):
+        """The session's Instagram Chrome, or a posting driver launched (and quit) for this block."""
+        driver = session.get("instagram") if session is not None else make_driver(self.cfg, flow="posting")
+        try:
+            yield driver
+        finally:
+            if session is None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+
+    def _with_driver(self, label: str, images: list[Path], caption: str, session=None) -> tuple:
+        """Open the feed and publish images as one post (see _create_post).
+
+        Returns (True, post_url) or (False, None); errors are logged under label.
+        """
+        timings: dict = {}
+        began   = time.time()
+        try:
+            with self._driver(session) as driver:
+                if not self._open_home(driver, timings):
+                    return False, None
+                result = self._create_post(driver, images, caption, timings)
+                log.info(
+                    f"{label} flow took {time.time() - began:.1f}s — "
+                    + ", ".join(f"{k} {v}s" for k, v in timings.items())
+                )
+                return result
         except Exception as exc:
-            log.error(f"post_image() failed: {exc}", exc_info=True)
+            log.error(f"{label}() failed: {exc}", exc_info=True)
             return False, None
-        finally:
-            try:
-                driver.quit()
-            except Exception:
-                pass
+
+    def post_image(self, image_path: Path, caption: str, session=None) -> tuple:
+        """Upload a single image to Instagram. Returns (True, post_url) or (False, None).
+
+        Pass the run's DriverSession to reuse its Chrome; otherwise a driver is
+        launched for this post and quit afterwards.
+        """
+        log.info(f"Posting: {image_path.name}")
+        return self._with_driver("post_image", [image_path], caption, session)
+
+    def post_carousel(self, images: list[Path], caption: str | None = None, session=None) -> tuple:
+        """Publish up to CAROUSEL_MAX images as one carousel post.
+
+        caption defaults to build_carousel_caption(images).  Returns
+        (True, post_url) or (False, None); the caller marks every image
+        posted with the shared URL.
+        """
+        images = images[:CAROUSEL_MAX]
+        if not images:
+            log.error("post_carousel() called with no images.")
+            return False, None
+        if len(images) < 2:
+            return self.post_image(images[0], caption or build_caption(images[0]), session=session)
+        log.info(f"Posting carousel of {len(images)}: {', '.join(p.name for p in images)}")
+        return self._with_driver("post_carousel", images, caption or build_carousel_caption(images), session)
+
+    def _post_delay(self, delay) -> float:
+        """Seconds to wait between posts: delay, else cfg["post_many_delay_s"],
+        else POST_MANY_DELAY_S.
+
+        Each may be a number or a [min, max] range to pick from.  The monitor
+        passes no delay, so cfg paces its force-posts too.
+        """
+        delay = self.cfg.get("post_many_delay_s", POST_MANY_DELAY_S) if delay is None else delay
+        if isinstance(delay, (list, tuple)):
+            return random.uniform(*delay)
+        return float(delay)
+
+    def _post_group(self, driver, group: list[Path], captions: dict, timings: dict) -> tuple:
+        """post_many's post of one group: a carousel, or a single image with its caption."""
+        try:
+            if len(group) > 1:
+                caption = build_carousel_caption(group)
+            else:
+                caption = captions.get(group[0].name) or build_caption(group[0])
+            return self._create_post(driver, group, caption, timings)
+        except Exception as exc:
+            log.error(f"post_many() failed on {', '.join(p.name for p in group)}: {exc}", exc_info=True)
+            return False, None
+
+    def post_many(self, images: list[Path], captions: dict | None = None,
+                  session=None, delay=None, per_post: int = 1) -> dict:
+        """Post several images, in order, in one logged-in browser session.
+
+        Login is checked once; between posts the feed is reloaded (to reset
+        the composer) and the bot waits delay seconds (see _post_delay).
+        With per_post > 1 the images go out as carousels of up to per_post
+        (at most CAROUSEL_MAX) images each, captioned by
+        build_carousel_caption.  Stops at the first failed post.  A failed
+        carousel counts against none of its images: its first image is
+        retried as a single post instead, and the batch stops after it.
+
+        Each image is claimed (claim_image) before it is posted, and images
+        another poster holds or has already posted are left out.  Every
+        image of a successful post is recorded in the tracker, re-read just
+        before, with the post's URL; the post counts once toward today's
+        total, and the tracker is saved straight away.
+
+        captions maps image name → caption for single-image posts; missing
+        ones use build_caption.  Returns {"attempted", "succeeded", "failed"}
+        counted in images, plus "posts" and "posted": {name: url}.
+        """
+        results = {"attempted": 0, "succeeded": 0, "failed": 0, "posts": 0, "posted": {}}
+        if not images:
+            return results
+        captions = captions or {}
+        size     = max(1, min(per_post, CAROUSEL_MAX))
+        groups   = [images[i:i + size] for i in range(0, len(images), size)]
+        began    = time.time()
+        with self._driver(session) as driver:
+            if not self._open_home(driver, {}):
+                results["failed"] = len(groups[0])
+                return results
+
+            for i, group in enumerate(groups):
+                claimed = [p for p in group if claim_image(p)]
+                if not claimed:
+                    continue
+                try:
+                    if results["attempted"]:
+                        pause = self._post_delay(delay)
+                        log.info(f"Pausing {pause:.0f}s before the next post…")
+                        time.sleep(pause)
+                        load_page(driver, INSTAGRAM_URL)
+
+                    group = claimed
+                    names = ", ".join(p.name for p in group)
+                    log.info(f"Posting {i + 1}/{len(groups)}: {names}")
+                    results["attempted"] += len(group)
+                    timings: dict = {}
+                    started = time.time()
+                    success, post_url = self._post_group(driver, group, captions, timings)
+                    retried = not success and len(group) > 1
+                    if retried:
+                        # A failed carousel says nothing about any one image, so
+                        # none is blamed for it: the first is retried on its own
+                        # (and counted as usual if that fails too), then the
+                        # batch stops.
+                        results["failed"] += len(group) - 1
+                        group = group[:1]
+                        log.warning(f"Carousel failed — retrying {group[0].name} as a single post…")
+                        load_page(driver, INSTAGRAM_URL)
+                        success, post_url = self._post_group(driver, group, captions, timings)
+
+                    # Re-read: the hourly run may have saved the tracker meanwhile
+                    tracker = load_tracker()
+                    if not success:
+                        results["failed"] += 1
+                        mark_failed(tracker, group[0])
+                        save_tracker(tracker)
+                        log.warning("Post failed — stopping the batch.")
+                        break
+
+                    for j, image_path in enumerate(group):
+                        mark_posted(tracker, image_path, post_url, count=(j == 0))
+                        results["posted"][image_path.name] = post_url
+                    save_tracker(tracker)
+                finally:
+                    for image_path in claimed:
+                        release_claim(image_path)
+                results["succeeded"] += len(group)
+                results["posts"]     += 1
+                log.info(
+                    f"Posted {len(group)} image(s) in {time.time() - started:.1f}s → {post_url or 'no URL'} — "
+                    + ", ".join(f"{k} {v}s" for k, v in timings.items())
+                )
+                if retried:
+                    log.warning("Carousel posting is failing — stopping the batch after the single post.")
+                    break
+
+        log.info(
+            f"Batch done — {results['succeeded']}/{len(images)} image(s) in {results['posts']} post(s), "
+            f"{time.time() - began:.0f}s on one browser session"
+        )
+        return results
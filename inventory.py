@@ -0,0 +1,129 @@
+"""
+Image inventory — a buffer of ready-to-post images kept off the hourly critical path.
+
+Ready images wait in AI_Art/inventory/ with their _meta.json sidecars; the
+directory is the durable queue (oldest first).  Keeping them out of AI_Art
+itself means monitor_agent does not mistake them for failed posts.
+
+  • python art_bot.py refill  — generates images until the queue holds
+                                cfg["inventory_target"] (default 6) or
+                                cfg["refill_budget_min"] (default 45) runs out.
+                                With cfg["refill_pollinations"] the shortfall is
+                                first requested from Pollinations in one
+                                concurrent batch; browsers cover what it misses.
+                                Schedule it for idle hours (register_refill_task.ps1).
+                                `refill N` adds at most N images; a backlog-first
+                                run starts `refill 1` in the background after
+                                posting a waiting image.
+  • art_bot.run()             — takes the oldest ready image, moves it into
+                                AI_Art and posts it within seconds; it only
+                                generates on the spot when the queue is empty.
+
+A failed generation during refill just leaves the buffer one image shorter.
+"""
+
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+
+from art_bot import SAVE_DIR, DriverSession, generate_image, pollinations_batch, _next_prompt
+
+INVENTORY_DIR = SAVE_DIR / "inventory"
+
+DEFAULT_TARGET         = 6
+DEFAULT_REFILL_MINUTES = 45
+MAX_REFILL_FAILURES    = 3     # consecutive generation failures before refill gives up
+MIN_READY_SIZE_KB      = 30
+
+log = logging.getLogger("art_bot")
+
+
+def _sidecar(image_path: Path) -> Path:
+    return image_path.with_name(image_path.stem + "_meta.json")
+
+
+def _move(image_path: Path, dest_dir: Path) -> Path:
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    dest = dest_dir / image_path.name
+    shutil.move(str(image_path), str(dest))
+    meta = _sidecar(image_path)
+    if meta.exists():
+        shutil.move(str(meta), str(_sidecar(dest)))
+    return dest
+
+
+def ready_images() -> list[Path]:
+    """Queued images with a sidecar, oldest first."""
+    if not INVENTORY_DIR.exists():
+        return []
+    return sorted(
+        (p for p in INVENTORY_DIR.glob("*.png")
+         if _sidecar(p).exists() and p.stat().st_size // 1024 >= MIN_READY_SIZE_KB),
+        key=lambda p: p.stat().st_mtime,
+    )
+
+
+def depth() -> int:
+    return len(ready_images())
+
+
+def add(image_path: Path) -> Path:
+    """Move a freshly generated image (and sidecar) into the queue."""
+    dest = _move(image_path, INVENTORY_DIR)
+    log.info(f"Inventory: queued {dest.name} (depth {depth()})")
+    return dest
+
+
+def take() -> Path | None:
+    """Pop the oldest ready image into SAVE_DIR for posting, or None if the queue is empty."""
+    ready = ready_images()
+    if not ready:
+        return None
+    path = _move(ready[0], SAVE_DIR)
+    # Postable from now on: the monitor's age guard must not see it as old
+    os.utime(path)
+    log.info(f"Inventory: took {path.name} ({len(ready) - 1} left)")
+    return path
+
+
+def refill(cfg: dict, limit: int | None = None) -> int:
+    """Generate images until the queue reaches its target depth. Returns the number added.
+
+    limit caps the images added (backlog-first runs refill one at a time).
+    """
+    target   = int(cfg.get("inventory_target", DEFAULT_TARGET))
+    if limit is not None:
+        target = min(target, depth() + limit)
+    deadline = time.time() + float(cfg.get("refill_budget_min", DEFAULT_REFILL_MINUTES)) * 60
+    added    = 0
+    failures = 0
+
+    log.info(f"Inventory: refill starting — depth {depth()}, target {target}")
+    if cfg.get("refill_pollinations", False) and depth() < target:
+        jobs = [_next_prompt() for _ in range(target - depth())]
+        for filepath in pollinations_batch(jobs, cfg):
+            add(Path(filepath))
+            added += 1
+
+    if depth() >= target:
+        log.info(f"Inventory: refill done — added {added}, depth {depth()}")
+        return added
+
+    with DriverSession(cfg) as session:
+        while depth() < target and time.time() < deadline:
+            prompt, components = _next_prompt()
+            filepath = generate_image(prompt, components, cfg, session=session)
+            if not filepath:
+                failures += 1
+                if failures >= MAX_REFILL_FAILURES:
+                    log.warning(f"Inventory: {failures} failures in a row — stopping refill")
+                    break
+                continue
+            failures = 0
+            add(Path(filepath))
+            added += 1
+
+    log.info(f"Inventory: refill done — added {added}, depth {depth()}")
+    return added
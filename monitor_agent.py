@@ -10,7 +10,10 @@ What it checks and fixes each run:
   4. Today's logs           — counts ERROR/CRITICAL lines, surfaces the worst ones
   5. Daily health           — checks that 24 images were generated and posted today
   6. Unposted images        — any PNG in AI_Art not yet on Instagram → force-posts them
+                              (as carousels when the backlog is large)
   7. Image quality          — removes posts with suspiciously small or corrupt images
+  8. Profile maintenance    — prunes Chrome caches to budget, vacuums databases,
+                              times a Chrome cold start before and after
 
 Results logged to:    AIArtBot/logs/monitor_YYYYMMDD.log
 Rolling 30-day report: AIArtBot/monitor_report.json
@@ -35,6 +38,8 @@ LOG_DIR      = BOT_DIR / "logs"
 LOCK_FILE    = BOT_DIR / "artbot.lock"
 REGISTER_PS1 = BOT_DIR / "register_task.ps1"
 REPORT_FILE  = BOT_DIR / "monitor_report.json"
+CONFIG_FILE  = BOT_DIR / "config.json"
+INVENTORY_DIR = SAVE_DIR / "inventory"
 
 LOG_DIR.mkdir(exist_ok=True)
 
@@ -45,7 +50,8 @@ EXPECTED_DAILY  = 12          # 1 image per 2 hours × 12 runs per day
 LOW_WATER_MARK  = 9           # flag day as unhealthy if fewer than this were posted
 MIN_AGE_MINUTES = 90          # skip images newer than this (bot may still be working)
 MAX_FORCE_POSTS = 6           # cap force-posts per monitor run
-FORCE_POST_DELAY = 75         # seconds between consecutive force-posts
+CAROUSEL_BACKLOG = 5          # backlog (images) at which force-posts become carousels
+MAX_FORCE_CAROUSELS = 2       # cap carousel posts per monitor run (≤10 images each)
 MIN_IMAGE_SIZE_KB = 50        # images smaller than this are considered corrupt/placeholder
 
 # ── Logging ────────────────────────────────────────────────────────────────────
@@ -101,6 +107,15 @@ def _artbot_running() -> bool:
     return False
 
 
+def _profile_clones_enabled() -> bool:
+    """cfg["profile_clones"]: art_bot and the monitor each run Chrome on their own profile clone."""
+    try:
+        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+            return bool(json.load(f).get("profile_clones", False))
+    except Exception:
+        return False
+
+
 def _wait_for_artbot(max_wait: int = 300) -> None:
     if not _artbot_running():
         return
@@ -111,7 +126,7 @@ def _wait_for_artbot(max_wait: int = 300) -> None:
         if not _artbot_running():
             log.info("art_bot finished — proceeding.")
             return
-    log.warning("art_bot did not finish within wait window — proceeding anyway.")
+    log.warning("art_bot did not finish within the wait window.")
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -144,6 +159,11 @@ def cleanup_zombie_chrome() -> dict:
     killed_chrome  = []
     cleared_locks  = []
 
+    if _profile_clones_enabled() and _artbot_running():
+        # Its Chrome runs on a profile clone and is not a zombie
+        log.info("art_bot is running on a profile clone — leaving Chrome alone.")
+        return {"drivers_killed": [], "chrome_killed": [], "locks_cleared": 0}
+
     # Kill all ChromeDriver processes
     try:
         result = subprocess.run(
@@ -197,15 +217,13 @@ def cleanup_zombie_chrome() -> dict:
     except Exception as exc:
         log.warning(f"Bot Chrome cleanup error: {exc}")
 
-    # Clear Chrome profile lock files
+    # Clear Chrome profile lock files — and rebuild the lock index that lets
+    # every launch skip walking the profile (see chrome_profiles.py)
     if CHROME_PROFILE.exists():
-        for pattern in ("LOCK", "SingletonLock", "SingletonCookie", "SingletonSocket"):
-            for p in CHROME_PROFILE.rglob(pattern):
-                try:
-                    p.unlink()
-                    cleared_locks.append(p.name)
-                except Exception:
-                    pass
+        sys.path.insert(0, str(BOT_DIR))
+        import chrome_profiles
+        chrome_profiles.refresh_lock_index(CHROME_PROFILE)
+        cleared_locks = chrome_profiles.clear_profile_locks(CHROME_PROFILE, kill=False)["removed"]
         if cleared_locks:
             log.info(f"Cleared {len(cleared_locks)} Chrome profile lock file(s).")
 
@@ -350,6 +368,7 @@ def check_daily_health(tracker: dict) -> dict:
     total_images   = sum(1 for _ in SAVE_DIR.glob("*.png"))
     total_posted   = len(tracker.get("posted", []))
     unposted_total = total_images - total_posted
+    inventory      = sum(1 for _ in INVENTORY_DIR.glob("*.png")) if INVENTORY_DIR.exists() else 0
 
     healthy = posted_today >= LOW_WATER_MARK or (now.hour < 20 and generated_today > 0)
 
@@ -361,6 +380,7 @@ def check_daily_health(tracker: dict) -> dict:
         "total_images":     total_images,
         "total_posted":     total_posted,
         "unposted_total":   unposted_total,
+        "inventory_depth":  inventory,
         "target_daily":     EXPECTED_DAILY,
         "healthy":          healthy,
     }
@@ -371,64 +391,95 @@ def check_daily_health(tracker: dict) -> dict:
 # ══════════════════════════════════════════════════════════════════════════════
 
 def find_unposted_images(tracker: dict) -> list[Path]:
-    """Return PNG files in AI_Art not yet in the tracker, oldest-first, skipping very recent."""
-    posted_set = set(tracker.get("posted", []))
-    cutoff     = time.time() - MIN_AGE_MINUTES * 60
-    return [
-        p for p in sorted(SAVE_DIR.glob("*.png"), key=lambda x: x.stat().st_mtime)
-        if p.name not in posted_set and p.stat().st_mtime <= cutoff
-    ]
+    """Return PNG files in AI_Art not yet in the tracker, oldest-first.
+
+    Uses instagram_bot.unposted_images, so very recent images, claimed ones
+    and ones that have failed to post too often are skipped just as art_bot
+    skips them.
+    """
+    try:
+        sys.path.insert(0, str(BOT_DIR))
+        from instagram_bot import unposted_images
+    except Exception as exc:
+        log.error(f"Unposted-image scan failed: {exc}")
+        return []
+    return unposted_images(tracker, MIN_AGE_MINUTES * 60)
 
 
 def force_post_unposted(unposted: list[Path]) -> dict:
-    """Force-post up to MAX_FORCE_POSTS unposted images."""
+    """Force-post up to MAX_FORCE_POSTS unposted images.
+
+    A backlog of cfg["carousel_backlog"] (default CAROUSEL_BACKLOG) images or
+    more goes out as up to MAX_FORCE_CAROUSELS carousel posts of up to 10
+    images each instead.
+    """
     results = {
         "images_queued": len(unposted),
         "attempted":     0,
         "succeeded":     0,
         "failed":        0,
+        "posts":         0,
     }
     if not unposted:
         return results
 
+    sys.path.insert(0, str(BOT_DIR))
     try:
-        sys.path.insert(0, str(BOT_DIR))
-        from art_bot import load_config
-        from instagram_bot import InstagramBot, build_caption, load_tracker, mark_posted, save_tracker
-
-        cfg     = load_config()
-        bot     = InstagramBot(cfg)
-        tracker = load_tracker()
-
-        to_post = min(len(unposted), MAX_FORCE_POSTS)
-        results["attempted"] = to_post
+        from art_bot import _acquire_lock, _release_lock
+    except Exception as exc:
+        log.error(f"Force-post setup failed: {exc}")
+        results["failed"] = len(unposted)
+        return results
 
-        for i, img_path in enumerate(unposted[:to_post]):
-            log.info(f"Force-post {i + 1}/{to_post}: {img_path.name}")
-            try:
-                caption  = build_caption(img_path)
-                success, post_url = bot.post_image(img_path, caption)
-                if success:
-                    mark_posted(tracker, img_path, post_url)
-                    save_tracker(tracker)
-                    results["succeeded"] += 1
-                    log.info(f"  Succeeded → {post_url or 'no URL'}")
-                else:
-                    results["failed"] += 1
-                    log.warning("  Post failed — stopping force-post loop.")
-                    break
-            except Exception as exc:
-                log.error(f"  force_post exception: {exc}")
-                results["failed"] += 1
-                break
-
-            if i < to_post - 1:
-                log.info(f"  Pausing {FORCE_POST_DELAY}s before next post…")
-                time.sleep(FORCE_POST_DELAY)
+    # On the shared profile the monitor's Chrome would collide with art_bot's,
+    # so the run lock is held while posting.  With profile clones the two
+    # post side by side; post_many claims each image first, so an image the
+    # hourly run is posting is skipped rather than published twice.
+    locked = not _profile_clones_enabled()
+    if locked and not _acquire_lock():
+        log.warning("art_bot is still running — leaving the backlog for the next monitor run.")
+        return results
+    try:
+        from art_bot import DriverSession, load_config
+        from instagram_bot import CAROUSEL_MAX, InstagramBot
+
+        # art_bot may have posted some of these meanwhile
+        posted_set = set(_load_tracker().get("posted", []))
+        unposted   = [p for p in unposted if p.name not in posted_set and p.exists()]
+        if not unposted:
+            log.info("Backlog already cleared by art_bot — nothing to force-post.")
+            return results
+
+        cfg      = load_config()
+        bot      = InstagramBot(cfg)
+        per_post = 1
+        to_post  = unposted[:MAX_FORCE_POSTS]
+        if len(unposted) >= int(cfg.get("carousel_backlog", CAROUSEL_BACKLOG)):
+            per_post = CAROUSEL_MAX
+            to_post  = unposted[:CAROUSEL_MAX * MAX_FORCE_CAROUSELS]
+            log.info(f"Large backlog — force-posting {len(to_post)} image(s) as carousels "
+                     f"in one browser session…")
+        else:
+            log.info(f"Force-posting {len(to_post)} image(s) in one browser session…")
+
+        # Own worker name → own profile clone when cfg["profile_clones"] is set
+        # (so the monitor's Chrome never disturbs the shared profile).
+        # post_many checks the login once, claims each image, paces posts by
+        # cfg["post_many_delay_s"], stops at the first failure and saves the
+        # tracker after every successful post.
+        with DriverSession(cfg, worker="monitor") as session:
+            batch = bot.post_many(to_post, session=session, per_post=per_post)
+        results["attempted"] = batch["attempted"]
+        results["succeeded"] = batch["succeeded"]
+        results["failed"]    = batch["failed"]
+        results["posts"]     = batch["posts"]
 
     except Exception as exc:
         log.error(f"Force-post setup failed: {exc}")
         results["failed"] = results["attempted"] or len(unposted)
+    finally:
+        if locked:
+            _release_lock()
 
     return results
 
@@ -475,6 +526,25 @@ def check_image_quality() -> dict:
     return {"bad_files": bad_files, "count": len(bad_files)}
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+#  STEP 8 — CHROME PROFILE MAINTENANCE
+# ══════════════════════════════════════════════════════════════════════════════
+
+def maintain_profile() -> dict:
+    """Run art_bot's profile GC; skipped (not an error) while art_bot holds the lock."""
+    try:
+        sys.path.insert(0, str(BOT_DIR))
+        from art_bot import profile_gc
+
+        result = profile_gc()
+        if result is None:
+            return {"skipped": "art_bot running"}
+        return result
+    except Exception as exc:
+        log.error(f"Profile maintenance failed: {exc}")
+        return {"skipped": f"error: {exc}"}
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  REPORT
 # ══════════════════════════════════════════════════════════════════════════════
@@ -550,14 +620,14 @@ def main() -> int:
     }
 
     # ── Step 1: Clear stale locks ──────────────────────────────────────────
-    log.info("[1/7]  Checking lock files…")
+    log.info("[1/8]  Checking lock files…")
     cleared = clear_stale_locks()
     report["fixes"]["cleared_locks"] = cleared
     if cleared:
         log.info(f"       Cleared: {cleared}")
 
     # ── Step 2: Chrome zombie cleanup ──────────────────────────────────────
-    log.info("[2/7]  Cleaning up zombie Chrome/ChromeDriver processes…")
+    log.info("[2/8]  Cleaning up zombie Chrome/ChromeDriver processes…")
     chrome_cleanup = cleanup_zombie_chrome()
     report["fixes"]["chrome_cleanup"] = chrome_cleanup
     log.info(
@@ -567,7 +637,7 @@ def main() -> int:
     )
 
     # ── Step 3: Scheduler task ─────────────────────────────────────────────
-    log.info("[3/7]  Checking scheduler task…")
+    log.info("[3/8]  Checking scheduler task…")
     sched = check_scheduler()
     report["checks"]["scheduler"] = sched
     log.info(
@@ -589,7 +659,7 @@ def main() -> int:
             log.info("       Scheduler re-registered.")
 
     # ── Step 4: Log errors ─────────────────────────────────────────────────
-    log.info("[4/7]  Scanning today's logs for errors…")
+    log.info("[4/8]  Scanning today's logs for errors…")
     log_check = check_logs_for_errors()
     report["checks"]["logs"] = log_check
     log.info(
@@ -605,7 +675,7 @@ def main() -> int:
         report["overall_healthy"] = False
 
     # ── Step 5: Daily health ───────────────────────────────────────────────
-    log.info("[5/7]  Checking daily generation / post counts…")
+    log.info("[5/8]  Checking daily generation / post counts…")
     tracker = _load_tracker()
     health  = check_daily_health(tracker)
     report["checks"]["daily_health"] = health
@@ -613,6 +683,7 @@ def main() -> int:
     log.info(f"       Posted today     : {health['posted_today']} / {EXPECTED_DAILY} target")
     log.info(f"       Posted yesterday : {health['posted_yesterday']}")
     log.info(f"       Unposted total   : {health['unposted_total']}")
+    log.info(f"       Inventory ready  : {health['inventory_depth']}")
     if not health["healthy"]:
         report["issues"].append(
             f"Low post count: {health['posted_today']} posted today "
@@ -621,7 +692,7 @@ def main() -> int:
         report["overall_healthy"] = False
 
     # ── Step 6: Unposted images ────────────────────────────────────────────
-    log.info("[6/7]  Scanning AI_Art folder for unposted images…")
+    log.info("[6/8]  Scanning AI_Art folder for unposted images…")
     unposted = find_unposted_images(tracker)
     report["checks"]["unposted"] = {
         "count": len(unposted),
@@ -632,9 +703,9 @@ def main() -> int:
     if unposted:
         report["issues"].append(f"{len(unposted)} image(s) not yet posted to Instagram")
         report["overall_healthy"] = False
-        _wait_for_artbot()
-        capped = min(len(unposted), MAX_FORCE_POSTS)
-        log.info(f"       Force-posting up to {capped} image(s)…")
+        if not _profile_clones_enabled():
+            _wait_for_artbot()
+        log.info("       Force-posting the backlog…")
         post_results = force_post_unposted(unposted)
         report["fixes"]["force_posted"] = post_results
         log.info(
@@ -646,7 +717,7 @@ def main() -> int:
         log.info("       All images are posted — nothing to recover.")
 
     # ── Step 7: Image quality check ────────────────────────────────────────
-    log.info("[7/7]  Checking image quality…")
+    log.info("[7/8]  Checking image quality…")
     quality = check_image_quality()
     report["checks"]["quality"] = quality
     if quality["count"] > 0:
@@ -658,6 +729,19 @@ def main() -> int:
     else:
         log.info("       All images pass quality check.")
 
+    # ── Step 8: Chrome profile maintenance ─────────────────────────────────
+    log.info("[8/8]  Pruning the Chrome profile…")
+    profile = maintain_profile()
+    report["fixes"]["profile_gc"] = profile
+    if profile.get("skipped"):
+        log.info(f"       Skipped — {profile['skipped']}")
+    else:
+        log.info(
+            f"       Size: {profile['size_before_mb']} MB → {profile['size_after_mb']} MB  "
+            f"(budget {profile['budget_mb']} MB)  "
+            f"Cold start: {profile['cold_start_before_s']}s → {profile['cold_start_after_s']}s"
+        )
+
     # ── Summary + report ───────────────────────────────────────────────────
     _print_summary(report)
     write_report(report)
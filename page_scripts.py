@@ -0,0 +1,45 @@
+"""
+Page scripts — small in-page helpers shared by both driver backends.
+
+art_bot's Selenium helpers (insert_text, race_selectors) and the CDP backend
+(cdp_driver) both need them, so they live here rather than in either.
+
+  FOCUS_END_JS             — focus an editor with the caret at the end
+  locator(by, value)       — Selenium locator → ("css"|"xpath", selector)
+"""
+
+from selenium.webdriver.common.by import By
+
+# Focus an editor with the caret at the end; returns whether it took focus.
+FOCUS_END_JS = """
+var el = arguments[0];
+el.focus();
+if (el.isContentEditable) {
+    var range = document.createRange();
+    range.selectNodeContents(el);
+    range.collapse(false);
+    var sel = window.getSelection();
+    sel.removeAllRanges();
+    sel.addRange(range);
+} else if (typeof el.value === 'string' && el.setSelectionRange) {
+    try { el.setSelectionRange(el.value.length, el.value.length); } catch (e) {}
+}
+return document.activeElement === el || el.contains(document.activeElement);
+"""
+
+
+def locator(by: str, value: str) -> tuple:
+    """Selenium locator → ("css"|"xpath", selector), for in-page lookups."""
+    if by == By.XPATH:
+        return "xpath", value
+    if by == By.ID:
+        return "css", f'[id="{value}"]'
+    if by == By.NAME:
+        return "css", f'[name="{value}"]'
+    if by == By.CLASS_NAME:
+        return "css", f".{value}"
+    if by == By.LINK_TEXT:
+        return "xpath", f'//a[normalize-space(.)="{value}"]'
+    if by == By.PARTIAL_LINK_TEXT:
+        return "xpath", f'//a[contains(normalize-space(.), "{value}")]'
+    return "css", value   # CSS_SELECTOR, TAG_NAME
@@ -0,0 +1,52 @@
+# register_refill_task.ps1
+#
+# Registers AIArtBot_Refill to run once per day at 3:00 AM.
+# The refill tops up the ready-image inventory (AI_Art\inventory) so the
+# hourly runs can post straight from the queue instead of generating.
+#
+# Run once as Administrator:
+#   powershell -ExecutionPolicy Bypass -File register_refill_task.ps1
+#
+# To trigger manually (no Admin needed after registration):
+#   powershell -Command "Start-ScheduledTask -TaskName 'AIArtBot_Refill'"
+
+$TaskName   = "AIArtBot_Refill"
+$PythonExe  = "C:\Python314\python.exe"
+$ScriptPath = "C:\Users\gageg\AIArtBot\art_bot.py"
+$WorkDir    = "C:\Users\gageg\AIArtBot"
+
+# Remove any existing version of this task
+Unregister-ScheduledTask -TaskName $TaskName -Confirm:$false -ErrorAction SilentlyContinue
+
+# Action: run Python with the refill command
+$action = New-ScheduledTaskAction `
+    -Execute    $PythonExe `
+    -Argument   "`"$ScriptPath`" refill" `
+    -WorkingDirectory $WorkDir
+
+# Trigger: daily at 3:00 AM (between the 2 AM and 4 AM hourly runs)
+$trigger = New-ScheduledTaskTrigger -Daily -At "3:00AM"
+
+# Settings: refill_budget_min defaults to 45 — 55 min is a safe ceiling
+$settings = New-ScheduledTaskSettingsSet `
+    -ExecutionTimeLimit   (New-TimeSpan -Minutes 55) `
+    -StartWhenAvailable `
+    -RunOnlyIfNetworkAvailable `
+    -MultipleInstances    IgnoreNew
+
+# Register with standard user privileges — Chrome won't run as admin
+Register-ScheduledTask `
+    -TaskName  $TaskName `
+    -Action    $action `
+    -Trigger   $trigger `
+    -Settings  $settings `
+    -RunLevel  Limited `
+    -Force
+
+Write-Host ""
+Write-Host "AIArtBot_Refill task registered." -ForegroundColor Green
+Write-Host "  Runs daily at 3:00 AM."
+Write-Host "  Logs: C:\Users\gageg\AIArtBot\logs\bot_YYYYMMDD.log"
+Write-Host ""
+Write-Host "To run it now:"
+Write-Host "  powershell -Command `"Start-ScheduledTask -TaskName '$TaskName'`""
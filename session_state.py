@@ -0,0 +1,198 @@
+"""
+Session state — exported logins injected into a throw-away Chrome profile.
+
+Starting Chrome on the long-lived chrome_profile gets slower as the profile
+accumulates cache, history and service-worker storage.  With
+cfg["session_mode"] = "cookies" each DriverSession instead starts Chrome on
+an empty profile under light_profiles/ and, before the first navigation,
+injects the cookies (Network.setCookies) and localStorage (a new-document
+script) exported from the logged-in profile:
+
+  python art_bot.py export-session   — export instagram/grok/chatgpt state
+                                       from chrome_profile to session_state.json
+  python art_bot.py session-status   — show when each exported login expires
+
+Cookies the sites rotate during a run are written back to session_state.json
+when the session closes.  Re-run export-session (after `login <site>` if
+needed) once session-status reports an expired login.
+"""
+
+import json
+import logging
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+
+BOT_DIR    = Path(__file__).parent
+STATE_FILE = BOT_DIR / "session_state.json"
+LIGHT_DIR  = BOT_DIR / "light_profiles"
+
+SITES = {
+    "instagram": {"url": "https://www.instagram.com/", "domain": "instagram.com",
+                  "auth": ["sessionid"]},
+    "grok":      {"url": "https://grok.com/",          "domain": "grok.com",
+                  "auth": ["sso"]},
+    "chatgpt":   {"url": "https://chatgpt.com/",       "domain": "chatgpt.com",
+                  "auth": ["__Secure-next-auth.session-token"]},
+}
+EXPIRY_WARN_DAYS = 3
+
+# Fields Network.setCookies accepts from a Network.getAllCookies entry
+_COOKIE_PARAMS = ("name", "value", "domain", "path", "secure", "httpOnly",
+                  "sameSite", "expires", "priority", "sourceScheme", "sourcePort")
+
+log = logging.getLogger("art_bot")
+
+
+# ── Storage ───────────────────────────────────────────────────────────────────
+
+def load_state() -> dict | None:
+    if STATE_FILE.exists():
+        try:
+            return json.loads(STATE_FILE.read_text(encoding="utf-8"))
+        except Exception as exc:
+            log.warning(f"Could not read {STATE_FILE.name}: {exc}")
+    return None
+
+
+def save_state(state: dict) -> None:
+    STATE_FILE.write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+
+def _site_cookies(cookies: list, domain: str) -> list:
+    return [c for c in cookies if c.get("domain", "").lstrip(".").endswith(domain)]
+
+
+# ── Export ────────────────────────────────────────────────────────────────────
+
+def export_state(driver) -> dict:
+    """Visit each site in a logged-in driver and save its cookies and localStorage."""
+    from art_bot import load_page
+
+    sites = {}
+    for name, site in SITES.items():
+        load_page(driver, site["url"])
+        time.sleep(2)   # let the app write its localStorage
+        try:
+            storage = driver.execute_script(
+                "var o = {}; for (var i = 0; i < localStorage.length; i++) {"
+                " var k = localStorage.key(i); o[k] = localStorage.getItem(k); } return o;"
+            ) or {}
+        except Exception:
+            storage = {}
+        sites[name] = {"origin": site["url"].rstrip("/"), "local_storage": storage}
+
+    cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+    for name, site in SITES.items():
+        sites[name]["cookies"] = _site_cookies(cookies, site["domain"])
+
+    state = {"exported_at": datetime.now().isoformat(timespec="seconds"), "sites": sites}
+    save_state(state)
+    for name, info in status(state).items():
+        log.info(f"Exported {name}: {info['summary']}")
+    return state
+
+
+def refresh_cookies(driver) -> None:
+    """Write the driver's current cookies for each site back into session_state.json."""
+    state = load_state()
+    if not state:
+        return
+    try:
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+    except Exception as exc:
+        log.debug(f"Could not read cookies for session refresh: {exc}")
+        return
+    for name, site in SITES.items():
+        fresh = _site_cookies(cookies, site["domain"])
+        if fresh and name in state["sites"]:
+            state["sites"][name]["cookies"] = fresh
+    save_state(state)
+
+
+# ── Injection ─────────────────────────────────────────────────────────────────
+
+def light_profile(worker: str) -> Path:
+    """An empty profile directory for worker (any leftover from a crash is wiped)."""
+    path = LIGHT_DIR / worker
+    shutil.rmtree(path, ignore_errors=True)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def discard_profile(path: Path) -> None:
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _cookie_param(cookie: dict) -> dict:
+    param = {k: cookie[k] for k in _COOKIE_PARAMS if k in cookie}
+    if cookie.get("session") or param.get("expires", -1) < 0:
+        param.pop("expires", None)
+    return param
+
+
+_SEED_STORAGE_JS = """
+(function (seed) {
+    var items = seed[location.origin];
+    if (!items) return;
+    try {
+        for (var k in items)
+            if (localStorage.getItem(k) === null) localStorage.setItem(k, items[k]);
+    } catch (e) {}
+})(%s);
+"""
+
+
+def inject(driver, state: dict) -> None:
+    """Install exported cookies and localStorage before the driver's first navigation."""
+    cookies = [_cookie_param(c) for site in state["sites"].values() for c in site.get("cookies", [])]
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+
+    seed = {site["origin"]: site.get("local_storage", {}) for site in state["sites"].values()}
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                           {"source": _SEED_STORAGE_JS % json.dumps(seed)})
+    log.info(f"Session state injected — {len(cookies)} cookies for {', '.join(state['sites'])}")
+
+
+# ── Expiry ────────────────────────────────────────────────────────────────────
+
+def status(state: dict | None = None) -> dict:
+    """Per site: when its login cookie expires, and whether it already has.
+
+    Returns {site: {"expires": iso|None, "days_left": float|None, "expired": bool,
+    "summary": str}}.  A missing login cookie counts as expired.
+    """
+    state = state if state is not None else load_state()
+    now   = time.time()
+    out   = {}
+    for name, site in SITES.items():
+        cookies = (state or {}).get("sites", {}).get(name, {}).get("cookies", [])
+        auth    = [c for c in cookies if any(c["name"].startswith(a) for a in site["auth"])]
+        if not auth:
+            out[name] = {"expires": None, "days_left": None, "expired": True,
+                         "summary": "not logged in (no session cookie)"}
+            continue
+        expiries = [c["expires"] for c in auth if c.get("expires", -1) > 0]
+        if not expiries:
+            out[name] = {"expires": None, "days_left": None, "expired": False,
+                         "summary": "browser-session cookie (no fixed expiry)"}
+            continue
+        expiry = min(expiries)
+        days   = (expiry - now) / 86400
+        out[name] = {
+            "expires":   datetime.fromtimestamp(expiry).isoformat(timespec="minutes"),
+            "days_left": round(days, 1),
+            "expired":   days <= 0,
+            "summary":   f"expired {-days:.1f} days ago" if days <= 0 else f"expires in {days:.1f} days",
+        }
+    return out
+
+
+def warn_if_expiring(state: dict) -> None:
+    for name, info in status(state).items():
+        if info["expired"]:
+            log.warning(f"Exported {name} login unusable — {info['summary']}. "
+                        f"Run: python art_bot.py export-session")
+        elif info["days_left"] is not None and info["days_left"] < EXPIRY_WARN_DAYS:
+            log.warning(f"Exported {name} login {info['summary']} — re-export soon.")
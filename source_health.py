@@ -0,0 +1,249 @@
+"""
+Source health — success rates, latencies and a circuit breaker per image source.
+
+Every generate_image attempt is recorded in source_health.json (next to
+config.json):
+
+  {
+    "grok": {
+      "attempts": 40, "successes": 31, "consecutive_failures": 0,
+      "last_failure": "no image", "last_failure_at": "2025-01-01T10:00:00",
+      "open_until": null,
+      "latencies":         [...],   # seconds per successful attempt (newest last)
+      "failure_latencies": [...],   # seconds burnt per failed attempt
+      "p50": 58.0, "p95": 141.0,
+      "phases": {"image_wait": [...]}   # seconds per measured step of a successful run
+    },
+    ...
+  }
+
+After cfg["circuit_failures"] consecutive failures (default 3) a source's
+circuit opens for cfg["circuit_cooldown_min"] minutes (default 180) and it is
+skipped without opening a browser.  Once the cooldown expires a single trial
+attempt is allowed; another failure re-opens the circuit straight away.
+
+Sources that are still closed are ordered by expected time-to-success: the
+mean time an attempt costs divided by the chance it succeeds.  Trying sources
+in ascending order of that ratio minimises the expected wait for an image.
+
+Phase timings (e.g. submit → image visible) drive wait_plan(), which replaces
+the generators' fixed sleeps once enough samples exist: the first check comes
+at the historical p10, polling is tight until the median and backs off after
+it, and the generator gives up at p99 plus a margin.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+BOT_DIR     = Path(__file__).parent
+HEALTH_FILE = BOT_DIR / "source_health.json"
+
+MAX_SAMPLES       = 50      # latency samples kept per list
+FAILURE_THRESHOLD = 3       # consecutive failures before the circuit opens
+COOLDOWN_MINUTES  = 180     # how long an open circuit stays open
+DEFAULT_LATENCY   = 90.0    # assumed seconds per attempt before any data exists
+MIN_PHASE_SAMPLES = 5       # phase samples needed before wait_plan() trusts them
+GIVE_UP_MARGIN_S  = 30      # slack added past p99 before a wait gives up
+
+log = logging.getLogger("art_bot")
+
+_lock = threading.Lock()    # race mode records from several threads
+
+
+# ── Storage ───────────────────────────────────────────────────────────────────
+
+def load_health() -> dict:
+    if HEALTH_FILE.exists():
+        try:
+            with open(HEALTH_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as exc:
+            log.warning(f"Could not read {HEALTH_FILE.name} ({exc}) — starting with no source health")
+    return {}
+
+
+def save_health(health: dict) -> None:
+    """Write health through a temp file, so a run killed mid-write leaves the old file intact."""
+    tmp = HEALTH_FILE.with_name(f"{HEALTH_FILE.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(health, f, indent=2)
+        os.replace(tmp, HEALTH_FILE)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _new_record() -> dict:
+    return {
+        "attempts":             0,
+        "successes":            0,
+        "consecutive_failures": 0,
+        "last_failure":         None,
+        "last_failure_at":      None,
+        "open_until":           None,
+        "latencies":            [],
+        "failure_latencies":    [],
+        "p50":                  None,
+        "p95":                  None,
+        "phases":               {},
+    }
+
+
+# ── Statistics ────────────────────────────────────────────────────────────────
+
+def percentile(samples: list, pct: float) -> float | None:
+    """Nearest-rank percentile of samples (pct in 0–100), or None if empty."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank    = max(0, min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1))))
+    return float(ordered[rank])
+
+
+def success_rate(record: dict) -> float:
+    """Laplace-smoothed success rate, so a new source starts at 0.5 rather than 0 or 1."""
+    return (record.get("successes", 0) + 1) / (record.get("attempts", 0) + 2)
+
+
+def expected_time_to_success(record: dict) -> float:
+    p      = success_rate(record)
+    ok_s   = percentile(record.get("latencies", []), 50) or DEFAULT_LATENCY
+    fail_s = percentile(record.get("failure_latencies", []), 50) or DEFAULT_LATENCY
+    return (p * ok_s + (1 - p) * fail_s) / p
+
+
+# ── Recording ─────────────────────────────────────────────────────────────────
+
+def record_attempt(source: str, ok: bool, seconds: float,
+                   reason: str | None = None, cfg: dict | None = None) -> None:
+    """Add one attempt to the source's record, opening its circuit if it keeps failing."""
+    cfg = cfg or {}
+    threshold = int(cfg.get("circuit_failures", FAILURE_THRESHOLD))
+    cooldown  = float(cfg.get("circuit_cooldown_min", COOLDOWN_MINUTES))
+
+    with _lock:
+        health = load_health()
+        rec    = health.setdefault(source, _new_record())
+        rec["attempts"] += 1
+
+        if ok:
+            rec["successes"]           += 1
+            rec["consecutive_failures"] = 0
+            rec["open_until"]           = None
+            rec["latencies"]            = (rec.get("latencies", []) + [round(seconds, 1)])[-MAX_SAMPLES:]
+            rec["p50"]                  = percentile(rec["latencies"], 50)
+            rec["p95"]                  = percentile(rec["latencies"], 95)
+        else:
+            rec["consecutive_failures"] += 1
+            rec["last_failure"]          = reason or "unknown"
+            rec["last_failure_at"]       = datetime.now().isoformat(timespec="seconds")
+            rec["failure_latencies"]     = (
+                rec.get("failure_latencies", []) + [round(seconds, 1)]
+            )[-MAX_SAMPLES:]
+            if rec["consecutive_failures"] >= threshold:
+                rec["open_until"] = time.time() + cooldown * 60
+                log.warning(
+                    f"{source}: circuit open for {cooldown:.0f} min after "
+                    f"{rec['consecutive_failures']} consecutive failures ({rec['last_failure']})"
+                )
+
+        try:
+            save_health(health)
+        except Exception as exc:
+            log.warning(f"Could not save source health: {exc}")
+
+
+def record_phase(source: str, phase: str, seconds: float) -> None:
+    """Store how long one step of a successful attempt took."""
+    with _lock:
+        health  = load_health()
+        phases  = health.setdefault(source, _new_record()).setdefault("phases", {})
+        phases[phase] = (phases.get(phase, []) + [round(seconds, 1)])[-MAX_SAMPLES:]
+        try:
+            save_health(health)
+        except Exception as exc:
+            log.warning(f"Could not save source health: {exc}")
+
+
+# ── Adaptive waits ────────────────────────────────────────────────────────────
+
+def wait_plan(source: str, phase: str, first: float, interval: float, give_up: float) -> dict:
+    """Polling schedule for a phase, learned from its recorded durations.
+
+    The arguments are the old fixed values, used until MIN_PHASE_SAMPLES
+    samples exist; give_up also stays the hard ceiling afterwards.  Returns
+    {"first", "interval", "median", "give_up", "ceiling", "learned"} in seconds.
+    """
+    samples = load_health().get(source, {}).get("phases", {}).get(phase, [])
+    if len(samples) < MIN_PHASE_SAMPLES:
+        return {"first": first, "interval": interval, "median": give_up,
+                "give_up": give_up, "ceiling": give_up, "learned": False}
+
+    p10 = percentile(samples, 10)
+    p50 = percentile(samples, 50)
+    p99 = percentile(samples, 99)
+    limit = min(give_up, max(p99 * 1.5, p99 + GIVE_UP_MARGIN_S))
+    return {
+        "first":    min(max(p10, 1.0), limit),
+        "interval": interval,
+        "median":   p50,
+        "give_up":  limit,
+        "ceiling":  give_up,
+        "learned":  True,
+    }
+
+
+def record_timeout(source: str, phase: str, plan: dict, elapsed: float) -> None:
+    """Count a wait abandoned at the plan's learned give-up as a sample at that limit.
+
+    record_phase only sees waits that succeeded, so on its own the learned
+    limit could never grow back if a source slows down for good.  A sample at
+    the limit becomes the new p99, so the next plan waits up to 1.5x longer
+    (never past the hard ceiling).
+    """
+    if plan.get("learned") and plan["give_up"] < plan["ceiling"] and elapsed + 1 >= plan["give_up"]:
+        log.info(f"{source}: {phase} gave up at the learned {plan['give_up']:.0f} s — widening it")
+        record_phase(source, phase, plan["give_up"])
+
+
+def next_poll_delay(plan: dict, elapsed: float) -> float:
+    """Poll every plan interval until the median, then back off up to 4x towards the tail."""
+    interval = plan["interval"]
+    if elapsed < plan["median"]:
+        return interval
+    return min(interval * 4, interval + (elapsed - plan["median"]) / 4)
+
+
+# ── Circuit breaker / ordering ────────────────────────────────────────────────
+
+def is_open(source: str, health: dict | None = None) -> bool:
+    """True while the source's circuit is open (it should be skipped)."""
+    if health is None:
+        health = load_health()
+    open_until = health.get(source, {}).get("open_until")
+    return bool(open_until) and time.time() < open_until
+
+
+def order_sources(names: list[str]) -> list[str]:
+    """Return the closed-circuit sources in names, cheapest expected time-to-success first.
+
+    Open sources are logged and dropped.  Ties keep the configured order.
+    """
+    health    = load_health()
+    available = []
+    for name in names:
+        if is_open(name, health):
+            rec   = health[name]
+            until = datetime.fromtimestamp(rec["open_until"]).strftime("%H:%M")
+            log.info(f"Skipping {name} — circuit open until {until} ({rec.get('last_failure')})")
+        else:
+            available.append(name)
+    return sorted(
+        available,
+        key=lambda n: expected_time_to_success(health.get(n, _new_record())),
+    )